@@ -0,0 +1,45 @@
+import argparse
+import os
+import timeit
+
+from pydarc.bit_operations import read_reversed_uint, reverse_bits, reverse_bits_into
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark of bit operations")
+    parser.add_argument(
+        "-n", "--number", type=int, default=10000, help="Number of iterations"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[18, 144, 1024, 4096, 8192],
+        help="Payload sizes in bytes",
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'function':<20} {'size':>6} {'us/call':>10} {'MB/s':>10}")
+    for size in args.sizes:
+        payload = os.urandom(size)
+        writable_payload = bytearray(payload)
+        benchmarks = {
+            "reverse_bits": lambda: reverse_bits(payload),
+            "reverse_bits_into": lambda: reverse_bits_into(writable_payload),
+        }
+        for name, function in benchmarks.items():
+            elapsed = timeit.timeit(function, number=args.number) / args.number
+            print(
+                f"{name:<20} {size:>6} {elapsed * 1e6:>10.3f} {size / elapsed / 1e6:>10.1f}"
+            )
+
+    header = os.urandom(4)
+    elapsed = (
+        timeit.timeit(lambda: read_reversed_uint(header, 8, 14), number=args.number)
+        / args.number
+    )
+    print(f"{'read_reversed_uint':<20} {4:>6} {elapsed * 1e6:>10.3f} {'-':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.decoder import generate_fixture
+
+DECODE_DARC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "decode_darc.py")
+
+
+def run_decode_darc(
+    arguments: list[str], stdin: bytes | None = None
+) -> tuple[bytes, str]:
+    """Run decode_darc.py
+
+    Args:
+        arguments (list[str]): Arguments
+        stdin (bytes | None, optional): Input to stdin. Defaults to None.
+
+    Raises:
+        RuntimeError: Non-zero exit status
+
+    Returns:
+        tuple[bytes, str]: stdout and stderr
+    """
+    process = subprocess.run(
+        [sys.executable, DECODE_DARC, "--loglevel", "ERROR", *arguments],
+        input=stdin,
+        capture_output=True,
+    )
+    stderr = process.stderr.decode(errors="replace")
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"decode_darc.py exited with {process.returncode}. stderr={stderr}"
+        )
+    return process.stdout, stderr
+
+
+def check_stdin_sinks_with_checkpoint(directory: str, bitstream_path: str) -> None:
+    """Check that a stdin run with sinks and a checkpoint writes every Data Group
+    and exits without logging errors
+
+    Args:
+        directory (str): Working directory
+        bitstream_path (str): Bitstream path
+
+    Raises:
+        AssertionError: Check failed
+    """
+    jsonl_path = os.path.join(directory, "sink.jsonl")
+    binary_path = os.path.join(directory, "sink.bin")
+    checkpoint_path = os.path.join(directory, "checkpoint")
+    expected_jsonl, _ = run_decode_darc([bitstream_path, "--format", "jsonl"])
+    expected_binary, _ = run_decode_darc([bitstream_path, "--format", "binary"])
+
+    with open(bitstream_path, "rb") as file:
+        bitstream = file.read()
+    _, stderr = run_decode_darc(
+        [
+            "-",
+            "--format",
+            "none",
+            "--sink",
+            f"jsonl:{jsonl_path}",
+            "--sink",
+            f"binary:{binary_path}",
+            "--checkpoint",
+            checkpoint_path,
+            "--checkpoint-interval",
+            "1",
+        ],
+        bitstream,
+    )
+
+    assert stderr == "", f"errors logged: {stderr}"
+    assert os.path.exists(checkpoint_path), "checkpoint not saved"
+    with open(jsonl_path, "rb") as file:
+        assert file.read() == expected_jsonl, "jsonl sink differs from --format jsonl"
+    with open(binary_path, "rb") as file:
+        assert (
+            file.read() == expected_binary
+        ), "binary sink differs from --format binary"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="End-to-end checks of decode_darc.py on a generated bitstream"
+    )
+    parser.add_argument(
+        "--frames", type=int, default=2, help="Number of Frames in the fixture"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args(argv)
+
+    checks = [check_stdin_sinks_with_checkpoint]
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        bitstream, _ = generate_fixture(args.frames, args.seed)
+        bitstream_path = os.path.join(directory, "bitstream.bin")
+        with open(bitstream_path, "wb") as file:
+            file.write(bitstream)
+
+        for check in checks:
+            try:
+                check(directory, bitstream_path)
+                print(f"{check.__name__}: ok")
+            except (AssertionError, RuntimeError) as e:
+                failures += 1
+                print(f"{check.__name__}: FAIL {e}")
+
+    if failures != 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+import argparse
+import json
+import logging
+import math
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Callable
+
+import bitstring
+
+from pydarc.crc_14_darc import crc_14_darc
+from pydarc.crc_16_darc import crc_16_darc
+from pydarc.crc_82_darc import (
+    correct_error_dscc_272_190,
+    crc_82_darc,
+    get_parity_bitflip_syndrome_map_dscc_272_190,
+)
+from pydarc.darc_decoder import DarcDecoder
+from pydarc.darc_l2_block_decoder import DarcL2BlockDecoder
+from pydarc.darc_l2_data import DarcL2Frame
+from pydarc.darc_l2_frame_decoder import DarcL2FrameDecoder
+from pydarc.darc_l2_frame_encoder import DarcL2FrameEncoder
+from pydarc.darc_l3_data import DarcL3DataPacketServiceIdentificationCode
+from pydarc.darc_l3_data_packet_decoder import DarcL3DataPacketDecoder
+from pydarc.darc_l4_data import DarcL4DataGroup1
+from pydarc.darc_l4_data_group_decoder import DarcL4DataGroupDecoder
+from pydarc.darc_l4_data_group_encoder import DarcL4DataGroupEncoder
+from pydarc.darc_shared_tables import DarcSharedTables
+
+# Rates and recoveries are regressions when lower, peak memory when higher
+RATE_METRICS = ["bits/s", "blocks/s", "frames/s", "packets/s", "groups/s", "calls/s"]
+RECOVERY_METRICS = ["frames", "groups"]
+MEMORY_METRICS = ["peak_kib"]
+
+
+def generate_fixture(frames: int, seed: int) -> tuple[bytes, int]:
+    """Generate a clean bitstream of random Data Groups
+
+    Args:
+        frames (int): Number of Frames
+        seed (int): Random seed
+
+    Returns:
+        tuple[bytes, int]: Bitstream and number of Data Groups in it
+    """
+    generator = random.Random(seed)
+    l4_data_group_encoder = DarcL4DataGroupEncoder()
+    l2_frame_encoder = DarcL2FrameEncoder()
+    bitstream = bytearray()
+    data_groups = 0
+    while len(bitstream) < frames * 272 * 288:
+        data_group = DarcL4DataGroup1(
+            DarcL3DataPacketServiceIdentificationCode(generator.randint(1, 9)),
+            data_groups,
+            0,
+            bitstring.Bits(bytes=generator.randbytes(generator.randint(1, 1024))),
+            0,
+            0,
+        )
+        bitstream += l2_frame_encoder.push_data_packets(
+            l4_data_group_encoder.push_data_group(data_group)
+        )
+        data_groups += 1
+    # Data Groups still pending in the encoder are not sent
+    return bytes(bitstream), data_groups - 1
+
+
+def impair(
+    bitstream: bytes,
+    ber: float,
+    burst_rate: float,
+    burst_length: int,
+    seed: int,
+) -> bytes:
+    """Inject random and burst bit errors
+
+    Args:
+        bitstream (bytes): Bitstream with one bit per byte
+        ber (float): Probability of a random bit error
+        burst_rate (float): Probability of a burst starting at a bit
+        burst_length (int): Number of bits in a burst. Each bit in a burst is flipped with probability 0.5.
+        seed (int): Random seed
+
+    Returns:
+        bytes: Impaired bitstream
+    """
+    generator = random.Random(seed)
+    buffer = bytearray(bitstream)
+
+    def positions(rate: float):
+        # Gaps between events are geometric
+        position = -1
+        while 0 < rate:
+            position += 1 + int(math.log(1.0 - generator.random()) / math.log1p(-rate))
+            if len(buffer) <= position:
+                return
+            yield position
+
+    for position in positions(ber):
+        buffer[position] ^= 1
+    for position in positions(burst_rate):
+        for i in range(position, min(position + burst_length, len(buffer))):
+            buffer[i] ^= generator.getrandbits(1)
+    return bytes(buffer)
+
+
+def measure(function: Callable[[], object], memory: bool) -> tuple[object, float, int]:
+    """Measure a stage
+
+    Args:
+        function (Callable[[], object]): Stage
+        memory (bool): Also measure peak memory in a second run
+
+    Returns:
+        tuple[object, float, int]: Result, elapsed seconds and peak memory in KiB (0 if not measured)
+    """
+    start_time = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start_time
+
+    peak = 0
+    if memory:
+        tracemalloc.start()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak // 1024
+
+
+def benchmark_scenario(
+    bitstream: bytes, frames: int, data_groups: int, memory: bool
+) -> dict[str, dict[str, float]]:
+    """Benchmark each layer and the whole chain on a bitstream
+
+    Args:
+        bitstream (bytes): Bitstream with one bit per byte
+        frames (int): Number of Frames sent
+        data_groups (int): Number of Data Groups sent
+        memory (bool): Measure peak memory
+
+    Returns:
+        dict[str, dict[str, float]]: Metrics by stage
+    """
+    results: dict[str, dict[str, float]] = {}
+
+    def decode_blocks():
+        l2_block_decoder = DarcL2BlockDecoder()
+        blocks = []
+        for bit in bitstream:
+            block = l2_block_decoder.push_bit(bit)
+            if block is not None:
+                blocks.append(block)
+        return blocks
+
+    blocks, elapsed, peak = measure(decode_blocks, memory)
+    results["l2_block"] = {
+        "bits/s": len(bitstream) / elapsed,
+        "blocks/s": len(blocks) / elapsed,
+        "peak_kib": peak,
+    }
+
+    def decode_frames():
+        l2_frame_decoder = DarcL2FrameDecoder()
+        decoded_frames = []
+        for block in blocks:
+            frame = l2_frame_decoder.push_block(block)
+            if frame is not None:
+                decoded_frames.append(frame)
+        return decoded_frames
+
+    decoded_frames, elapsed, peak = measure(decode_frames, memory)
+    results["l2_frame"] = {
+        "frames/s": len(decoded_frames) / elapsed,
+        "frames": len(decoded_frames) / frames,
+        "peak_kib": peak,
+    }
+
+    def decode_data_packets():
+        l3_data_packet_decoder = DarcL3DataPacketDecoder()
+        return [l3_data_packet_decoder.push_frame(x) for x in decoded_frames]
+
+    data_packets, elapsed, peak = measure(decode_data_packets, memory)
+    results["l3"] = {
+        "packets/s": sum(map(len, data_packets)) / elapsed,
+        "peak_kib": peak,
+    }
+
+    def decode_data_groups():
+        l4_data_group_decoder = DarcL4DataGroupDecoder()
+        decoded_data_groups = []
+        for x in data_packets:
+            decoded_data_groups.extend(l4_data_group_decoder.push_data_packets(x))
+        return decoded_data_groups
+
+    decoded_data_groups, elapsed, peak = measure(decode_data_groups, memory)
+    results["l4"] = {
+        "groups/s": len(decoded_data_groups) / elapsed,
+        "groups": sum(x.is_crc_valid() for x in decoded_data_groups) / data_groups,
+        "peak_kib": peak,
+    }
+
+    def decode():
+        decoded_frames = 0
+
+        def count_frame(frame: DarcL2Frame, bit_offset: int):
+            nonlocal decoded_frames
+            decoded_frames += 1
+
+        decoder = DarcDecoder(on_frame=count_frame)
+        decoded_data_groups = list(decoder.decode_bits(bitstream))
+        return decoded_frames, decoded_data_groups
+
+    (decoded_frames, decoded_data_groups), elapsed, peak = measure(decode, memory)
+    results["end_to_end"] = {
+        "bits/s": len(bitstream) / elapsed,
+        "frames/s": decoded_frames / elapsed,
+        "groups/s": len(decoded_data_groups) / elapsed,
+        "frames": decoded_frames / frames,
+        "groups": sum(x.is_crc_valid() for x in decoded_data_groups) / data_groups,
+        "peak_kib": peak,
+    }
+    return results
+
+
+def benchmark_functions(number: int) -> dict[str, dict[str, float]]:
+    """Benchmark CRC functions
+
+    Args:
+        number (int): Number of iterations
+
+    Returns:
+        dict[str, dict[str, float]]: Metrics by function
+    """
+    data_packet = random.randbytes(22)
+    data_group = random.randbytes(256)
+    block = bitstring.Bits(bytes=random.randbytes(34))
+    syndrome_map = get_parity_bitflip_syndrome_map_dscc_272_190()
+    syndrome = crc_82_darc(bitstring.Bits(uint=0b101 << 100, length=272))
+    functions = {
+        "crc_14_darc": lambda: crc_14_darc(data_packet),
+        "crc_16_darc": lambda: crc_16_darc(data_group),
+        "crc_82_darc": lambda: crc_82_darc(block),
+        "syndrome_lookup": lambda: syndrome_map.get(syndrome),
+    }
+    return {
+        name: {"calls/s": number / timeit.timeit(function, number=number)}
+        for name, function in functions.items()
+    }
+
+
+def parse_scenario(value: str) -> tuple[str, float, float, int]:
+    """Parse a channel impairment scenario
+
+    Args:
+        value (str): clean, ber=BER or burst=RATE:LENGTH, joined with +
+
+    Raises:
+        argparse.ArgumentTypeError: Invalid scenario
+
+    Returns:
+        tuple[str, float, float, int]: Name, BER, burst rate and burst length
+    """
+    ber = 0.0
+    burst_rate = 0.0
+    burst_length = 0
+    try:
+        for term in value.split("+"):
+            if term == "clean":
+                continue
+            key, argument = term.split("=")
+            if key == "ber":
+                ber = float(argument)
+            elif key == "burst":
+                rate, length = argument.split(":")
+                burst_rate = float(rate)
+                burst_length = int(length)
+            else:
+                raise ValueError(key)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid scenario: {value}")
+    return value, ber, burst_rate, burst_length
+
+
+def compare(
+    results: dict[str, dict[str, dict[str, float]]],
+    baseline: dict[str, dict[str, dict[str, float]]],
+    threshold: float,
+) -> list[str]:
+    """Compare results with a baseline
+
+    Args:
+        results (dict[str, dict[str, dict[str, float]]]): Results by scenario and stage
+        baseline (dict[str, dict[str, dict[str, float]]]): Baseline by scenario and stage
+        threshold (float): Allowed relative change
+
+    Returns:
+        list[str]: Regressions
+    """
+    regressions: list[str] = []
+    for scenario, stages in results.items():
+        for stage, metrics in stages.items():
+            for metric, value in metrics.items():
+                base = baseline.get(scenario, {}).get(stage, {}).get(metric)
+                if base is None or base == 0:
+                    continue
+                if metric in MEMORY_METRICS:
+                    regressed = (1 + threshold) * base < value
+                elif metric in RECOVERY_METRICS:
+                    regressed = value < base
+                elif metric in RATE_METRICS:
+                    regressed = value < (1 - threshold) * base
+                else:
+                    continue
+                if regressed:
+                    regressions.append(
+                        f"{scenario} {stage} {metric}: {base:.6g} -> {value:.6g} ({value / base - 1:+.1%})"
+                    )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the decoder layers under channel impairments"
+    )
+    parser.add_argument(
+        "--frames", type=int, default=4, help="Number of Frames in the fixture"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        type=parse_scenario,
+        help="clean, ber=BER or burst=RATE:LENGTH, joined with + (repeatable)",
+    )
+    parser.add_argument(
+        "-n",
+        "--number",
+        type=int,
+        default=10000,
+        help="Number of iterations of CRC functions",
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip peak memory measurement"
+    )
+    parser.add_argument(
+        "--tables",
+        help="Path of shared tables to install (saved if missing), to measure the flat syndrome map",
+    )
+    parser.add_argument("--save", help="Path to save results to as a baseline")
+    parser.add_argument("--baseline", help="Path of a baseline to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative change regarded as a regression",
+    )
+    args = parser.parse_args(argv)
+    scenarios = args.scenario or [
+        parse_scenario(x) for x in ["clean", "ber=1e-4", "ber=1e-3", "burst=1e-5:32"]
+    ]
+
+    # Uncorrectable errors are expected
+    logging.getLogger("pydarc").setLevel(logging.CRITICAL)
+
+    if args.tables is not None:
+        DarcSharedTables.open(args.tables, create=True).install()
+
+    # Build the syndrome map outside of measurements
+    correct_error_dscc_272_190(bitstring.Bits(uint=1, length=272))
+
+    bitstream, data_groups = generate_fixture(args.frames, args.seed)
+    results: dict[str, dict[str, dict[str, float]]] = {
+        "functions": benchmark_functions(args.number)
+    }
+    for name, ber, burst_rate, burst_length in scenarios:
+        results[name] = benchmark_scenario(
+            impair(bitstream, ber, burst_rate, burst_length, args.seed),
+            args.frames,
+            data_groups,
+            not args.no_memory,
+        )
+
+    print(f"{'scenario':<16} {'stage':<12} {'metric':<10} {'value':>14}")
+    for scenario, stages in results.items():
+        for stage, metrics in stages.items():
+            for metric, value in metrics.items():
+                print(f"{scenario:<16} {stage:<12} {metric:<10} {value:>14.6g}")
+
+    if args.save is not None:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
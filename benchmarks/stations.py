@@ -0,0 +1,89 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+
+from benchmarks.decoder import generate_fixture, impair
+from pydarc.darc_decoder import DarcDecoder
+from pydarc.darc_multi_station_decoder import DarcMultiStationDecoder
+
+
+def decode_threaded(stations: dict[str, str], threads: int) -> float:
+    """Decode stations with the multi-station decoder
+
+    Args:
+        stations (dict[str, str]): Bitstream path of each station
+        threads (int): Number of threads
+
+    Returns:
+        float: Elapsed seconds
+    """
+    start_time = time.perf_counter()
+    DarcMultiStationDecoder(stations, threads).decode()
+    return time.perf_counter() - start_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scaling of the multi-station decoder over threads"
+    )
+    parser.add_argument("--stations", type=int, default=8, help="Number of stations")
+    parser.add_argument(
+        "--frames", type=int, default=4, help="Number of Frames per station"
+    )
+    parser.add_argument(
+        "--ber", type=float, default=1e-3, help="Bit error rate of the fixtures"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--threads",
+        type=int,
+        action="append",
+        help="Number of threads (repeatable). Defaults to powers of 2 up to the number of stations.",
+    )
+    args = parser.parse_args(argv)
+    thread_counts = args.threads or [
+        1 << x for x in range(args.stations.bit_length()) if 1 << x <= args.stations
+    ]
+
+    # Uncorrectable errors are expected
+    logging.getLogger("pydarc").setLevel(logging.CRITICAL)
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled else 'disabled'}, {os.cpu_count()} CPUs"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        stations: dict[str, str] = {}
+        bits = 0
+        for i in range(args.stations):
+            bitstream, _ = generate_fixture(args.frames, args.seed + i)
+            bitstream = impair(bitstream, args.ber, 0.0, 0, args.seed + i)
+            stations[f"station{i}"] = os.path.join(directory, f"station{i}.bin")
+            with open(stations[f"station{i}"], "wb") as file:
+                file.write(bitstream)
+            bits += len(bitstream)
+
+        # Baseline of stations decoded one after another on the main thread
+        start_time = time.perf_counter()
+        for path in stations.values():
+            deque(DarcDecoder().decode_file(path), maxlen=0)
+        sequential_seconds = time.perf_counter() - start_time
+
+        print(f"{'threads':>8} {'seconds':>10} {'bits/s':>12} {'speedup':>8}")
+        print(
+            f"{'-':>8} {sequential_seconds:>10.3f} {bits / sequential_seconds:>12.6g} {1.0:>8.2f}"
+        )
+        for threads in thread_counts:
+            seconds = decode_threaded(stations, threads)
+            print(
+                f"{threads:>8} {seconds:>10.3f} {bits / seconds:>12.6g} {sequential_seconds / seconds:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
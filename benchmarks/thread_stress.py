@@ -0,0 +1,139 @@
+import argparse
+import logging
+import random
+import sys
+import threading
+
+from benchmarks.decoder import generate_fixture, impair
+from pydarc.crc_82_darc import (
+    clear_tables_dscc_272_190,
+    get_parity_bitflip_syndrome_map_dscc_272_190,
+)
+from pydarc.darc_decoder import DarcDecoder
+from pydarc.darc_l4_data_group_writer import pack_data_group_record
+
+
+def soften(bitstream: bytes, impaired: bytes, seed: int) -> list[float]:
+    """Turn an impaired bitstream into soft decisions
+
+    Flipped bits get a low reliability, so that Chase correction is exercised.
+
+    Args:
+        bitstream (bytes): Clean bitstream with one bit per byte
+        impaired (bytes): Impaired bitstream with one bit per byte
+        seed (int): Random seed
+
+    Returns:
+        list[float]: Soft decisions. Positive for 1.
+    """
+    generator = random.Random(seed)
+    return [
+        (1.0 if bit else -1.0) * (0.1 if bit != clean else 1.0 + generator.random())
+        for clean, bit in zip(bitstream, impaired)
+    ]
+
+
+def decode(station: bytes | list[float]) -> list[bytes]:
+    """Decode a station with its own decoder chain
+
+    Args:
+        station (bytes | list[float]): Hard bits, or soft decisions
+
+    Returns:
+        list[bytes]: Data Group records
+    """
+    decoder = DarcDecoder()
+    data_groups = (
+        decoder.decode_bits(station)
+        if isinstance(station, bytes)
+        else decoder.decode_soft_bits(station)
+    )
+    return [pack_data_group_record(x) for x in data_groups]
+
+
+def run_round(
+    stations: list[bytes | list[float]],
+) -> tuple[list[list[bytes] | None], set[int]]:
+    """Decode every station on its own thread from cold tables
+
+    Args:
+        stations (list[bytes | list[float]]): Stations
+
+    Returns:
+        tuple[list[list[bytes] | None], set[int]]: Records per station (None if its thread failed) and ids of the syndrome maps seen by threads
+    """
+    clear_tables_dscc_272_190()
+    barrier = threading.Barrier(len(stations))
+    results: list[list[bytes] | None] = [None] * len(stations)
+    syndrome_map_ids: list[int] = [0] * len(stations)
+
+    def run(index: int) -> None:
+        barrier.wait()
+        # Every thread races to generate the syndrome map first
+        syndrome_map_ids[index] = id(get_parity_bitflip_syndrome_map_dscc_272_190())
+        results[index] = decode(stations[index])
+
+    threads = [
+        threading.Thread(target=run, args=(i,), name=f"station-{i}")
+        for i in range(len(stations))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, set(syndrome_map_ids)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Stress check of decoder threads started together on cold tables against single-threaded decoding"
+    )
+    parser.add_argument(
+        "--threads", type=int, default=8, help="Number of decoder threads"
+    )
+    parser.add_argument(
+        "--frames", type=int, default=4, help="Number of Frames per station"
+    )
+    parser.add_argument(
+        "--ber", type=float, default=1e-3, help="Bit error rate of the fixtures"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--rounds", type=int, default=3, help="Number of rounds")
+    args = parser.parse_args(argv)
+
+    # Uncorrectable errors are expected
+    logging.getLogger("pydarc").setLevel(logging.CRITICAL)
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"GIL {'enabled' if gil_enabled else 'disabled'}")
+
+    # Even stations are hard bits for syndrome lookups, odd ones soft decisions
+    # for Chase correction with single bit syndromes
+    stations: list[bytes | list[float]] = []
+    for i in range(args.threads):
+        bitstream, _ = generate_fixture(args.frames, args.seed + i)
+        impaired = impair(bitstream, args.ber, 0.0, 0, args.seed + i)
+        stations.append(
+            impaired if i % 2 == 0 else soften(bitstream, impaired, args.seed + i)
+        )
+
+    reference = [decode(x) for x in stations]
+    print(f"reference: {sum(map(len, reference))} Data Groups")
+
+    failures = 0
+    for round_number in range(args.rounds):
+        results, syndrome_map_ids = run_round(stations)
+        mismatched = [i for i, x in enumerate(results) if x != reference[i]]
+        failed = len(syndrome_map_ids) != 1 or len(mismatched) != 0
+        failures += 1 if failed else 0
+        print(
+            f"round {round_number}: syndrome maps {len(syndrome_map_ids)}, mismatched stations {mismatched or 'none'}, {'FAIL' if failed else 'ok'}"
+        )
+
+    if failures != 0:
+        print(f"FAILED {failures} of {args.rounds} rounds")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,34 @@
 import argparse
+import contextlib
+import io
 import logging
+import os
 import sys
+from collections import deque
+from typing import BinaryIO, Iterable
 
-from pydarc.darc_l2_block_decoder import DarcL2BlockDecoder
-from pydarc.darc_l2_frame_decoder import DarcL2FrameDecoder
-from pydarc.darc_l3_data_packet_decoder import DarcL3DataPacketDecoder
+from pydarc.darc_decoder import DarcDecoder
+from pydarc.darc_decoder_checkpoint import DarcDecoderCheckpoint
+from pydarc.darc_l2_data import DarcL2Frame
+from pydarc.darc_l2_frame_capture import DarcL2FrameCaptureWriter
+from pydarc.darc_l3_data import DarcL3DataPacketServiceIdentificationCode
 from pydarc.darc_l4_data import DarcL4DataGroup1, DarcL4DataGroup2
-from pydarc.darc_l4_data_group_decoder import DarcL4DataGroupDecoder
+from pydarc.darc_l4_data_group_archive import DarcL4DataGroupArchiveWriter
+from pydarc.darc_l4_data_group_sink import (
+    DarcL4DataGroupBatcher,
+    DarcL4DataGroupFanOutSink,
+    is_stdout_sink,
+    load_sink,
+)
+from pydarc.darc_l4_data_group_writer import (
+    DarcL4DataGroupBinaryWriter,
+    DarcL4DataGroupJsonLinesWriter,
+    DarcL4DataGroupTextWriter,
+)
+from pydarc.darc_metrics import DarcMetrics, DarcMetricsExporter
+from pydarc.darc_profiler import DarcProfiler
+from pydarc.darc_shared_tables import DarcSharedTables
+from pydarc.soft_bits import read_soft_bits
 
 
 def configLogger(level: str):
@@ -22,6 +44,26 @@ def configLogger(level: str):
     )
 
 
+def parseServiceId(value: str) -> DarcL3DataPacketServiceIdentificationCode:
+    """Parse Service ID
+
+    Args:
+        value (str): Service ID name or number
+
+    Raises:
+        argparse.ArgumentTypeError: Invalid Service ID
+
+    Returns:
+        DarcL3DataPacketServiceIdentificationCode: Service ID
+    """
+    try:
+        if value.upper() in DarcL3DataPacketServiceIdentificationCode.__members__:
+            return DarcL3DataPacketServiceIdentificationCode[value.upper()]
+        return DarcL3DataPacketServiceIdentificationCode(int(value, 0))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid Service ID: {value}")
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(description="DARC bitstream Decoder")
     parser.add_argument("input_path", help="Input DARC bitstream path (- to stdin)")
@@ -32,40 +74,340 @@ def main(argv=None):
         help="Logging level",
         choices=["NOTSET", "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--deduplicate",
+        default="none",
+        help="Handling of repeated Data Groups",
+        choices=["none", "suppress", "flag"],
+    )
+    parser.add_argument(
+        "--service",
+        action="append",
+        type=parseServiceId,
+        help="Service ID to decode (name or number, repeatable)",
+    )
+    parser.add_argument(
+        "--format",
+        default="text",
+        help="Output format (none to write to sinks only)",
+        choices=["text", "jsonl", "binary", "none"],
+    )
+    parser.add_argument(
+        "--sink",
+        action="append",
+        help="Sink to write decoded Data Groups to in batches on its own thread (text, jsonl or binary with an optional :PATH, archive:DIR, or a plugin in the pydarc.sinks entry point group, repeatable)",
+    )
+    parser.add_argument(
+        "--sink-batch-size",
+        type=int,
+        default=256,
+        help="Maximum number of Data Groups in a sink batch",
+    )
+    parser.add_argument(
+        "--sink-max-delay",
+        type=float,
+        default=1.0,
+        help="Maximum delay of a Data Group in a sink batch in seconds",
+    )
+    parser.add_argument(
+        "--sink-drop",
+        action="store_true",
+        help="Drop batches for a sink that falls behind instead of waiting for it",
+    )
+    parser.add_argument(
+        "--archive",
+        help="Archive directory to append decoded Data Groups to",
+    )
+    parser.add_argument(
+        "--input-format",
+        default="bits",
+        help="Input format (capture to replay a Frame capture, wav or float32 for FM multiplex samples, soft-int8 or soft-float32 for log-likelihood ratios positive for 1)",
+        choices=["bits", "capture", "wav", "float32", "soft-int8", "soft-float32"],
+    )
+    parser.add_argument(
+        "--sample-rate",
+        type=float,
+        help="Sample rate of float32 FM multiplex samples in Hz",
+    )
+    parser.add_argument(
+        "--invert",
+        action="store_true",
+        help="Invert bit polarity of demodulated FM multiplex samples",
+    )
+    parser.add_argument(
+        "--capture",
+        help="Path to write error corrected Frames to for later replay",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Number of processes to decode a bitstream file with",
+    )
+    parser.add_argument(
+        "--index",
+        help="Sync index path of the bitstream file (built if missing)",
+    )
+    parser.add_argument(
+        "--start-frame",
+        type=int,
+        help="Frame number in the sync index to start decoding at",
+    )
+    parser.add_argument(
+        "--tables",
+        help="Path of CRC and syndrome tables shared read-only between decoder processes (saved if missing, e.g. /dev/shm/darc.tables)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Path to periodically save the decoder state to",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=int,
+        default=12,
+        help="Number of Frames between checkpoints",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume from the checkpoint if it exists",
+    )
+    parser.add_argument(
+        "--metrics",
+        help="Path to periodically write metrics in Prometheus text format to",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=15.0,
+        help="Seconds between metrics exports",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Path to write pstats to (PATH.collapsed for flame graphs). Print a per-layer summary to stderr",
+    )
+    args = parser.parse_args(argv)
+
+    if (args.checkpoint is not None or args.resume) and (
+        args.input_format != "bits"
+        or 1 < args.processes
+        or args.start_frame is not None
+    ):
+        parser.error(
+            "--checkpoint and --resume require bits input without --processes or --start-frame"
+        )
+    if args.resume and args.checkpoint is None:
+        parser.error("--resume requires --checkpoint")
+    if args.input_format not in ["bits", "capture"] and (
+        1 < args.processes or args.start_frame is not None or args.index is not None
+    ):
+        parser.error(
+            "--processes, --index and --start-frame require bits or capture input"
+        )
+    if args.input_format == "float32" and args.sample_rate is None:
+        parser.error("float32 input requires --sample-rate")
+    if args.format != "none" and any(is_stdout_sink(x) for x in args.sink or []):
+        parser.error("a sink writing to stdout requires --format none")
+    if args.sink_drop and (args.sink is None or args.checkpoint is not None):
+        parser.error("--sink-drop requires --sink without --checkpoint")
 
     configLogger(args.loglevel)
 
-    l2_block_decoder = DarcL2BlockDecoder()
-    l2_frame_decoder = DarcL2FrameDecoder()
-    l3_data_packet_decoder = DarcL3DataPacketDecoder()
-    l4_data_group_decoder = DarcL4DataGroupDecoder()
-
-    if args.input_path == "-":
-        while True:
-            bit = ord(sys.stdin.read(1))
-            block = l2_block_decoder.push_bit(bit)
-            if block is None:
-                continue
-            frame = l2_frame_decoder.push_block(block)
-            if frame is None:
-                continue
-            data_packets = l3_data_packet_decoder.push_frame(frame)
-            data_groups = l4_data_group_decoder.push_data_packets(data_packets)
-            for data_group in data_groups:
-                if isinstance(data_group, DarcL4DataGroup1):
-                    print(
-                        f"is_crc_valid={data_group.is_crc_valid()} service_id={data_group.service_id.name} data_group_number={hex(data_group.data_group_number)} data_group_link={hex(data_group.data_group_link)} data_group_data={data_group.data_group_data.bytes.hex()} end_of_data_group={hex(data_group.end_of_data_group)} crc={hex(data_group.crc)}"
-                    )
-                elif isinstance(data_group, DarcL4DataGroup2):
-                    crc_string = (
-                        "None" if data_group.crc is None else hex(data_group.crc)
+    metrics = None if args.metrics is None else DarcMetrics()
+
+    output_stream = io.BufferedWriter(
+        io.FileIO(sys.stdout.fileno(), "wb", closefd=False), buffer_size=1 << 20
+    )
+    writer: (
+        DarcL4DataGroupTextWriter
+        | DarcL4DataGroupJsonLinesWriter
+        | DarcL4DataGroupBinaryWriter
+        | None
+    )
+    if args.format == "none":
+        writer = None
+    elif args.format == "jsonl":
+        writer = DarcL4DataGroupJsonLinesWriter(output_stream)
+    elif args.format == "binary":
+        writer = DarcL4DataGroupBinaryWriter(output_stream)
+    else:
+        writer = DarcL4DataGroupTextWriter(output_stream)
+    archive_writer = (
+        None if args.archive is None else DarcL4DataGroupArchiveWriter(args.archive)
+    )
+    batcher = (
+        None
+        if args.sink is None
+        else DarcL4DataGroupBatcher(
+            DarcL4DataGroupFanOutSink(
+                [load_sink(x) for x in args.sink],
+                drop=args.sink_drop,
+                names=args.sink,
+                metrics=metrics,
+            ),
+            args.sink_batch_size,
+            max_delay=args.sink_max_delay,
+        )
+    )
+
+    capture_file = None if args.capture is None else open(args.capture, "wb")
+    capture_writer = (
+        None if capture_file is None else DarcL2FrameCaptureWriter(capture_file)
+    )
+
+    metrics_exporter = (
+        None
+        if metrics is None
+        else DarcMetricsExporter(metrics, args.metrics_interval, args.metrics)
+    )
+    if metrics_exporter is not None:
+        metrics_exporter.start()
+
+    frame_count = 0
+
+    def save_checkpoint() -> None:
+        """Save the decoder state"""
+        # Outputs must not lag behind the checkpoint
+        if writer is not None:
+            writer.flush()
+        if archive_writer is not None:
+            archive_writer.flush()
+        if batcher is not None:
+            batcher.drain()
+        decoder.get_checkpoint().save(args.checkpoint)
+
+    def write_data_group(
+        data_group: DarcL4DataGroup1 | DarcL4DataGroup2, is_duplicate: bool | None
+    ) -> None:
+        """Write a Data Group
+
+        Args:
+            data_group (DarcL4DataGroup1 | DarcL4DataGroup2): Data Group
+            is_duplicate (bool | None): Data Group is a repetition. None to omit.
+        """
+        if writer is not None:
+            writer.write(data_group, is_duplicate)
+        if batcher is not None:
+            batcher.write(data_group, is_duplicate)
+        if archive_writer is not None:
+            archive_writer.write(
+                data_group,
+                stream_offset=(
+                    -1 if data_group.bit_offset is None else data_group.bit_offset
+                ),
+            )
+
+    def write_frame(frame: DarcL2Frame, bit_offset: int) -> None:
+        """Write a Frame after its Data Groups
+
+        Args:
+            frame (DarcL2Frame): Frame
+            bit_offset (int): Offset of the end of the Frame in the bitstream
+        """
+        nonlocal frame_count
+        if capture_writer is not None:
+            capture_writer.write(frame, bit_offset)
+        # Keep text output live
+        if writer is not None and args.format == "text":
+            writer.flush()
+        if batcher is not None:
+            batcher.poll()
+
+        frame_count += 1
+        if args.checkpoint is not None and frame_count % args.checkpoint_interval == 0:
+            save_checkpoint()
+
+    decoder_options = {
+        "service_ids": None if args.service is None else set(args.service),
+        "deduplicate": args.deduplicate,
+        "metrics": metrics,
+        "on_frame": write_frame,
+        "on_data_group": write_data_group,
+    }
+    decoder = (
+        DarcDecoder.from_checkpoint(
+            DarcDecoderCheckpoint.load(args.checkpoint), **decoder_options
+        )
+        if args.resume and os.path.exists(args.checkpoint)
+        else DarcDecoder(**decoder_options)
+    )
+
+    if args.tables is not None:
+        DarcSharedTables.open(args.tables, create=True).install()
+
+    profiler = None if args.profile is None else DarcProfiler()
+    if profiler is not None:
+        profiler.start()
+
+    try:
+        # Bitstream files are opened and memory-mapped by the decoder
+        input_stream: BinaryIO | None = None
+        if args.input_path == "-":
+            input_stream = sys.stdin.buffer
+        elif args.input_format != "bits":
+            input_stream = open(args.input_path, "rb")
+        with input_stream or contextlib.nullcontext():
+            data_groups: Iterable[DarcL4DataGroup1 | DarcL4DataGroup2]
+            if args.input_format == "capture":
+                data_groups = decoder.decode_capture(input_stream)
+            elif args.input_format in ["soft-int8", "soft-float32"]:
+                data_groups = decoder.decode_soft_bits(
+                    read_soft_bits(
+                        input_stream, args.input_format.removeprefix("soft-")
                     )
-                    print(
-                        f"is_crc_valid={data_group.is_crc_valid()} service_id={data_group.service_id.name} data_group_number={hex(data_group.data_group_number)} segments_data={data_group.segments_data.bytes.hex()} crc={crc_string}"
+                )
+            elif args.input_format in ["wav", "float32"]:
+                # NumPy is only required for FM multiplex samples
+                from pydarc.darc_baseband_demodulator import (
+                    demodulate_samples,
+                    read_float32_samples,
+                    read_wav_samples,
+                )
+
+                data_groups = decoder.decode_soft_bits(
+                    demodulate_samples(
+                        (
+                            read_wav_samples(input_stream)
+                            if args.input_format == "wav"
+                            else (
+                                (args.sample_rate, x)
+                                for x in read_float32_samples(input_stream)
+                            )
+                        ),
+                        args.invert,
                     )
-    else:
-        print("File input is not yet supported.")
+                )
+            elif args.input_path == "-":
+                data_groups = decoder.decode_stream(input_stream)
+            else:
+                data_groups = decoder.decode_file(
+                    args.input_path,
+                    args.processes,
+                    args.index,
+                    args.start_frame,
+                    args.tables,
+                )
+            # Data Groups are written by the callbacks
+            deque(data_groups, maxlen=0)
+    finally:
+        # The stdin loop stops between bits, so its state is exact. Outputs are
+        # drained into the checkpoint before they are closed.
+        if args.checkpoint is not None and args.input_path == "-":
+            save_checkpoint()
+        if writer is not None:
+            writer.flush()
+        if batcher is not None:
+            batcher.close()
+        if archive_writer is not None:
+            archive_writer.close()
+        if capture_file is not None:
+            capture_file.close()
+        if metrics_exporter is not None:
+            metrics_exporter.stop()
+        if profiler is not None:
+            profiler.stop()
+            profiler.save(args.profile)
+            print(profiler.summary(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+import argparse
+import io
+import random
+import sys
+
+import bitstring
+
+from pydarc.darc_l2_frame_encoder import DarcL2FrameEncoder
+from pydarc.darc_l3_data import DarcL3DataPacketServiceIdentificationCode
+from pydarc.darc_l4_data import DarcL4DataGroup1
+from pydarc.darc_l4_data_group_encoder import DarcL4DataGroupEncoder
+
+# 16 kbit/s
+BIT_RATE = 16000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="DARC bitstream Encoder generating synthetic Data Groups"
+    )
+    parser.add_argument("output_path", help="Output DARC bitstream path (- to stdout)")
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=60.0,
+        help="Duration of the bitstream in seconds of air time",
+    )
+    parser.add_argument(
+        "--max-data-group-size",
+        type=int,
+        default=1024,
+        help="Maximum size of Data Group data in bytes",
+    )
+    parser.add_argument("--seed", type=int, help="Random seed")
+    args = parser.parse_args(argv)
+
+    generator = random.Random(args.seed)
+    l4_data_group_encoder = DarcL4DataGroupEncoder()
+    l2_frame_encoder = DarcL2FrameEncoder()
+
+    output_stream = (
+        io.FileIO(sys.stdout.fileno(), "wb", closefd=False)
+        if args.output_path == "-"
+        else open(args.output_path, "wb")
+    )
+    with output_stream:
+        bits = 0
+        data_group_number = 0
+        while bits < args.duration * BIT_RATE:
+            data_group = DarcL4DataGroup1(
+                DarcL3DataPacketServiceIdentificationCode(generator.randint(1, 9)),
+                data_group_number,
+                0,
+                bitstring.Bits(
+                    bytes=generator.randbytes(
+                        generator.randint(1, args.max_data_group_size)
+                    )
+                ),
+                0,
+                0,
+            )
+            data_group_number = (data_group_number + 1) & 0x3FFF
+            bitstream = l2_frame_encoder.push_data_packets(
+                l4_data_group_encoder.push_data_group(data_group)
+            )
+            output_stream.write(bitstream)
+            bits += len(bitstream)
+        output_stream.write(l2_frame_encoder.flush())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,133 @@
-def reverse_bits(buffer: bytes) -> bytes:
-    """Reverse bits in byte
+import bitstring
+import struct
 
-    Args:
-        buffer (bytes): Buffer
+__bits_length = struct.Struct("<H")
+
+
+def __generate_reverse_bits_table() -> bytes:
+    """Generate bit reversal table
 
     Returns:
-        bytes: Bit reversed buffer
+        bytes: Bit reversal table
     """
-    result = b""
-    for value in buffer:
+    table = bytearray(256)
+    for i in range(256):
+        value = i
         value = (value & 0xF0) >> 4 | (value & 0x0F) << 4
         value = (value & 0xCC) >> 2 | (value & 0x33) << 2
         value = (value & 0xAA) >> 1 | (value & 0x55) << 1
-        result += value.to_bytes()
-    return result
+        table[i] = value
+    return bytes(table)
+
+
+__reverse_bits_table = __generate_reverse_bits_table()
+
+
+def reverse_bits(buffer: bytes | bytearray | memoryview) -> bytes:
+    """Reverse bits in byte
+
+    Args:
+        buffer (bytes | bytearray | memoryview): Buffer
+
+    Returns:
+        bytes: Bit reversed buffer
+    """
+    return bytes(buffer).translate(__reverse_bits_table)
+
+
+def reverse_bits_into(buffer: bytearray | memoryview) -> None:
+    """Reverse bits in byte in place
+
+    A bytearray is translated into one temporary buffer and copied back. A
+    memoryview has no translate, so it is also copied to bytes first.
+
+    Args:
+        buffer (bytearray | memoryview): Writable buffer
+    """
+    if isinstance(buffer, bytearray):
+        buffer[:] = buffer.translate(__reverse_bits_table)
+    else:
+        buffer[:] = bytes(buffer).translate(__reverse_bits_table)
+
+
+def reverse_uint(value: int, length: int) -> int:
+    """Reverse bit order of an unsigned integer
+
+    Args:
+        value (int): Value
+        length (int): Number of bit in value
+
+    Returns:
+        int: Bit reversed value
+    """
+    result = 0
+    for _ in range(0, length, 8):
+        result = result << 8 | __reverse_bits_table[value & 0xFF]
+        value >>= 8
+    return result >> (-length % 8)
+
+
+def read_uint(buffer: bytes | bytearray | memoryview, start: int, length: int) -> int:
+    """Read an unsigned integer field
+
+    Args:
+        buffer (bytes | bytearray | memoryview): Buffer
+        start (int): Start bit position
+        length (int): Number of bit in field
+
+    Returns:
+        int: Field value
+    """
+    first = start // 8
+    last = (start + length + 7) // 8
+    value = int.from_bytes(buffer[first:last], "big")
+    return value >> (8 * last - start - length) & ((1 << length) - 1)
+
+
+def read_reversed_uint(
+    buffer: bytes | bytearray | memoryview, start: int, length: int
+) -> int:
+    """Read a bit reversed (LSB first) unsigned integer field
+
+    Args:
+        buffer (bytes | bytearray | memoryview): Buffer
+        start (int): Start bit position
+        length (int): Number of bit in field
+
+    Returns:
+        int: Field value
+    """
+    return reverse_uint(read_uint(buffer, start, length), length)
+
+
+def pack_bits(bits: bitstring.Bits) -> bytes:
+    """Pack bits with their length
+
+    Args:
+        bits (bitstring.Bits): Bits. Length must be less than 65536.
+
+    Returns:
+        bytes: Length prefixed, zero padded bytes
+    """
+    return __bits_length.pack(len(bits)) + bits.tobytes()
+
+
+def unpack_bits(
+    buffer: bytes | memoryview, offset: int = 0
+) -> tuple[bitstring.Bits, int]:
+    """Unpack bits packed by pack_bits
+
+    Args:
+        buffer (bytes | memoryview): Buffer
+        offset (int, optional): Offset of the packed bits. Defaults to 0.
+
+    Returns:
+        tuple[bitstring.Bits, int]: Bits and offset of the next field
+    """
+    (length,) = __bits_length.unpack_from(buffer, offset)
+    offset += __bits_length.size
+    next_offset = offset + (length + 7) // 8
+    return (
+        bitstring.Bits(bytes=bytes(buffer[offset:next_offset]), length=length),
+        next_offset,
+    )
@@ -1,4 +1,5 @@
 import bitstring
+from typing import Sequence
 
 
 def __generate_crc_14_darc_table() -> list[int]:
@@ -77,3 +78,28 @@ def crc_14_darc(message: bytes | bitstring.Bits, bits: int | None = None) -> int
         return __crc_14_darc_table_driven(message)
     else:
         return __crc_14_darc_bit_by_bit(message, bits)
+
+
+def get_crc_14_darc_table() -> list[int]:
+    """Get CRC-14/DARC table
+
+    Returns:
+        list[int]: CRC-14/DARC table
+    """
+    return __crc_14_darc_table
+
+
+def set_crc_14_darc_table(table: Sequence[int]) -> None:
+    """Set CRC-14/DARC table, such as one loaded from shared tables
+
+    Args:
+        table (Sequence[int]): CRC-14/DARC table
+
+    Raises:
+        ValueError: Invalid table length
+    """
+    global __crc_14_darc_table
+    if len(table) != 256:
+        raise ValueError("table length must be 256.")
+    # Indexing a list is faster than indexing a memoryview
+    __crc_14_darc_table = list(table)
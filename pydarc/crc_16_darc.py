@@ -1,4 +1,5 @@
 import bitstring
+from typing import Sequence
 
 
 def __generate_crc_16_darc_table() -> list[int]:
@@ -77,3 +78,28 @@ def crc_16_darc(message: bytes | bitstring.Bits, bits: int | None = None) -> int
         return __crc_16_darc_table_driven(message)
     else:
         return __crc_16_darc_bit_by_bit(message, bits)
+
+
+def get_crc_16_darc_table() -> list[int]:
+    """Get CRC-16/DARC table
+
+    Returns:
+        list[int]: CRC-16/DARC table
+    """
+    return __crc_16_darc_table
+
+
+def set_crc_16_darc_table(table: Sequence[int]) -> None:
+    """Set CRC-16/DARC table, such as one loaded from shared tables
+
+    Args:
+        table (Sequence[int]): CRC-16/DARC table
+
+    Raises:
+        ValueError: Invalid table length
+    """
+    global __crc_16_darc_table
+    if len(table) != 256:
+        raise ValueError("table length must be 256.")
+    # Indexing a list is faster than indexing a memoryview
+    __crc_16_darc_table = list(table)
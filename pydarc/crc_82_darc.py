@@ -1,5 +1,8 @@
 import bitstring
+import heapq
+import threading
 from logging import getLogger
+from typing import Mapping, Sequence
 
 __logger = getLogger(__name__)
 
@@ -88,57 +91,232 @@ def crc_82_darc(message: bytes | bitstring.Bits, bits: int | None = None) -> int
         return __crc_82_darc_bit_by_bit(message, bits)
 
 
-def __generate_bitflip_syndrome_map(
-    length: int, error_width: int
-) -> dict[int, bitstring.Bits]:
+def __generate_bitflip_syndrome_map(length: int, error_width: int) -> dict[int, int]:
     """Generate bitflip syndrome map
 
+    The CRC is linear, so the syndrome of a burst error is the XOR of the
+    syndromes of its bits.
+
     Args:
         length (int): Length
         error_width (int): Error width
 
     Returns:
-        dict[int, bitstring.Bits]: Bitflip syndrome map
+        dict[int, int]: Bitflip syndrome map from syndrome to error vector
     """
-    bitflip_syndrome_map: dict[int, bitstring.Bits] = dict()
+    # Syndrome of an error at bit k from the least significant bit
+    bit_syndromes = [
+        crc_82_darc(bitstring.Bits(uint=1 << k, length=length), length)
+        for k in range(length)
+    ]
+    bitflip_syndrome_map: dict[int, int] = dict()
     for i in range(1, error_width + 1):
         error_base = 1 << (i - 1) | 1
         counter_max = 2 ** (i - 2) if 2 < i else 1
         for j in range(counter_max):
             error_with_counter = error_base | j << 1
+            error_bits = [x for x in range(i) if error_with_counter >> x & 1]
             for k in range(length - i):
-                error = error_with_counter << k
-                error_vector = bitstring.Bits(uint=error, length=length)
-                bitflip_syndrome_map[crc_82_darc(error_vector, length)] = error_vector
+                syndrome = 0
+                for x in error_bits:
+                    syndrome ^= bit_syndromes[k + x]
+                bitflip_syndrome_map[syndrome] = error_with_counter << k
     return bitflip_syndrome_map
 
 
-__parity_bitflip_syndrome_map_dscc_272_190 = __generate_bitflip_syndrome_map(272, 8)
+# Guards lazy generation so that decoder threads generate tables once. Tables are
+# never mutated after they are published, so lookups need no lock.
+__tables_lock = threading.Lock()
+
+__parity_bitflip_syndrome_map_dscc_272_190: Mapping[int, int] | None = None
+
+
+def get_parity_bitflip_syndrome_map_dscc_272_190() -> Mapping[int, int]:
+    """Get bitflip syndrome map of DSCC(272,190)
+
+    The map is generated on first use, so that only error correction pays for it.
+    It is safe to call from multiple threads.
+
+    Returns:
+        Mapping[int, int]: Bitflip syndrome map from syndrome to error vector
+    """
+    global __parity_bitflip_syndrome_map_dscc_272_190
+    syndrome_map = __parity_bitflip_syndrome_map_dscc_272_190
+    if syndrome_map is None:
+        with __tables_lock:
+            syndrome_map = __parity_bitflip_syndrome_map_dscc_272_190
+            if syndrome_map is None:
+                syndrome_map = __generate_bitflip_syndrome_map(272, 8)
+                __parity_bitflip_syndrome_map_dscc_272_190 = syndrome_map
+    return syndrome_map
+
+
+def set_parity_bitflip_syndrome_map_dscc_272_190(
+    syndrome_map: Mapping[int, int],
+) -> None:
+    """Set bitflip syndrome map of DSCC(272,190), such as one in shared tables
+
+    Args:
+        syndrome_map (Mapping[int, int]): Bitflip syndrome map from syndrome to error vector
+    """
+    global __parity_bitflip_syndrome_map_dscc_272_190
+    __parity_bitflip_syndrome_map_dscc_272_190 = syndrome_map
+
+
+__bit_syndromes_dscc_272_190: list[int] | None = None
+
+
+def __get_bit_syndromes_dscc_272_190() -> list[int]:
+    """Get syndromes of single bit errors of DSCC(272,190)
+
+    Returns:
+        list[int]: Syndrome of an error at bit 0 to 271
+    """
+    global __bit_syndromes_dscc_272_190
+    bit_syndromes = __bit_syndromes_dscc_272_190
+    if bit_syndromes is None:
+        with __tables_lock:
+            bit_syndromes = __bit_syndromes_dscc_272_190
+            if bit_syndromes is None:
+                bit_syndromes = [
+                    crc_82_darc(bitstring.Bits(uint=1 << (271 - i), length=272))
+                    for i in range(272)
+                ]
+                __bit_syndromes_dscc_272_190 = bit_syndromes
+    return bit_syndromes
+
+
+def clear_tables_dscc_272_190() -> None:
+    """Drop the lazily generated DSCC(272,190) tables
+
+    They are generated again on next use, such as to release memory or to stress
+    their initialization from many threads.
+    """
+    global __parity_bitflip_syndrome_map_dscc_272_190, __bit_syndromes_dscc_272_190
+    with __tables_lock:
+        __parity_bitflip_syndrome_map_dscc_272_190 = None
+        __bit_syndromes_dscc_272_190 = None
+
+
+def __correct_error_chase(
+    buffer: bitstring.Bits,
+    syndrome: int,
+    reliabilities: Sequence[float],
+    chase_bits: int,
+) -> bitstring.Bits | None:
+    """Correct error with Chase algorithm
+
+    Every combination of flips of the least reliable bits is tried before the
+    syndrome lookup. The syndrome is linear, so a flip only XORs its syndrome.
+    The candidate with the least sum of reliabilities of corrected bits is chosen.
+
+    Args:
+        buffer (bitstring.Bits): Buffer
+        syndrome (int): Syndrome of buffer
+        reliabilities (Sequence[float]): Reliability of each bit
+        chase_bits (int): Number of least reliable bits to flip
+
+    Returns:
+        bitstring.Bits | None: bitstring.Bits if data corrected, else None
+    """
+    syndrome_map = get_parity_bitflip_syndrome_map_dscc_272_190()
+    bit_syndromes = __get_bit_syndromes_dscc_272_190()
+    positions = heapq.nsmallest(chase_bits, range(272), key=reliabilities.__getitem__)
+
+    best_error_vector: int | None = None
+    best_metric = 0.0
+    for pattern in range(1 << len(positions)):
+        flip_syndrome = 0
+        error_vector = 0
+        for k, position in enumerate(positions):
+            if pattern >> k & 1:
+                flip_syndrome ^= bit_syndromes[position]
+                error_vector ^= 1 << (271 - position)
+        if flip_syndrome != syndrome:
+            burst_error_vector = syndrome_map.get(syndrome ^ flip_syndrome)
+            if burst_error_vector is None:
+                continue
+            error_vector ^= burst_error_vector
+
+        metric = 0.0
+        remaining = error_vector
+        while remaining != 0:
+            lowest = remaining & -remaining
+            metric += reliabilities[272 - lowest.bit_length()]
+            remaining ^= lowest
+        if best_error_vector is None or metric < best_metric:
+            best_error_vector = error_vector
+            best_metric = metric
+
+    if best_error_vector is None:
+        __logger.warning("Error vector not found. Cannot correct error.")
+        return
+    __logger.debug(
+        "Error vector found. error_vector=%#x metric=%f", best_error_vector, best_metric
+    )
+    return buffer ^ bitstring.Bits(uint=best_error_vector, length=272)
 
 
-def correct_error_dscc_272_190(buffer: bitstring.Bits) -> bitstring.Bits | None:
+def correct_error_dscc_272_190(
+    buffer: bitstring.Bits,
+    reliabilities: Sequence[float] | None = None,
+    chase_bits: int = 4,
+) -> bitstring.Bits | None:
     """Correct error with Difference Set Cyclic Codes (272,190)
 
+    With reliabilities, the least reliable bits are also flipped before the
+    syndrome lookup (Chase algorithm). It is only done if the syndrome is not zero.
+
     Args:
         buffer (bitstring.Bits): Buffer
+        reliabilities (Sequence[float] | None, optional): Reliability of each bit, such as the absolute value of its log-likelihood ratio. 0 for an erasure. Defaults to None.
+        chase_bits (int, optional): Number of least reliable bits to flip. Defaults to 4.
 
     Returns:
         bitstring.Bits | None: bitstring.Bits if data corrected, else None
     """
     if len(buffer) != 272:
         raise ValueError("buffer length must be 272.")
+    if reliabilities is not None and len(reliabilities) != 272:
+        raise ValueError("reliabilities length must be 272.")
 
     syndrome = crc_82_darc(buffer)
     if syndrome == 0:
         return buffer
 
     __logger.debug(
-        f"Syndrome is not zero. Try correct error with parity. syndrome={hex(syndrome)}"
+        "Syndrome is not zero. Try correct error with parity. syndrome=%#x", syndrome
     )
-    try:
-        error_vector = __parity_bitflip_syndrome_map_dscc_272_190[syndrome]
-        __logger.debug(f"Error vector found. error_vector={error_vector.bytes.hex()}")
-        return buffer ^ error_vector
-    except KeyError:
+    if reliabilities is not None:
+        return __correct_error_chase(buffer, syndrome, reliabilities, chase_bits)
+    error_vector = get_parity_bitflip_syndrome_map_dscc_272_190().get(syndrome)
+    if error_vector is None:
         __logger.warning("Error vector not found. Cannot correct error.")
         return
+    __logger.debug("Error vector found. error_vector=%#x", error_vector)
+    return buffer ^ bitstring.Bits(uint=error_vector, length=272)
+
+
+def get_crc_82_darc_table() -> list[int]:
+    """Get CRC-82/DARC table
+
+    Returns:
+        list[int]: CRC-82/DARC table
+    """
+    return __crc_82_darc_table
+
+
+def set_crc_82_darc_table(table: Sequence[int]) -> None:
+    """Set CRC-82/DARC table, such as one loaded from shared tables
+
+    Args:
+        table (Sequence[int]): CRC-82/DARC table
+
+    Raises:
+        ValueError: Invalid table length
+    """
+    global __crc_82_darc_table
+    if len(table) != 256:
+        raise ValueError("table length must be 256.")
+    # Indexing a list is faster than indexing a memoryview
+    __crc_82_darc_table = list(table)
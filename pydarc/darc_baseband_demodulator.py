@@ -0,0 +1,254 @@
+import wave
+from logging import getLogger
+from typing import BinaryIO, Generator, Iterable
+
+import numpy as np
+
+# 16 kbit/s on a 76 kHz subcarrier
+SUBCARRIER_FREQUENCY = 76000.0
+SYMBOL_RATE = 16000.0
+
+
+def read_wav_samples(
+    stream: BinaryIO, block_size: int = 1 << 16
+) -> Generator[tuple[int, np.ndarray], None, None]:
+    """Read FM multiplex samples from a PCM WAV stream in blocks
+
+    The first channel is used.
+
+    Args:
+        stream (BinaryIO): WAV stream
+        block_size (int, optional): Number of samples per block. Defaults to 65536.
+
+    Raises:
+        ValueError: Unsupported sample width
+
+    Yields:
+        Generator[tuple[int, np.ndarray], None, None]: Sample rate and float32 samples
+    """
+    with wave.open(stream, "rb") as wav:
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        if sample_width == 1:
+            dtype, offset, scale = np.uint8, 128.0, 128.0
+        elif sample_width == 2:
+            dtype, offset, scale = np.int16, 0.0, 32768.0
+        elif sample_width == 4:
+            dtype, offset, scale = np.int32, 0.0, 2147483648.0
+        else:
+            raise ValueError(f"Unsupported sample width. sample_width={sample_width}")
+
+        while True:
+            frames = wav.readframes(block_size)
+            if len(frames) == 0:
+                return
+            samples = np.frombuffer(frames, dtype)[::channels]
+            yield sample_rate, ((samples - offset) / scale).astype(np.float32)
+
+
+def read_float32_samples(
+    stream: BinaryIO, block_size: int = 1 << 16
+) -> Generator[np.ndarray, None, None]:
+    """Read raw float32 FM multiplex samples in blocks
+
+    Args:
+        stream (BinaryIO): Raw float32 stream in native byte order
+        block_size (int, optional): Number of samples per block. Defaults to 65536.
+
+    Yields:
+        Generator[np.ndarray, None, None]: float32 samples
+    """
+    remainder = b""
+    while True:
+        buffer = stream.read(4 * block_size)
+        if len(buffer) == 0:
+            return
+        buffer = remainder + buffer
+        length = len(buffer) - len(buffer) % 4
+        remainder = buffer[length:]
+        yield np.frombuffer(buffer[:length], np.float32)
+
+
+def demodulate_samples(
+    blocks: Iterable[tuple[float, np.ndarray]], invert: bool = False
+) -> Generator[float, None, None]:
+    """Demodulate blocks of FM multiplex samples into soft decisions
+
+    Args:
+        blocks (Iterable[tuple[float, np.ndarray]]): Sample rate and samples
+        invert (bool, optional): Invert bit polarity. Defaults to False.
+
+    Yields:
+        Generator[float, None, None]: Soft decisions. Positive for 1.
+    """
+    demodulator: DarcBasebandDemodulator | None = None
+    for sample_rate, samples in blocks:
+        if demodulator is None:
+            demodulator = DarcBasebandDemodulator(sample_rate, invert)
+        yield from demodulator.push_samples_soft(samples).tolist()
+
+
+class DarcBasebandDemodulator:
+    """DARC Baseband Demodulator
+
+    Demodulate L-MSK on the 76 kHz subcarrier of FM multiplex samples into bits.
+    Samples are processed in blocks with NumPy:
+
+    1. Mix the subcarrier down to complex baseband
+    2. Low-pass filter and decimate with a windowed sinc FIR filter
+    3. Demodulate MSK with a frequency discriminator integrated over a symbol
+    4. Recover symbol timing with the Oerder-Meyr square-law estimator per block
+    """
+
+    __logger = getLogger(__name__)
+
+    def __init__(
+        self,
+        sample_rate: float,
+        invert: bool = False,
+        cutoff_frequency: float = 16000.0,
+        taps: int = 63,
+    ) -> None:
+        """Constructor
+
+        Args:
+            sample_rate (float): Sample rate of FM multiplex in Hz. Must be greater than 2 * (76 kHz + cutoff_frequency).
+            invert (bool, optional): Invert bit polarity. Defaults to False.
+            cutoff_frequency (float, optional): Cutoff frequency of the low-pass filter in Hz. Defaults to 16000.0.
+            taps (int, optional): Number of taps of the low-pass filter at the input sample rate. Defaults to 63.
+
+        Raises:
+            ValueError: Sample rate is too low
+        """
+        if sample_rate <= 2 * (SUBCARRIER_FREQUENCY + cutoff_frequency):
+            raise ValueError(
+                f"sample_rate must be greater than {2 * (SUBCARRIER_FREQUENCY + cutoff_frequency)}."
+            )
+
+        # Keep at least 4 samples per symbol after decimation
+        self.__decimation = max(1, int(sample_rate // (4 * SYMBOL_RATE)))
+        self.__samples_per_symbol = sample_rate / self.__decimation / SYMBOL_RATE
+        self.__symbol_length = max(1, round(self.__samples_per_symbol))
+
+        # Windowed sinc low-pass filter
+        n = np.arange(taps) - (taps - 1) / 2
+        self.__filter = (
+            2
+            * cutoff_frequency
+            / sample_rate
+            * np.sinc(2 * cutoff_frequency / sample_rate * n)
+        ) * np.hamming(taps)
+        self.__filter /= self.__filter.sum()
+
+        self.__oscillator_step = -2 * np.pi * SUBCARRIER_FREQUENCY / sample_rate
+        # Oscillator phase at the next input sample, wrapped modulo 2 pi
+        self.__oscillator_phase = 0.0
+        # Input samples kept for the filter
+        self.__filter_state = np.zeros(taps - 1, np.complex64)
+        # Offset of the decimation in the next block
+        self.__decimation_offset = 0
+        # Last baseband sample for the discriminator
+        self.__last_baseband = np.complex64(1.0)
+        # Discriminator output kept for integration and interpolation
+        self.__frequency_state = np.zeros(0, np.float32)
+        # Position of the next symbol in the kept discriminator output
+        self.__next_symbol = float(self.__symbol_length)
+
+        self.sample_rate = sample_rate
+        self.invert = invert
+
+    def push_samples(self, samples: np.ndarray) -> bytes:
+        """Push FM multiplex samples
+
+        Args:
+            samples (np.ndarray): Real samples
+
+        Returns:
+            bytes: Bits with one bit per byte
+        """
+        return (0 < self.push_samples_soft(samples)).astype(np.uint8).tobytes()
+
+    def push_samples_soft(self, samples: np.ndarray) -> np.ndarray:
+        """Push FM multiplex samples and get soft decisions
+
+        Args:
+            samples (np.ndarray): Real samples
+
+        Returns:
+            np.ndarray: float32 soft decisions. Positive for 1, and the absolute value is the reliability.
+        """
+        if len(samples) == 0:
+            return np.zeros(0, np.float32)
+
+        # Mix the subcarrier down with a phase continuous oscillator
+        phase = self.__oscillator_phase + self.__oscillator_step * np.arange(
+            len(samples), dtype=np.float64
+        )
+        self.__oscillator_phase = (
+            self.__oscillator_phase + self.__oscillator_step * len(samples)
+        ) % (2 * np.pi)
+        mixed = (samples * np.exp(1j * phase)).astype(np.complex64)
+
+        # Filter and decimate
+        buffer = np.concatenate((self.__filter_state, mixed))
+        self.__filter_state = buffer[len(buffer) - len(self.__filter_state) :]
+        filtered = np.convolve(buffer, self.__filter, "valid")
+        baseband = filtered[self.__decimation_offset :: self.__decimation]
+        self.__decimation_offset = (
+            self.__decimation_offset - len(filtered)
+        ) % self.__decimation
+        if len(baseband) == 0:
+            return np.zeros(0, np.float32)
+
+        # Frequency discriminator
+        previous = np.concatenate(([self.__last_baseband], baseband[:-1]))
+        self.__last_baseband = baseband[-1]
+        frequency = np.angle(baseband * np.conj(previous)).astype(np.float32)
+        frequency = np.concatenate((self.__frequency_state, frequency))
+
+        # Integrate over a symbol. integrated[i] is the phase change up to frequency[i + symbol_length].
+        cumulative = np.concatenate(([0.0], np.cumsum(frequency, dtype=np.float64)))
+        integrated = (
+            cumulative[self.__symbol_length :] - cumulative[: -self.__symbol_length]
+        )
+        if len(integrated) < 2:
+            self.__frequency_state = frequency
+            return np.zeros(0, np.float32)
+
+        # Oerder-Meyr timing estimate. The squared integrator output peaks at symbol ends.
+        positions = np.arange(len(integrated))
+        spectral_line = np.sum(
+            integrated**2 * np.exp(-2j * np.pi * positions / self.__samples_per_symbol)
+        )
+        timing = (
+            -np.angle(spectral_line) / (2 * np.pi) * self.__samples_per_symbol
+        ) % self.__samples_per_symbol
+
+        # Move the next symbol to the estimated timing by less than half a symbol
+        error = (timing - self.__next_symbol) % self.__samples_per_symbol
+        if self.__samples_per_symbol / 2 <= error:
+            error -= self.__samples_per_symbol
+        next_symbol = self.__next_symbol + error
+        if next_symbol < 0:
+            next_symbol += self.__samples_per_symbol
+
+        # Interpolate the integrator output at symbol positions
+        symbol_positions = np.arange(
+            next_symbol, len(integrated) - 1, self.__samples_per_symbol
+        )
+        index = symbol_positions.astype(np.int64)
+        fraction = symbol_positions - index
+        symbols = (1 - fraction) * integrated[index] + fraction * integrated[index + 1]
+
+        # Keep the discriminator output after the last symbol
+        next_symbol = (
+            symbol_positions[-1] + self.__samples_per_symbol
+            if len(symbol_positions) != 0
+            else next_symbol
+        )
+        kept = min(max(0, int(next_symbol) - 1), len(frequency))
+        self.__frequency_state = frequency[kept:]
+        self.__next_symbol = next_symbol - kept
+
+        return (-symbols if self.invert else symbols).astype(np.float32)
@@ -0,0 +1,320 @@
+import mmap
+import os
+from collections import deque
+from typing import BinaryIO, Callable, Generator, Iterable, Self
+
+from pydarc.darc_decoder_checkpoint import DarcDecoderCheckpoint
+from pydarc.darc_l2_block_decoder import DarcL2BlockDecoder
+from pydarc.darc_l2_data import DarcL2Frame, DarcL2InformationBlock, DarcL2ParityBlock
+from pydarc.darc_l2_frame_capture import DarcL2FrameCaptureReader
+from pydarc.darc_l2_frame_decoder import DarcL2FrameDecoder
+from pydarc.darc_l2_parallel_frame_decoder import decode_frames_parallel
+from pydarc.darc_l2_sync_index import DarcL2SyncIndex
+from pydarc.darc_l3_data import (
+    DarcL3DataPacket,
+    DarcL3DataPacketServiceIdentificationCode,
+)
+from pydarc.darc_l3_data_packet_decoder import DarcL3DataPacketDecoder
+from pydarc.darc_l4_data import DarcL4DataGroup1, DarcL4DataGroup2
+from pydarc.darc_l4_data_group_decoder import DarcL4DataGroupDecoder
+from pydarc.darc_l4_data_group_deduplicator import DarcL4DataGroupDeduplicator
+from pydarc.darc_metrics import DarcMetrics
+
+
+class DarcDecoder:
+    """DARC Decoder
+
+    Chain of the L2 Block, L2 Frame, L3 Data Packet and L4 Data Group decoders.
+    Data Groups are yielded lazily by the decode methods, and each layer is passed
+    to its callback as it is decoded, so no per-Frame lists are built.
+
+    on_frame is called after the Data Groups completed by the Frame, so that the
+    decoder state is consistent with the outputs at that point.
+    """
+
+    def __init__(
+        self,
+        service_ids: set[DarcL3DataPacketServiceIdentificationCode] | None = None,
+        deduplicate: str = "none",
+        metrics: DarcMetrics | None = None,
+        on_block: (
+            Callable[[DarcL2InformationBlock | DarcL2ParityBlock], None] | None
+        ) = None,
+        on_frame: Callable[[DarcL2Frame, int], None] | None = None,
+        on_data_packet: Callable[[DarcL3DataPacket], None] | None = None,
+        on_data_group: (
+            Callable[[DarcL4DataGroup1 | DarcL4DataGroup2, bool | None], None] | None
+        ) = None,
+    ) -> None:
+        """Constructor
+
+        Args:
+            service_ids (set[DarcL3DataPacketServiceIdentificationCode] | None, optional): Service IDs to decode. None to decode all. Defaults to None.
+            deduplicate (str, optional): none, suppress to drop repeated Data Groups or flag to mark them. Defaults to "none".
+            metrics (DarcMetrics | None, optional): Metrics to update. Defaults to None.
+            on_block (Callable[[DarcL2InformationBlock | DarcL2ParityBlock], None] | None, optional): Called with each Block. Not called by the parallel and sync index engines. Defaults to None.
+            on_frame (Callable[[DarcL2Frame, int], None] | None, optional): Called with each Frame and the offset of its end. Defaults to None.
+            on_data_packet (Callable[[DarcL3DataPacket], None] | None, optional): Called with each Data Packet. Defaults to None.
+            on_data_group (Callable[[DarcL4DataGroup1 | DarcL4DataGroup2, bool | None], None] | None, optional): Called with each Data Group and whether it is a repetition (None unless flag). Defaults to None.
+
+        Raises:
+            ValueError: Invalid deduplicate
+        """
+        if deduplicate not in ["none", "suppress", "flag"]:
+            raise ValueError(f"Invalid deduplicate. deduplicate={deduplicate}")
+
+        self.l2_block_decoder = DarcL2BlockDecoder(metrics)
+        self.l2_frame_decoder = DarcL2FrameDecoder(metrics)
+        self.l3_data_packet_decoder = DarcL3DataPacketDecoder(service_ids, metrics)
+        self.l4_data_group_decoder = DarcL4DataGroupDecoder(metrics)
+        self.l4_data_group_deduplicator = (
+            None if deduplicate == "none" else DarcL4DataGroupDeduplicator()
+        )
+
+        self.deduplicate = deduplicate
+        self.metrics = metrics
+        self.on_block = on_block
+        self.on_frame = on_frame
+        self.on_data_packet = on_data_packet
+        self.on_data_group = on_data_group
+        # Number of bits consumed from the bitstream
+        self.bit_offset = 0
+
+    def get_checkpoint(self) -> DarcDecoderCheckpoint:
+        """Get a checkpoint of the decoder chain
+
+        Returns:
+            DarcDecoderCheckpoint: Checkpoint at the current bit offset
+        """
+        return DarcDecoderCheckpoint(
+            self.bit_offset,
+            self.l2_block_decoder,
+            self.l2_frame_decoder,
+            self.l3_data_packet_decoder,
+            self.l4_data_group_decoder,
+        )
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: DarcDecoderCheckpoint, **kwargs) -> Self:
+        """Construct from a checkpoint
+
+        Service IDs saved in the checkpoint are kept unless service_ids is given.
+
+        Args:
+            checkpoint (DarcDecoderCheckpoint): Checkpoint
+            **kwargs: Arguments of the constructor
+
+        Returns:
+            Self: DarcDecoder instance
+        """
+        decoder = cls(**kwargs)
+        decoder.bit_offset = checkpoint.bit_offset
+        decoder.l2_block_decoder = checkpoint.l2_block_decoder
+        decoder.l2_frame_decoder = checkpoint.l2_frame_decoder
+        decoder.l3_data_packet_decoder = checkpoint.l3_data_packet_decoder
+        decoder.l4_data_group_decoder = checkpoint.l4_data_group_decoder
+        if kwargs.get("service_ids") is not None:
+            decoder.l3_data_packet_decoder.service_ids = kwargs["service_ids"]
+        decoder.l2_block_decoder.metrics = decoder.metrics
+        decoder.l2_frame_decoder.metrics = decoder.metrics
+        decoder.l3_data_packet_decoder.metrics = decoder.metrics
+        decoder.l4_data_group_decoder.metrics = decoder.metrics
+        return decoder
+
+    def __push_frame(
+        self, frame: DarcL2Frame, bit_offset: int
+    ) -> Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]:
+        """Decode a Frame through L3 and L4
+
+        Args:
+            frame (DarcL2Frame): Frame
+            bit_offset (int): Offset of the end of the Frame
+
+        Yields:
+            Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]: Data Groups
+        """
+        for block in frame.blocks:
+            data_packet = self.l3_data_packet_decoder.push_block(block)
+            if data_packet is None:
+                continue
+            if self.on_data_packet is not None:
+                self.on_data_packet(data_packet)
+
+            data_group = self.l4_data_group_decoder.push_data_packet(data_packet)
+            if data_group is None:
+                continue
+            is_duplicate: bool | None = None
+            if self.l4_data_group_deduplicator is not None:
+                is_duplicate = self.l4_data_group_deduplicator.is_duplicate(data_group)
+                if is_duplicate and self.deduplicate == "suppress":
+                    continue
+                if self.deduplicate != "flag":
+                    is_duplicate = None
+            if self.on_data_group is not None:
+                self.on_data_group(data_group, is_duplicate)
+            yield data_group
+
+        if self.on_frame is not None:
+            self.on_frame(frame, bit_offset)
+
+    def decode_bits(
+        self, bits: Iterable[int], reliabilities: Iterable[float] | None = None
+    ) -> Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]:
+        """Decode bits
+
+        Args:
+            bits (Iterable[int]): Bits, such as bytes with one bit per byte
+            reliabilities (Iterable[float] | None, optional): Reliability of each bit. None for hard decision input. Defaults to None.
+
+        Yields:
+            Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]: Data Groups
+        """
+        reliability_iterator = None if reliabilities is None else iter(reliabilities)
+        for bit in bits:
+            self.bit_offset += 1
+            block = self.l2_block_decoder.push_bit(
+                bit,
+                None if reliability_iterator is None else next(reliability_iterator),
+            )
+            if block is None:
+                continue
+            if self.on_block is not None:
+                self.on_block(block)
+            frame = self.l2_frame_decoder.push_block(block)
+            if frame is None:
+                continue
+            yield from self.__push_frame(frame, self.bit_offset)
+
+    def decode_soft_bits(
+        self, soft_bits: Iterable[float]
+    ) -> Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]:
+        """Decode soft decisions
+
+        Args:
+            soft_bits (Iterable[float]): Soft decisions. Positive for 1, and the absolute value is the reliability.
+
+        Yields:
+            Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]: Data Groups
+        """
+        for soft_bit in soft_bits:
+            self.bit_offset += 1
+            block = self.l2_block_decoder.push_bit(
+                1 if 0 < soft_bit else 0, abs(soft_bit)
+            )
+            if block is None:
+                continue
+            if self.on_block is not None:
+                self.on_block(block)
+            frame = self.l2_frame_decoder.push_block(block)
+            if frame is None:
+                continue
+            yield from self.__push_frame(frame, self.bit_offset)
+
+    def decode_frames(
+        self, frames: Iterable[tuple[int, DarcL2Frame]]
+    ) -> Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]:
+        """Decode Frames decoded elsewhere, such as a Frame capture
+
+        Args:
+            frames (Iterable[tuple[int, DarcL2Frame]]): Offset of the end of the Frame and Frame
+
+        Yields:
+            Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]: Data Groups
+        """
+        for bit_offset, frame in frames:
+            self.bit_offset = bit_offset
+            yield from self.__push_frame(frame, bit_offset)
+
+    def decode_stream(
+        self, stream: BinaryIO, chunk_size: int = 1 << 16
+    ) -> Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]:
+        """Decode a bitstream with one bit per byte
+
+        Bits are read as soon as they are available, so a live stream is not delayed
+        by chunk_size.
+
+        Args:
+            stream (BinaryIO): Bitstream
+            chunk_size (int, optional): Maximum number of bits per read. Defaults to 65536.
+
+        Yields:
+            Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]: Data Groups
+        """
+        read = getattr(stream, "read1", stream.read)
+        while True:
+            bits = read(chunk_size)
+            if len(bits) == 0:
+                return
+            yield from self.decode_bits(bits)
+
+    def decode_capture(
+        self, stream: BinaryIO
+    ) -> Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]:
+        """Decode a Frame capture
+
+        Args:
+            stream (BinaryIO): Frame capture
+
+        Yields:
+            Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]: Data Groups
+        """
+        yield from self.decode_frames(DarcL2FrameCaptureReader(stream))
+
+    def decode_file(
+        self,
+        path: str,
+        processes: int = 1,
+        index_path: str | None = None,
+        start_frame: int | None = None,
+        tables_path: str | None = None,
+    ) -> Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]:
+        """Decode a bitstream file with one bit per byte
+
+        The sequential engine continues from the current bit offset. The sync index
+        engine starts at start_frame, and the parallel engine decodes L2 in worker
+        processes. Both of them skip on_block.
+
+        Args:
+            path (str): Bitstream path
+            processes (int, optional): Number of worker processes. Defaults to 1.
+            index_path (str | None, optional): Sync index path (built if missing). Defaults to None.
+            start_frame (int | None, optional): Frame number in the sync index to start at. Defaults to None.
+            tables_path (str | None, optional): Shared tables path for worker processes to attach to. Defaults to None.
+
+        Yields:
+            Generator[DarcL4DataGroup1 | DarcL4DataGroup2, None, None]: Data Groups
+        """
+        sync_index: DarcL2SyncIndex | None = None
+        if index_path is not None and os.path.exists(index_path):
+            sync_index = DarcL2SyncIndex.load(index_path)
+        elif index_path is not None or start_frame is not None:
+            sync_index = DarcL2SyncIndex.build(path)
+            if index_path is not None:
+                sync_index.save(index_path)
+
+        if start_frame is not None:
+            yield from self.decode_frames(sync_index.frames(path, start_frame))
+        elif 1 < processes:
+            yield from self.decode_frames(
+                decode_frames_parallel(path, processes, tables_path=tables_path)
+            )
+        else:
+            with open(path, "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    while self.bit_offset < len(buffer):
+                        yield from self.decode_bits(
+                            buffer[self.bit_offset : self.bit_offset + (1 << 20)]
+                        )
+
+    def push_bits(
+        self, bits: Iterable[int], reliabilities: Iterable[float] | None = None
+    ) -> None:
+        """Push bits in bulk to the callbacks
+
+        Args:
+            bits (Iterable[int]): Bits, such as bytes with one bit per byte
+            reliabilities (Iterable[float] | None, optional): Reliability of each bit. None for hard decision input. Defaults to None.
+        """
+        deque(self.decode_bits(bits, reliabilities), maxlen=0)
@@ -0,0 +1,128 @@
+import os
+import struct
+from typing import Self
+
+from pydarc.darc_l2_block_decoder import DarcL2BlockDecoder
+from pydarc.darc_l2_frame_decoder import DarcL2FrameDecoder
+from pydarc.darc_l3_data_packet_decoder import DarcL3DataPacketDecoder
+from pydarc.darc_l4_data_group_decoder import DarcL4DataGroupDecoder
+
+CHECKPOINT_MAGIC = b"DARCCKP"
+CHECKPOINT_VERSION = 1
+
+# version, bit_offset
+CHECKPOINT_HEADER = struct.Struct("<BQ")
+# Length of each decoder state
+CHECKPOINT_SECTION = struct.Struct("<I")
+
+
+class DarcDecoderCheckpoint:
+    """DARC Decoder Checkpoint
+
+    State of the whole decoder chain and the bit offset in the source bitstream
+    at which it was taken.
+    """
+
+    def __init__(
+        self,
+        bit_offset: int,
+        l2_block_decoder: DarcL2BlockDecoder,
+        l2_frame_decoder: DarcL2FrameDecoder,
+        l3_data_packet_decoder: DarcL3DataPacketDecoder,
+        l4_data_group_decoder: DarcL4DataGroupDecoder,
+    ) -> None:
+        """Constructor
+
+        Args:
+            bit_offset (int): Number of bits consumed from the source bitstream
+            l2_block_decoder (DarcL2BlockDecoder): L2 Block Decoder
+            l2_frame_decoder (DarcL2FrameDecoder): L2 Frame Decoder
+            l3_data_packet_decoder (DarcL3DataPacketDecoder): L3 Data Packet Decoder
+            l4_data_group_decoder (DarcL4DataGroupDecoder): L4 Data Group Decoder
+        """
+        self.bit_offset = bit_offset
+        self.l2_block_decoder = l2_block_decoder
+        self.l2_frame_decoder = l2_frame_decoder
+        self.l3_data_packet_decoder = l3_data_packet_decoder
+        self.l4_data_group_decoder = l4_data_group_decoder
+
+    def to_bytes(self) -> bytes:
+        """To bytes
+
+        Returns:
+            bytes: Serialized checkpoint
+        """
+        buffer = bytearray(CHECKPOINT_MAGIC)
+        buffer += CHECKPOINT_HEADER.pack(CHECKPOINT_VERSION, self.bit_offset)
+        for state in [
+            self.l2_block_decoder.get_state(),
+            self.l2_frame_decoder.get_state(),
+            self.l3_data_packet_decoder.get_state(),
+            self.l4_data_group_decoder.get_state(),
+        ]:
+            buffer += CHECKPOINT_SECTION.pack(len(state))
+            buffer += state
+        return bytes(buffer)
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes) -> Self:
+        """Construct from bytes
+
+        Args:
+            buffer (bytes): Serialized checkpoint
+
+        Raises:
+            ValueError: Not a checkpoint or unsupported version
+
+        Returns:
+            Self: DarcDecoderCheckpoint instance
+        """
+        if buffer[: len(CHECKPOINT_MAGIC)] != CHECKPOINT_MAGIC:
+            raise ValueError("buffer is not a DARC decoder checkpoint.")
+        version, bit_offset = CHECKPOINT_HEADER.unpack_from(
+            buffer, len(CHECKPOINT_MAGIC)
+        )
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version. version={version}")
+
+        states: list[memoryview] = []
+        offset = len(CHECKPOINT_MAGIC) + CHECKPOINT_HEADER.size
+        for _ in range(4):
+            (length,) = CHECKPOINT_SECTION.unpack_from(buffer, offset)
+            offset += CHECKPOINT_SECTION.size
+            states.append(memoryview(buffer)[offset : offset + length])
+            offset += length
+
+        l2_block_decoder = DarcL2BlockDecoder.from_state(states[0])
+        l2_block_decoder.bit_offset = bit_offset
+        return cls(
+            bit_offset,
+            l2_block_decoder,
+            DarcL2FrameDecoder.from_state(states[1]),
+            DarcL3DataPacketDecoder.from_state(states[2]),
+            DarcL4DataGroupDecoder.from_state(states[3]),
+        )
+
+    def save(self, path: str) -> None:
+        """Save to a file atomically
+
+        Args:
+            path (str): Checkpoint path
+        """
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(self.to_bytes())
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        """Load from a file
+
+        Args:
+            path (str): Checkpoint path
+
+        Returns:
+            Self: DarcDecoderCheckpoint instance
+        """
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
@@ -1,11 +1,17 @@
 import bitstring
+import struct
+import time
 from logging import getLogger
+from typing import Self
 
 from pydarc.darc_l2_data import (
     DarcL2BlockIdentificationCode,
     DarcL2InformationBlock,
     DarcL2ParityBlock,
 )
+from pydarc.bit_operations import pack_bits, unpack_bits
+from pydarc.crc_82_darc import correct_error_dscc_272_190
+from pydarc.darc_metrics import DarcMetrics
 from pydarc.lfsr import lfsr
 
 
@@ -14,13 +20,31 @@ class DarcL2BlockDecoder:
 
     __logger = getLogger(__name__)
 
-    def __init__(self) -> None:
-        """Constructor"""
+    # version, current_bic, allowable_bic_errors
+    __state_header = struct.Struct("<BHB")
+    __state_version = 1
+
+    def __init__(self, metrics: DarcMetrics | None = None) -> None:
+        """Constructor
+
+        Args:
+            metrics (DarcMetrics | None, optional): Metrics to update. Defaults to None.
+        """
         self.__current_bic = 0x0000
         self.__data_buffer: bitstring.BitStream = bitstring.BitStream()
+        # Reliabilities of collected bits for soft decision input
+        self.__reliabilities: list[float] = []
         self.__lfsr = lfsr(0x155, 0x110)
+        # Block sync tracking
+        self.__synchronized = False
+        self.__hunting_bits = 0
+        # time.monotonic() at the first data bit of the current Block
+        self.__ingest_time = 0.0
 
         self.allowable_bic_errors = 2
+        self.metrics = metrics
+        # Number of bits pushed. Set it when starting in the middle of a bitstream.
+        self.bit_offset = 0
 
     def __detected_bic(self) -> DarcL2BlockIdentificationCode | None:
         """Get detected Block Identification Code
@@ -71,39 +95,141 @@ class DarcL2BlockDecoder:
         """Reset the decoder"""
         self.__current_bic = 0x0000
         self.__data_buffer.clear()
+        self.__reliabilities.clear()
         self.__lfsr = lfsr(0x155, 0x110)
 
-    def push_bit(self, bit: int) -> DarcL2InformationBlock | DarcL2ParityBlock | None:
+    def get_state(self) -> bytes:
+        """Get the decoder state
+
+        Returns:
+            bytes: Decoder state
+        """
+        return DarcL2BlockDecoder.__state_header.pack(
+            DarcL2BlockDecoder.__state_version,
+            self.__current_bic,
+            self.allowable_bic_errors,
+        ) + pack_bits(self.__data_buffer)
+
+    @classmethod
+    def from_state(cls, state: bytes | memoryview) -> Self:
+        """Construct from a decoder state
+
+        Args:
+            state (bytes | memoryview): Decoder state
+
+        Raises:
+            ValueError: Unsupported state version
+
+        Returns:
+            Self: DarcL2BlockDecoder instance
+        """
+        version, current_bic, allowable_bic_errors = (
+            DarcL2BlockDecoder.__state_header.unpack_from(state)
+        )
+        if version != DarcL2BlockDecoder.__state_version:
+            raise ValueError(f"Unsupported state version. version={version}")
+        data_buffer, _ = unpack_bits(state, DarcL2BlockDecoder.__state_header.size)
+
+        decoder = cls()
+        decoder.__current_bic = current_bic
+        decoder.__data_buffer = bitstring.BitStream(data_buffer)
+        # The descrambler advances once per collected bit
+        for _ in range(len(data_buffer)):
+            next(decoder.__lfsr)
+        decoder.allowable_bic_errors = allowable_bic_errors
+        # Ingest time of a partial Block is not kept
+        decoder.__ingest_time = time.monotonic()
+        return decoder
+
+    def push_bit(
+        self, bit: int, reliability: float | None = None
+    ) -> DarcL2InformationBlock | DarcL2ParityBlock | None:
         """Push a bit
 
         Args:
             bit (int): 0 or 1
+            reliability (float | None, optional): Reliability of the bit, such as the absolute value of its log-likelihood ratio. None for hard decision input. Defaults to None.
 
         Returns:
             DarcL2InformationBlock | DarcL2ParityBlock | None: DarcL2BlockType if any Block detected, else None
         """
+        self.bit_offset += 1
+        if self.metrics is not None:
+            self.metrics.bits += 1
+
         if self.__detected_bic() is None:
             self.__current_bic = ((self.__current_bic << 1) | bit) & 0xFFFF
+            self.__hunting_bits += 1
+            # BIC did not follow the previous block
+            if self.__synchronized and 16 < self.__hunting_bits:
+                self.__synchronized = False
+                if self.metrics is not None:
+                    self.metrics.sync_losses += 1
             return
 
+        if len(self.__data_buffer) == 0:
+            self.__ingest_time = time.monotonic()
+            self.__hunting_bits = 0
+            if not self.__synchronized:
+                self.__synchronized = True
+                if self.metrics is not None:
+                    self.metrics.sync_acquisitions += 1
+
         # Descramble
         bit ^= next(self.__lfsr)
         self.__data_buffer += "0b0" if bit == 0 else "0b1"
+        if reliability is not None:
+            self.__reliabilities.append(reliability)
 
         # If bits have been collected
         if len(self.__data_buffer) == 272:
+            start_time = time.perf_counter()
             block_id = self.__detected_bic()
             self.__logger.debug(
-                f"272 bits collected. block_id={block_id.name} data_buffer={self.__data_buffer}"
+                "272 bits collected. block_id=%s data_buffer=%s",
+                block_id.name,
+                self.__data_buffer,
+            )
+
+            # Correct error. Reliabilities are incomplete right after from_state.
+            reliabilities = (
+                self.__reliabilities if len(self.__reliabilities) == 272 else None
             )
+            corrected_buffer = correct_error_dscc_272_190(
+                self.__data_buffer, reliabilities
+            )
+            if self.metrics is not None:
+                if corrected_buffer is None:
+                    self.metrics.rows_uncorrectable += 1
+                elif corrected_buffer is not self.__data_buffer:
+                    self.metrics.rows_corrected += 1
+            buffer = (
+                self.__data_buffer if corrected_buffer is None else corrected_buffer
+            )[0:190]
+
             block: DarcL2InformationBlock | DarcL2ParityBlock
             if self.__is_information_block_detected():
-                block = DarcL2InformationBlock.from_buffer(block_id, self.__data_buffer)
+                block = DarcL2InformationBlock.from_buffer(block_id, buffer)
             elif self.__is_parity_block_detected():
-                block = DarcL2ParityBlock.from_buffer(block_id, self.__data_buffer)
+                block = DarcL2ParityBlock.from_buffer(block_id, buffer)
             else:
                 raise ValueError("Unknown Block detected.")
-            self.__logger.debug(f"A block decoded. block_id={block.block_id.name}")
+            # 16 bits BIC and 272 bits data end at the current bit
+            block.bit_offset = self.bit_offset - (16 + 272)
+            block.ingest_time = self.__ingest_time
+            # Leave the uncorrectable Block to vertical parity with its reliabilities
+            if corrected_buffer is None and reliabilities is not None:
+                block.reliabilities = reliabilities[0:190]
+            self.__logger.debug("A block decoded. block_id=%s", block.block_id.name)
+
+            if self.metrics is not None:
+                self.metrics.blocks[block_id] = self.metrics.blocks.get(block_id, 0) + 1
+                self.metrics.add_layer_seconds(
+                    "l2_block", time.perf_counter() - start_time
+                )
+                self.metrics.observe_latency(
+                    "l2_block", time.monotonic() - block.ingest_time
+                )
 
             # Must call it when decode
             self.reset()
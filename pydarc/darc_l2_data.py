@@ -1,4 +1,5 @@
 import bitstring
+import math
 from enum import IntEnum
 from typing import Self
 
@@ -22,6 +23,9 @@ class DarcL2InformationBlock:
         block_id: DarcL2BlockIdentificationCode,
         data_packet: bitstring.Bits,
         crc: int,
+        bit_offset: int | None = None,
+        ingest_time: float | None = None,
+        reliabilities: list[float] | None = None,
     ) -> None:
         """Constructor
 
@@ -29,10 +33,18 @@ class DarcL2InformationBlock:
             block_id (DarcL2BlockIdentificationCode): Block ID
             data_packet (bitstring.Bits): Data Packet
             crc (int): Recorded CRC value
+            bit_offset (int | None, optional): Offset of the first BIC bit of the Block in the source bitstream. Defaults to None.
+            ingest_time (float | None, optional): time.monotonic() when the Block started to be ingested. Defaults to None.
+            reliabilities (list[float] | None, optional): Reliability of each bit if the Block is not correctable with horizontal parity. None if reliable. Defaults to None.
         """
         self.block_id = block_id
         self.data_packet = data_packet
         self.crc = crc
+        # Trace
+        self.bit_offset = bit_offset
+        self.ingest_time = ingest_time
+        # Soft decision
+        self.reliabilities = reliabilities
 
     def is_crc_valid(self) -> bool:
         """Is CRC valid
@@ -88,16 +100,26 @@ class DarcL2ParityBlock:
         self,
         block_id: DarcL2BlockIdentificationCode,
         vertical_parity: bitstring.Bits,
+        bit_offset: int | None = None,
+        ingest_time: float | None = None,
+        reliabilities: list[float] | None = None,
     ) -> None:
         """Constructor
 
         Args:
             block_id (DarcL2BlockIdentificationCode): Block ID
             vertical_parity (bitstring.Bits): Vertical parity
-            parity (bitstring.Bits): Parity
+            bit_offset (int | None, optional): Offset of the first BIC bit of the Block in the source bitstream. Defaults to None.
+            ingest_time (float | None, optional): time.monotonic() when the Block started to be ingested. Defaults to None.
+            reliabilities (list[float] | None, optional): Reliability of each bit if the Block is not correctable with horizontal parity. None if reliable. Defaults to None.
         """
         self.block_id = block_id
         self.vertical_parity = vertical_parity
+        # Trace
+        self.bit_offset = bit_offset
+        self.ingest_time = ingest_time
+        # Soft decision
+        self.reliabilities = reliabilities
 
     def to_buffer(self) -> bitstring.Bits:
         """To buffer
@@ -140,28 +162,22 @@ class DarcL2ParityBlock:
 class DarcL2Frame:
     """DARC L2 Frame"""
 
-    @staticmethod
-    def __correct_error_dscc_272_190(buffer: bitstring.Bits) -> bitstring.Bits:
-        """Correct error with Difference Set Cyclic Codes (272,190)
-
-        Args:
-            buffer (bitstring.Bits): Buffer
-
-        Returns:
-            bitstring.Bits: Error corrected buffer. However, return original If cannot correct error
-        """
-        error_corrected_buffer = correct_error_dscc_272_190(buffer)
-        if error_corrected_buffer is not None:
-            buffer = error_corrected_buffer
-        return buffer
-
-    def __init__(self, blocks: list[DarcL2InformationBlock]) -> None:
+    def __init__(
+        self,
+        blocks: list[DarcL2InformationBlock],
+        columns_corrected: int = 0,
+        columns_uncorrectable: int = 0,
+    ) -> None:
         """Constructor
 
         Args:
             blocks (list[DarcL2InformationBlock]): Blocks
+            columns_corrected (int, optional): Number of columns corrected with vertical parity. Defaults to 0.
+            columns_uncorrectable (int, optional): Number of columns not correctable with vertical parity. Defaults to 0.
         """
         self.blocks = blocks
+        self.columns_corrected = columns_corrected
+        self.columns_uncorrectable = columns_uncorrectable
 
     @classmethod
     def from_block_buffer(
@@ -192,28 +208,55 @@ class DarcL2Frame:
         # Create blocks 2D buffer
         blocks_2d_buffer = list(map(lambda x: bitstring.Bits(x.to_buffer()), blocks))
         # Rotate left
-        left_rotated_blocks_2d_buffer: list[bitstring.Bits] = map(
-            lambda x: bitstring.Bits(x), list(zip(*blocks_2d_buffer))[::-1]
+        left_rotated_blocks_2d_buffer: list[bitstring.Bits] = list(
+            map(lambda x: bitstring.Bits(x), list(zip(*blocks_2d_buffer))[::-1])
         )
+        # Reliabilities of columns if any Block is not correctable with horizontal parity
+        left_rotated_reliabilities: list[tuple[float, ...]] | None = None
+        if any(x.reliabilities is not None for x in blocks):
+            left_rotated_reliabilities = list(
+                zip(
+                    *(
+                        [math.inf] * 190 if x.reliabilities is None else x.reliabilities
+                        for x in blocks
+                    )
+                )
+            )[::-1]
         # Correct error with vertical parity
-        left_rotated_blocks_2d_buffer = map(
-            DarcL2Frame.__correct_error_dscc_272_190, left_rotated_blocks_2d_buffer
-        )
+        columns_corrected = 0
+        columns_uncorrectable = 0
+        for i, buffer in enumerate(left_rotated_blocks_2d_buffer):
+            error_corrected_buffer = correct_error_dscc_272_190(
+                buffer,
+                (
+                    None
+                    if left_rotated_reliabilities is None
+                    else left_rotated_reliabilities[i]
+                ),
+            )
+            if error_corrected_buffer is None:
+                columns_uncorrectable += 1
+            elif error_corrected_buffer is not buffer:
+                columns_corrected += 1
+                left_rotated_blocks_2d_buffer[i] = error_corrected_buffer
         # Rotate right
         blocks_2d_buffer = list(
             map(
                 lambda x: bitstring.Bits(x),
-                zip(*list(left_rotated_blocks_2d_buffer)[::-1]),
+                zip(*left_rotated_blocks_2d_buffer[::-1]),
             )
         )
 
         # Create Information Blocks from error corrected buffers
         error_corrected_blocks: list[DarcL2InformationBlock] = []
         for i in range(190):
-            error_corrected_blocks.append(
-                DarcL2InformationBlock.from_buffer(
-                    blocks[i].block_id, blocks_2d_buffer[i]
-                )
+            block = DarcL2InformationBlock.from_buffer(
+                blocks[i].block_id, blocks_2d_buffer[i]
             )
+            block.bit_offset = blocks[i].bit_offset
+            block.ingest_time = blocks[i].ingest_time
+            error_corrected_blocks.append(block)
 
-        return DarcL2Frame(error_corrected_blocks)
+        return DarcL2Frame(
+            error_corrected_blocks, columns_corrected, columns_uncorrectable
+        )
@@ -0,0 +1,128 @@
+import bitstring
+import struct
+import time
+from typing import BinaryIO, Generator
+
+from pydarc.darc_l2_data import (
+    DarcL2BlockIdentificationCode,
+    DarcL2Frame,
+    DarcL2InformationBlock,
+)
+
+CAPTURE_MAGIC = b"DARCCAP"
+CAPTURE_VERSION = 1
+
+# bit_offset
+CAPTURE_FRAME_HEADER = struct.Struct("<Q")
+# block_id, data_packet, crc
+CAPTURE_BLOCK = struct.Struct("<H22sH")
+CAPTURE_FRAME_SIZE = CAPTURE_FRAME_HEADER.size + 190 * CAPTURE_BLOCK.size
+
+# 16 bits BIC and 272 bits data
+BLOCK_BITS = 16 + 272
+
+# Block numbers (1 to 272) of Information Blocks in a Frame. The others are
+# Parity Blocks (BIC_4).
+INFORMATION_BLOCK_NUMBERS = tuple(
+    x
+    for x in range(1, 273)
+    if not ((14 <= x <= 136 and x % 3 == 1) or (150 <= x <= 272 and x % 3 == 2))
+)
+
+
+class DarcL2FrameCaptureWriter:
+    """DARC L2 Frame Capture Writer
+
+    Write error corrected Frames with their offsets in the source bitstream, so
+    that they can be replayed into L3 without bit sync and error correction.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """Constructor
+
+        Args:
+            stream (BinaryIO): Output stream
+        """
+        self.__stream = stream
+        self.__stream.write(CAPTURE_MAGIC + CAPTURE_VERSION.to_bytes())
+
+    def write(self, frame: DarcL2Frame, bit_offset: int) -> None:
+        """Write a Frame
+
+        Args:
+            frame (DarcL2Frame): Frame
+            bit_offset (int): Offset of the end of the Frame in the source bitstream
+
+        Raises:
+            ValueError: Invalid number of blocks
+        """
+        if len(frame.blocks) != 190:
+            raise ValueError("frame must have 190 blocks.")
+
+        record = bytearray(CAPTURE_FRAME_SIZE)
+        CAPTURE_FRAME_HEADER.pack_into(record, 0, bit_offset)
+        offset = CAPTURE_FRAME_HEADER.size
+        for block in frame.blocks:
+            CAPTURE_BLOCK.pack_into(
+                record, offset, block.block_id, block.data_packet.bytes, block.crc
+            )
+            offset += CAPTURE_BLOCK.size
+        self.__stream.write(record)
+
+    def flush(self) -> None:
+        """Flush the output stream"""
+        self.__stream.flush()
+
+
+class DarcL2FrameCaptureReader:
+    """DARC L2 Frame Capture Reader"""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """Constructor
+
+        Args:
+            stream (BinaryIO): Input stream
+
+        Raises:
+            ValueError: Not a capture or unsupported version
+        """
+        self.__stream = stream
+        header = self.__stream.read(len(CAPTURE_MAGIC) + 1)
+        if header[:-1] != CAPTURE_MAGIC:
+            raise ValueError("stream is not a DARC frame capture.")
+        if header[-1] != CAPTURE_VERSION:
+            raise ValueError(f"Unsupported capture version. version={header[-1]}")
+
+    def __iter__(self) -> Generator[tuple[int, DarcL2Frame], None, None]:
+        """Read Frames
+
+        Block bit offsets are derived from the end of the Frame, and the ingest
+        time is when the Frame is read.
+
+        Yields:
+            Generator[tuple[int, DarcL2Frame], None, None]: Offset of the end of the Frame in the source bitstream and Frame
+        """
+        while True:
+            record = self.__stream.read(CAPTURE_FRAME_SIZE)
+            if len(record) < CAPTURE_FRAME_SIZE:
+                return
+
+            (bit_offset,) = CAPTURE_FRAME_HEADER.unpack_from(record, 0)
+            ingest_time = time.monotonic()
+            blocks: list[DarcL2InformationBlock] = []
+            for block_number, (block_id, data_packet, crc) in zip(
+                INFORMATION_BLOCK_NUMBERS,
+                CAPTURE_BLOCK.iter_unpack(
+                    memoryview(record)[CAPTURE_FRAME_HEADER.size :]
+                ),
+            ):
+                blocks.append(
+                    DarcL2InformationBlock(
+                        DarcL2BlockIdentificationCode(block_id),
+                        bitstring.Bits(data_packet),
+                        crc,
+                        bit_offset - (273 - block_number) * BLOCK_BITS,
+                        ingest_time,
+                    )
+                )
+            yield bit_offset, DarcL2Frame(blocks)
@@ -1,4 +1,8 @@
+import bitstring
+import struct
+import time
 from logging import getLogger
+from typing import Self
 
 from pydarc.darc_l2_data import (
     DarcL2BlockIdentificationCode,
@@ -6,6 +10,7 @@ from pydarc.darc_l2_data import (
     DarcL2ParityBlock,
     DarcL2Frame,
 )
+from pydarc.darc_metrics import DarcMetrics
 
 
 class DarcL2FrameDecoder:
@@ -13,14 +18,83 @@ class DarcL2FrameDecoder:
 
     __logger = getLogger(__name__)
 
-    def __init__(self) -> None:
-        """Constructor"""
+    # version, number of blocks
+    __state_header = struct.Struct("<BH")
+    # block_id, 190 bits of Information Block or Parity Block
+    __state_block = struct.Struct("<H24s")
+    __state_version = 1
+
+    def __init__(self, metrics: DarcMetrics | None = None) -> None:
+        """Constructor
+
+        Args:
+            metrics (DarcMetrics | None, optional): Metrics to update. Defaults to None.
+        """
         self.__block_buffer: list[DarcL2InformationBlock | DarcL2ParityBlock] = []
 
+        self.metrics = metrics
+
     def reset(self) -> None:
         """Reset"""
         self.__block_buffer.clear()
 
+    def get_state(self) -> bytes:
+        """Get the decoder state
+
+        Returns:
+            bytes: Decoder state
+        """
+        state = bytearray(
+            DarcL2FrameDecoder.__state_header.pack(
+                DarcL2FrameDecoder.__state_version, len(self.__block_buffer)
+            )
+        )
+        for block in self.__block_buffer:
+            state += DarcL2FrameDecoder.__state_block.pack(
+                block.block_id, block.to_buffer().tobytes()
+            )
+        return bytes(state)
+
+    @classmethod
+    def from_state(cls, state: bytes | memoryview) -> Self:
+        """Construct from a decoder state
+
+        Args:
+            state (bytes | memoryview): Decoder state
+
+        Raises:
+            ValueError: Unsupported state version
+
+        Returns:
+            Self: DarcL2FrameDecoder instance
+        """
+        version, count = DarcL2FrameDecoder.__state_header.unpack_from(state)
+        if version != DarcL2FrameDecoder.__state_version:
+            raise ValueError(f"Unsupported state version. version={version}")
+
+        decoder = cls()
+        for block_id, buffer in DarcL2FrameDecoder.__state_block.iter_unpack(
+            memoryview(state)[
+                DarcL2FrameDecoder.__state_header.size : DarcL2FrameDecoder.__state_header.size
+                + count * DarcL2FrameDecoder.__state_block.size
+            ]
+        ):
+            block_id = DarcL2BlockIdentificationCode(block_id)
+            buffer = bitstring.Bits(bytes=buffer, length=190)
+            decoder.__block_buffer.append(
+                DarcL2ParityBlock.from_buffer(block_id, buffer)
+                if block_id == DarcL2BlockIdentificationCode.BIC_4
+                else DarcL2InformationBlock.from_buffer(block_id, buffer)
+            )
+        return decoder
+
+    def __invalid_sequence(self) -> None:
+        """Discard collected Blocks on an invalid sequence"""
+        self.__logger.debug("Invalid sequence detected.")
+        self.__block_buffer.clear()
+        if self.metrics is not None:
+            self.metrics.sequence_violations += 1
+
     def push_block(
         self, block: DarcL2InformationBlock | DarcL2ParityBlock
     ) -> DarcL2Frame | None:
@@ -38,15 +112,13 @@ class DarcL2FrameDecoder:
         if (
             1 <= current_block_number and current_block_number <= 13
         ) and block.block_id != DarcL2BlockIdentificationCode.BIC_1:
-            self.__logger.debug("Invalid sequence detected.")
-            self.__block_buffer.clear()
+            self.__invalid_sequence()
             return
         # BIC2
         if (
             137 <= current_block_number and current_block_number <= 149
         ) and block.block_id != DarcL2BlockIdentificationCode.BIC_2:
-            self.__logger.debug("Invalid sequence detected.")
-            self.__block_buffer.clear()
+            self.__invalid_sequence()
             return
         # BIC3
         if (
@@ -54,16 +126,14 @@ class DarcL2FrameDecoder:
             and (current_block_number % 3 == 0 or current_block_number % 3 == 2)
             and block.block_id != DarcL2BlockIdentificationCode.BIC_3
         ):
-            self.__logger.debug("Invalid sequence detected.")
-            self.__block_buffer.clear()
+            self.__invalid_sequence()
             return
         if (
             (150 <= current_block_number and current_block_number <= 272)
             and (current_block_number % 3 == 0 or current_block_number % 3 == 1)
             and block.block_id != DarcL2BlockIdentificationCode.BIC_3
         ):
-            self.__logger.debug("Invalid sequence detected.")
-            self.__block_buffer.clear()
+            self.__invalid_sequence()
             return
         # BIC4
         if (
@@ -71,23 +141,34 @@ class DarcL2FrameDecoder:
             and current_block_number % 3 == 1
             and block.block_id != DarcL2BlockIdentificationCode.BIC_4
         ):
-            self.__logger.debug("Invalid sequence detected.")
-            self.__block_buffer.clear()
+            self.__invalid_sequence()
             return
         if (
             (150 <= current_block_number and current_block_number <= 272)
             and current_block_number % 3 == 2
             and block.block_id != DarcL2BlockIdentificationCode.BIC_4
         ):
-            self.__logger.debug("Invalid sequence detected.")
-            self.__block_buffer.clear()
+            self.__invalid_sequence()
             return
 
         self.__block_buffer.append(block)
 
         if current_block_number == 272:
-            self.__logger.debug(f"272 blocks collected.")
+            self.__logger.debug("272 blocks collected.")
+            start_time = time.perf_counter()
             frame = DarcL2Frame.from_block_buffer(self.__block_buffer)
+            if self.metrics is not None:
+                self.metrics.frames += 1
+                self.metrics.columns_corrected += frame.columns_corrected
+                self.metrics.columns_uncorrectable += frame.columns_uncorrectable
+                self.metrics.add_layer_seconds(
+                    "l2_frame", time.perf_counter() - start_time
+                )
+                # Measured from the first Block of the Frame
+                if frame.blocks[0].ingest_time is not None:
+                    self.metrics.observe_latency(
+                        "l2_frame", time.monotonic() - frame.blocks[0].ingest_time
+                    )
 
             # Must reset the decoder
             self.reset()
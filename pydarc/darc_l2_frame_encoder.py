@@ -0,0 +1,178 @@
+import bitstring
+from itertools import islice
+
+from pydarc.crc_14_darc import crc_14_darc
+from pydarc.crc_82_darc import crc_82_darc
+from pydarc.darc_l2_data import DarcL2BlockIdentificationCode
+from pydarc.darc_l3_data import (
+    DarcL3DataPacket,
+    DarcL3DataPacketServiceIdentificationCode,
+)
+from pydarc.lfsr import lfsr
+
+__bits_to_bytes_table = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def __generate_bic_sequence() -> list[DarcL2BlockIdentificationCode]:
+    """Generate BIC sequence of a Frame
+
+    Returns:
+        list[DarcL2BlockIdentificationCode]: BIC of Block 1 to 272
+    """
+    bic_sequence: list[DarcL2BlockIdentificationCode] = []
+    for block_number in range(1, 273):
+        if block_number <= 13:
+            bic_sequence.append(DarcL2BlockIdentificationCode.BIC_1)
+        elif block_number <= 136:
+            bic_sequence.append(
+                DarcL2BlockIdentificationCode.BIC_4
+                if block_number % 3 == 1
+                else DarcL2BlockIdentificationCode.BIC_3
+            )
+        elif block_number <= 149:
+            bic_sequence.append(DarcL2BlockIdentificationCode.BIC_2)
+        else:
+            bic_sequence.append(
+                DarcL2BlockIdentificationCode.BIC_4
+                if block_number % 3 == 2
+                else DarcL2BlockIdentificationCode.BIC_3
+            )
+    return bic_sequence
+
+
+def __crc_82_darc_190(value: int) -> int:
+    """Calculate DSCC(272,190) parity of 190 bits
+
+    Args:
+        value (int): 190 bits message
+
+    Returns:
+        int: 82 bits parity
+    """
+    # Leading zero bits do not change the CRC, so use the table driven algorithm
+    return crc_82_darc(value.to_bytes(24, "big"))
+
+
+def __generate_vertical_parity_rows() -> list[list[int]]:
+    """Generate Information Block rows summed into each vertical parity row
+
+    DSCC(272,190) parity is linear, so the k-th parity bit of every column is the
+    sum of the Information Block rows whose unit vector has that parity bit.
+
+    Returns:
+        list[list[int]]: Information Block row numbers for Parity Block 0 to 81
+    """
+    unit_parities = [__crc_82_darc_190(1 << (189 - i)) for i in range(190)]
+    return [
+        [i for i in range(190) if unit_parities[i] >> (81 - k) & 1] for k in range(82)
+    ]
+
+
+__bic_sequence = __generate_bic_sequence()
+__vertical_parity_rows = __generate_vertical_parity_rows()
+__scramble_sequence = int("".join(str(x) for x in islice(lfsr(0x155, 0x110), 272)), 2)
+
+
+def encode_frame(data_packets: list[DarcL3DataPacket]) -> bytes:
+    """Encode a Frame into a bitstream with one bit per byte
+
+    Args:
+        data_packets (list[DarcL3DataPacket]): 190 Data Packets
+
+    Raises:
+        ValueError: Invalid data_packets length
+
+    Returns:
+        bytes: Bitstream of 272 Blocks
+    """
+    if len(data_packets) != 190:
+        raise ValueError("data_packets length must be 190.")
+
+    # Data Packet and CRC-14
+    information_rows: list[int] = []
+    for data_packet in data_packets:
+        data_packet_bytes = data_packet.to_buffer().tobytes()
+        information_rows.append(
+            int.from_bytes(data_packet_bytes) << 14 | crc_14_darc(data_packet_bytes)
+        )
+
+    # Vertical parity
+    parity_rows: list[int] = []
+    for rows in __vertical_parity_rows:
+        parity_row = 0
+        for i in rows:
+            parity_row ^= information_rows[i]
+        parity_rows.append(parity_row)
+
+    information_row_iterator = iter(information_rows)
+    parity_row_iterator = iter(parity_rows)
+    blocks: list[str] = []
+    for bic in __bic_sequence:
+        row = (
+            next(parity_row_iterator)
+            if bic == DarcL2BlockIdentificationCode.BIC_4
+            else next(information_row_iterator)
+        )
+        # Horizontal parity and scrambling. BIC is not scrambled.
+        block = bic << 272 | (
+            (row << 82 | __crc_82_darc_190(row)) ^ __scramble_sequence
+        )
+        blocks.append(format(block, "0288b"))
+    return "".join(blocks).encode().translate(__bits_to_bytes_table)
+
+
+class DarcL2FrameEncoder:
+    """DARC L2 Frame Encoder
+
+    Reverse of DarcL2BlockDecoder and DarcL2FrameDecoder. Encode Data Packets into
+    a bitstream with one bit per byte.
+    """
+
+    def __init__(self, filler: DarcL3DataPacket | None = None) -> None:
+        """Constructor
+
+        Args:
+            filler (DarcL3DataPacket | None, optional): Data Packet to fill the last Frame with. None for an all zero Data Packet. Defaults to None.
+        """
+        self.__data_packets: list[DarcL3DataPacket] = []
+
+        self.filler = (
+            DarcL3DataPacket(
+                DarcL3DataPacketServiceIdentificationCode.UNDEFINED_0,
+                0,
+                0,
+                0,
+                0,
+                0,
+                bitstring.Bits(144),
+            )
+            if filler is None
+            else filler
+        )
+
+    def push_data_packets(self, data_packets: list[DarcL3DataPacket]) -> bytes:
+        """Push Data Packets
+
+        Args:
+            data_packets (list[DarcL3DataPacket]): Data Packets
+
+        Returns:
+            bytes: Bitstream of Frames completed by the Data Packets
+        """
+        self.__data_packets.extend(data_packets)
+        frames: list[bytes] = []
+        while 190 <= len(self.__data_packets):
+            frames.append(encode_frame(self.__data_packets[:190]))
+            del self.__data_packets[:190]
+        return b"".join(frames)
+
+    def flush(self) -> bytes:
+        """Fill and encode the pending Frame
+
+        Returns:
+            bytes: Bitstream of the pending Frame. Empty if no Data Packet is pending.
+        """
+        if len(self.__data_packets) == 0:
+            return b""
+        self.__data_packets.extend([self.filler] * (190 - len(self.__data_packets)))
+        return self.push_data_packets([])
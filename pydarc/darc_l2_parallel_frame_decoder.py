@@ -0,0 +1,168 @@
+import io
+import mmap
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from logging import getLogger
+from typing import Generator
+
+from pydarc.darc_l2_block_decoder import DarcL2BlockDecoder
+from pydarc.darc_l2_data import DarcL2Frame
+from pydarc.darc_l2_frame_capture import (
+    DarcL2FrameCaptureReader,
+    DarcL2FrameCaptureWriter,
+)
+from pydarc.darc_l2_frame_decoder import DarcL2FrameDecoder
+from pydarc.darc_shared_tables import install_shared_tables
+
+# 272 blocks of 16 bits BIC and 272 bits data
+FRAME_BITS = 272 * (16 + 272)
+
+__logger = getLogger(__name__)
+
+
+def decode_frames_from_buffer(
+    buffer: bytes | mmap.mmap,
+    start: int = 0,
+    end: int | None = None,
+    keep_start: int | None = None,
+    l2_block_decoder: DarcL2BlockDecoder | None = None,
+    l2_frame_decoder: DarcL2FrameDecoder | None = None,
+) -> Generator[tuple[int, DarcL2Frame], None, None]:
+    """Decode Frames from a bitstream buffer with one bit per byte
+
+    Args:
+        buffer (bytes | mmap.mmap): Bitstream buffer
+        start (int, optional): Bit offset to start decoding at. Defaults to 0.
+        end (int | None, optional): Bit offset to stop decoding at. None for end of buffer. Defaults to None.
+        keep_start (int | None, optional): Only yield Frames ending after this offset. None for start. Defaults to None.
+        l2_block_decoder (DarcL2BlockDecoder | None, optional): L2 Block Decoder to continue with. None for a new one. Defaults to None.
+        l2_frame_decoder (DarcL2FrameDecoder | None, optional): L2 Frame Decoder to continue with. None for a new one. Defaults to None.
+
+    Yields:
+        Generator[tuple[int, DarcL2Frame], None, None]: Offset of the end of the Frame and Frame
+    """
+    if keep_start is None:
+        keep_start = start
+    end = len(buffer) if end is None else min(end, len(buffer))
+
+    if l2_block_decoder is None:
+        l2_block_decoder = DarcL2BlockDecoder()
+        l2_block_decoder.bit_offset = start
+    if l2_frame_decoder is None:
+        l2_frame_decoder = DarcL2FrameDecoder()
+
+    bit_offset = start
+    while bit_offset < end:
+        bits = buffer[bit_offset : min(bit_offset + (1 << 20), end)]
+        for bit in bits:
+            bit_offset += 1
+            block = l2_block_decoder.push_bit(bit)
+            if block is None:
+                continue
+            frame = l2_frame_decoder.push_block(block)
+            if frame is None or bit_offset <= keep_start:
+                continue
+            yield bit_offset, frame
+
+
+def decode_frames_from_file(
+    path: str,
+    start: int = 0,
+    end: int | None = None,
+    keep_start: int | None = None,
+    l2_block_decoder: DarcL2BlockDecoder | None = None,
+    l2_frame_decoder: DarcL2FrameDecoder | None = None,
+) -> Generator[tuple[int, DarcL2Frame], None, None]:
+    """Decode Frames from a bitstream file with one bit per byte
+
+    Args:
+        path (str): Bitstream path
+        start (int, optional): Bit offset to start decoding at. Defaults to 0.
+        end (int | None, optional): Bit offset to stop decoding at. None for end of file. Defaults to None.
+        keep_start (int | None, optional): Only yield Frames ending after this offset. None for start. Defaults to None.
+        l2_block_decoder (DarcL2BlockDecoder | None, optional): L2 Block Decoder to continue with. None for a new one. Defaults to None.
+        l2_frame_decoder (DarcL2FrameDecoder | None, optional): L2 Frame Decoder to continue with. None for a new one. Defaults to None.
+
+    Yields:
+        Generator[tuple[int, DarcL2Frame], None, None]: Offset of the end of the Frame and Frame
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from decode_frames_from_buffer(
+                buffer, start, end, keep_start, l2_block_decoder, l2_frame_decoder
+            )
+
+
+def _decode_chunk(path: str, start: int, end: int, overlap: int) -> bytes:
+    """Decode Frames ending in a chunk in a worker process
+
+    Args:
+        path (str): Bitstream path
+        start (int): Start bit offset of the chunk
+        end (int): End bit offset of the chunk
+        overlap (int): Number of bits decoded before the chunk to acquire sync
+
+    Returns:
+        bytes: Frame capture of decoded Frames
+    """
+    buffer = io.BytesIO()
+    capture_writer = DarcL2FrameCaptureWriter(buffer)
+    for bit_offset, frame in decode_frames_from_file(
+        path, max(0, start - overlap), end, start
+    ):
+        capture_writer.write(frame, bit_offset)
+    return buffer.getvalue()
+
+
+def decode_frames_parallel(
+    path: str,
+    processes: int | None = None,
+    chunk_size: int = 64 * FRAME_BITS,
+    overlap: int = 2 * FRAME_BITS,
+    tables_path: str | None = None,
+) -> Generator[tuple[int, DarcL2Frame], None, None]:
+    """Decode Frames from a bitstream file in parallel
+
+    The file is split into chunks. Each chunk is decoded in a worker process
+    starting overlap bits early, and only Frames ending inside the chunk are kept,
+    so Frames are yielded once and in stream order.
+
+    Args:
+        path (str): Bitstream path
+        processes (int | None, optional): Number of worker processes. None for CPU count. Defaults to None.
+        chunk_size (int, optional): Chunk size in bits. Defaults to 64 Frames.
+        overlap (int, optional): Overlap in bits. Must be longer than a Frame. Defaults to 2 Frames.
+        tables_path (str | None, optional): Shared tables path for worker processes to attach to. None to generate tables in each worker. Defaults to None.
+
+    Raises:
+        ValueError: Overlap is shorter than a Frame
+
+    Yields:
+        Generator[tuple[int, DarcL2Frame], None, None]: Offset of the end of the Frame and Frame
+    """
+    if overlap < FRAME_BITS:
+        raise ValueError(f"overlap must be greater than or equal to {FRAME_BITS}.")
+
+    processes = os.cpu_count() if processes is None else processes
+    size = os.path.getsize(path)
+    chunks = [(x, min(x + chunk_size, size)) for x in range(0, size, chunk_size)]
+    __logger.debug(f"Decode in parallel. chunks={len(chunks)} processes={processes}")
+
+    with ProcessPoolExecutor(
+        processes, initializer=install_shared_tables, initargs=(tables_path,)
+    ) as executor:
+        futures: deque[Future[bytes]] = deque()
+        next_chunk = 0
+        while next_chunk < len(chunks) or futures:
+            # Keep a bounded number of chunks in flight
+            while next_chunk < len(chunks) and len(futures) < 2 * processes:
+                start, end = chunks[next_chunk]
+                futures.append(
+                    executor.submit(_decode_chunk, path, start, end, overlap)
+                )
+                next_chunk += 1
+            capture = futures.popleft().result()
+            yield from DarcL2FrameCaptureReader(io.BytesIO(capture))
@@ -0,0 +1,237 @@
+import mmap
+import os
+import struct
+from logging import getLogger
+from typing import Generator, Self
+
+from pydarc.darc_l2_data import DarcL2BlockIdentificationCode, DarcL2Frame
+from pydarc.darc_l2_parallel_frame_decoder import decode_frames_from_buffer
+
+SYNC_INDEX_MAGIC = b"DARCIDX"
+SYNC_INDEX_VERSION = 1
+
+# frame_number, bit_offset
+SYNC_INDEX_ENTRY = struct.Struct("<QQ")
+
+# 16 bits BIC and 272 bits data
+BLOCK_BITS = 16 + 272
+
+__bits_to_ascii_table = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def __read_bic(buffer: bytes | mmap.mmap, bit_offset: int) -> int:
+    """Read a 16 bits BIC candidate from a bitstream with one bit per byte
+
+    Args:
+        buffer (bytes | mmap.mmap): Bitstream buffer
+        bit_offset (int): Bit offset
+
+    Returns:
+        int: BIC candidate
+    """
+    return int(buffer[bit_offset : bit_offset + 16].translate(__bits_to_ascii_table), 2)
+
+
+def __is_bic(
+    buffer: bytes | mmap.mmap,
+    bit_offset: int,
+    bic: DarcL2BlockIdentificationCode,
+    allowable_bic_errors: int,
+) -> bool:
+    """Is a BIC at a bit offset
+
+    Args:
+        buffer (bytes | mmap.mmap): Bitstream buffer
+        bit_offset (int): Bit offset
+        bic (DarcL2BlockIdentificationCode): BIC
+        allowable_bic_errors (int): Allowable bit errors in BIC
+
+    Returns:
+        bool: True if the BIC is at the bit offset, else False
+    """
+    if bit_offset < 0 or len(buffer) < bit_offset + 16:
+        return False
+    return (__read_bic(buffer, bit_offset) ^ bic).bit_count() <= allowable_bic_errors
+
+
+def find_frame_starts(
+    buffer: bytes | mmap.mmap, allowable_bic_errors: int = 2
+) -> list[int]:
+    """Find bit offsets of Frame starts in a bitstream with one bit per byte
+
+    Exact BIC_1 matches are located with bytes.find. Each match is walked back
+    over the 13 BIC_1 blocks of a Frame with BIC error tolerance, and accepted if
+    the following block is BIC_3.
+
+    Args:
+        buffer (bytes | mmap.mmap): Bitstream buffer
+        allowable_bic_errors (int, optional): Allowable bit errors in BIC. Defaults to 2.
+
+    Returns:
+        list[int]: Bit offsets of the first BIC_1 of each Frame
+    """
+    bic_1 = bytes(
+        (DarcL2BlockIdentificationCode.BIC_1 >> (15 - i)) & 1 for i in range(16)
+    )
+    frame_starts: list[int] = []
+    position = buffer.find(bic_1)
+    while position != -1:
+        # Walk back to the first BIC_1 of the Frame
+        frame_start = position
+        for _ in range(12):
+            if not __is_bic(
+                buffer,
+                frame_start - BLOCK_BITS,
+                DarcL2BlockIdentificationCode.BIC_1,
+                allowable_bic_errors,
+            ):
+                break
+            frame_start -= BLOCK_BITS
+
+        block_14 = frame_start + 13 * BLOCK_BITS
+        if (
+            position < block_14
+            and (len(frame_starts) == 0 or frame_starts[-1] < frame_start)
+            and __is_bic(
+                buffer,
+                block_14,
+                DarcL2BlockIdentificationCode.BIC_3,
+                allowable_bic_errors,
+            )
+        ):
+            frame_starts.append(frame_start)
+            position = buffer.find(bic_1, block_14)
+        else:
+            position = buffer.find(bic_1, position + 1)
+    return frame_starts
+
+
+class DarcL2SyncIndex:
+    """DARC L2 Sync Index
+
+    Bit offsets of Frame starts in a bitstream file with one bit per byte.
+    """
+
+    __logger = getLogger(__name__)
+
+    def __init__(self, frame_starts: list[int]) -> None:
+        """Constructor
+
+        Args:
+            frame_starts (list[int]): Bit offsets of Frame starts indexed by Frame number
+        """
+        self.frame_starts = frame_starts
+
+    def __len__(self) -> int:
+        """Number of indexed Frames
+
+        Returns:
+            int: Number of indexed Frames
+        """
+        return len(self.frame_starts)
+
+    @classmethod
+    def build(cls, path: str, allowable_bic_errors: int = 2) -> Self:
+        """Build from a bitstream file
+
+        Args:
+            path (str): Bitstream path
+            allowable_bic_errors (int, optional): Allowable bit errors in BIC. Defaults to 2.
+
+        Returns:
+            Self: DarcL2SyncIndex instance
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return cls([])
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                frame_starts = find_frame_starts(buffer, allowable_bic_errors)
+        DarcL2SyncIndex.__logger.debug(
+            f"Sync index built. path={path} frames={len(frame_starts)}"
+        )
+        return cls(frame_starts)
+
+    def save(self, path: str) -> None:
+        """Save to a file
+
+        Args:
+            path (str): Index path
+        """
+        with open(path, "wb") as file:
+            file.write(SYNC_INDEX_MAGIC + SYNC_INDEX_VERSION.to_bytes())
+            file.write(
+                b"".join(
+                    SYNC_INDEX_ENTRY.pack(frame_number, bit_offset)
+                    for frame_number, bit_offset in enumerate(self.frame_starts)
+                )
+            )
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        """Load from a file
+
+        Args:
+            path (str): Index path
+
+        Raises:
+            ValueError: Not a sync index or unsupported version
+
+        Returns:
+            Self: DarcL2SyncIndex instance
+        """
+        with open(path, "rb") as file:
+            buffer = file.read()
+        if buffer[: len(SYNC_INDEX_MAGIC)] != SYNC_INDEX_MAGIC:
+            raise ValueError("file is not a DARC sync index.")
+        if buffer[len(SYNC_INDEX_MAGIC)] != SYNC_INDEX_VERSION:
+            raise ValueError(
+                f"Unsupported sync index version. version={buffer[len(SYNC_INDEX_MAGIC)]}"
+            )
+        entries = memoryview(buffer)[len(SYNC_INDEX_MAGIC) + 1 :]
+        return cls(
+            [
+                bit_offset
+                for _, bit_offset in SYNC_INDEX_ENTRY.iter_unpack(
+                    entries[: len(entries) - len(entries) % SYNC_INDEX_ENTRY.size]
+                )
+            ]
+        )
+
+    def frames(
+        self, path: str, frame_number: int = 0, count: int | None = None
+    ) -> Generator[tuple[int, DarcL2Frame], None, None]:
+        """Decode Frames starting at an indexed Frame
+
+        Args:
+            path (str): Bitstream path
+            frame_number (int, optional): Frame number to start at. Defaults to 0.
+            count (int | None, optional): Number of Frames to decode. None to decode until end of file. Defaults to None.
+
+        Raises:
+            IndexError: Frame number is not indexed
+
+        Yields:
+            Generator[tuple[int, DarcL2Frame], None, None]: Offset of the end of the Frame and Frame
+        """
+        if frame_number < 0 or len(self.frame_starts) <= frame_number:
+            raise IndexError(f"Frame is not indexed. frame_number={frame_number}")
+
+        start = self.frame_starts[frame_number]
+        end: int | None = None
+        if count is not None:
+            last_frame_number = frame_number + count
+            # Stop at the start of the Frame after the last one
+            end = (
+                self.frame_starts[last_frame_number]
+                if last_frame_number < len(self.frame_starts)
+                else None
+            )
+
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                decoded = 0
+                for bit_offset, frame in decode_frames_from_buffer(buffer, start, end):
+                    yield bit_offset, frame
+                    decoded += 1
+                    if count is not None and count <= decoded:
+                        return
@@ -2,6 +2,8 @@ import bitstring
 from enum import IntEnum
 from typing import Self
 
+from pydarc.bit_operations import read_reversed_uint, read_uint, reverse_uint
+
 
 class DarcL3DataPacketServiceIdentificationCode(IntEnum):
     UNDEFINED_0 = 0x0
@@ -34,6 +36,8 @@ class DarcL3DataPacket:
         data_group_number: int,
         data_packet_number: int,
         data_block: bitstring.Bits,
+        bit_offset: int | None = None,
+        ingest_time: float | None = None,
     ):
         """Constructor
 
@@ -45,6 +49,8 @@ class DarcL3DataPacket:
             data_group_number (int): Data Group number
             data_packet_number (int): Data Packet number
             data_block (bitstring.Bits): Data Block
+            bit_offset (int | None, optional): Offset of the first BIC bit of the Block carrying the Data Packet in the source bitstream. Defaults to None.
+            ingest_time (float | None, optional): time.monotonic() when the Block carrying the Data Packet started to be ingested. Defaults to None.
         """
         self.service_id = service_id
         self.decode_id_flag = decode_id_flag
@@ -53,6 +59,63 @@ class DarcL3DataPacket:
         self.data_group_number = data_group_number
         self.data_packet_number = data_packet_number
         self.data_block = data_block
+        # Trace
+        self.bit_offset = bit_offset
+        self.ingest_time = ingest_time
+
+    def to_buffer(self) -> bitstring.Bits:
+        """To buffer
+
+        Returns:
+            bitstring.Bits: Buffer
+        """
+        header = (
+            reverse_uint(self.service_id, 4) << 4
+            | self.decode_id_flag << 3
+            | self.end_of_information_flag << 2
+            | reverse_uint(self.update_flag, 2)
+        )
+        if (
+            self.service_id
+            == DarcL3DataPacketServiceIdentificationCode.ADDITIONAL_INFORMATION
+        ):
+            # Composition 2
+            header = (
+                header << 8
+                | reverse_uint(self.data_group_number, 4) << 4
+                | reverse_uint(self.data_packet_number, 4)
+            )
+            return bitstring.Bits(
+                bytes=(header << 160 | self.data_block.uint).to_bytes(22)
+            )
+
+        # Composition 1
+        header = (
+            header << 24
+            | reverse_uint(self.data_group_number, 14) << 10
+            | reverse_uint(self.data_packet_number, 10)
+        )
+        return bitstring.Bits(bytes=(header << 144 | self.data_block.uint).to_bytes(22))
+
+    @staticmethod
+    def read_service_id(
+        buffer: bytes | bitstring.Bits,
+    ) -> DarcL3DataPacketServiceIdentificationCode:
+        """Read Service ID without parsing the whole buffer
+
+        Args:
+            buffer (bytes | bitstring.Bits): Buffer
+
+        Returns:
+            DarcL3DataPacketServiceIdentificationCode: Service ID
+        """
+        if isinstance(buffer, bitstring.Bits):
+            return DarcL3DataPacketServiceIdentificationCode(
+                reverse_uint(buffer[0:4].uint, 4)
+            )
+        return DarcL3DataPacketServiceIdentificationCode(
+            read_reversed_uint(buffer, 0, 4)
+        )
 
     @classmethod
     def from_buffer(cls, buffer: bytes) -> Self:
@@ -71,10 +134,13 @@ class DarcL3DataPacket:
         if len(buffer) != 176:
             raise ValueError("buffer length must be 176.")
 
-        service_id = DarcL3DataPacketServiceIdentificationCode(buffer[0:4][::-1].uint)
-        decode_id_flag: int = buffer[4:5].uint
-        end_of_information_flag: int = buffer[5:6].uint
-        update_flag: int = buffer[6:8][::-1].uint
+        header = buffer[0:32].bytes
+        service_id = DarcL3DataPacketServiceIdentificationCode(
+            read_reversed_uint(header, 0, 4)
+        )
+        decode_id_flag: int = read_uint(header, 4, 1)
+        end_of_information_flag: int = read_uint(header, 5, 1)
+        update_flag: int = read_reversed_uint(header, 6, 2)
 
         data_group_number: int
         data_packet_number: int
@@ -84,14 +150,14 @@ class DarcL3DataPacket:
             == DarcL3DataPacketServiceIdentificationCode.ADDITIONAL_INFORMATION
         ):
             # Composition 2
-            data_group_number: int = buffer[8:12][::-1].uint
-            data_packet_number: int = buffer[12:16][::-1].uint
+            data_group_number: int = read_reversed_uint(header, 8, 4)
+            data_packet_number: int = read_reversed_uint(header, 12, 4)
             data_block = buffer[16:176]
 
         else:
             # Composition 1
-            data_group_number: int = buffer[8:22][::-1].uint
-            data_packet_number: int = buffer[22:32][::-1].uint
+            data_group_number: int = read_reversed_uint(header, 8, 14)
+            data_packet_number: int = read_reversed_uint(header, 22, 10)
             data_block = buffer[32:176]
 
         return cls(
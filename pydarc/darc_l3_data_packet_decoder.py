@@ -1,12 +1,148 @@
+import struct
+import time
 from logging import getLogger
+from typing import Self
 
-from pydarc.darc_l2_data import DarcL2Frame
-from pydarc.darc_l3_data import DarcL3DataPacket
+from pydarc.darc_l2_data import DarcL2Frame, DarcL2InformationBlock
+from pydarc.darc_metrics import DarcMetrics
+from pydarc.darc_l3_data import (
+    DarcL3DataPacketServiceIdentificationCode,
+    DarcL3DataPacket,
+)
 
 
 class DarcL3DataPacketDecoder:
     """DARC L3 Data Packet Decoder"""
 
+    # version, has service_ids, service_ids bitmask, dropped Data Packets per Service ID
+    __state = struct.Struct("<BBH16Q")
+    __state_version = 1
+
+    def __init__(
+        self,
+        service_ids: set[DarcL3DataPacketServiceIdentificationCode] | None = None,
+        metrics: DarcMetrics | None = None,
+    ) -> None:
+        """Constructor
+
+        Args:
+            service_ids (set[DarcL3DataPacketServiceIdentificationCode] | None, optional): Service IDs to decode. None to decode all. Defaults to None.
+            metrics (DarcMetrics | None, optional): Metrics to update. Defaults to None.
+        """
+        self.service_ids = service_ids
+        self.dropped_data_packets: dict[
+            DarcL3DataPacketServiceIdentificationCode, int
+        ] = {}
+        self.metrics = metrics
+
+    def get_state(self) -> bytes:
+        """Get the decoder state
+
+        Returns:
+            bytes: Decoder state
+        """
+        service_ids_bitmask = 0
+        for service_id in self.service_ids or []:
+            service_ids_bitmask |= 1 << service_id
+        return DarcL3DataPacketDecoder.__state.pack(
+            DarcL3DataPacketDecoder.__state_version,
+            self.service_ids is not None,
+            service_ids_bitmask,
+            *(
+                self.dropped_data_packets.get(service_id, 0)
+                for service_id in DarcL3DataPacketServiceIdentificationCode
+            ),
+        )
+
+    @classmethod
+    def from_state(cls, state: bytes | memoryview) -> Self:
+        """Construct from a decoder state
+
+        Args:
+            state (bytes | memoryview): Decoder state
+
+        Raises:
+            ValueError: Unsupported state version
+
+        Returns:
+            Self: DarcL3DataPacketDecoder instance
+        """
+        version, has_service_ids, service_ids_bitmask, *dropped_data_packets = (
+            DarcL3DataPacketDecoder.__state.unpack_from(state)
+        )
+        if version != DarcL3DataPacketDecoder.__state_version:
+            raise ValueError(f"Unsupported state version. version={version}")
+
+        decoder = cls(
+            {
+                service_id
+                for service_id in DarcL3DataPacketServiceIdentificationCode
+                if service_ids_bitmask & (1 << service_id) != 0
+            }
+            if has_service_ids
+            else None
+        )
+        decoder.dropped_data_packets = {
+            service_id: count
+            for service_id, count in zip(
+                DarcL3DataPacketServiceIdentificationCode, dropped_data_packets
+            )
+            if count != 0
+        }
+        return decoder
+
+    @staticmethod
+    def __data_packet_from_block(block: DarcL2InformationBlock) -> DarcL3DataPacket:
+        """Construct a Data Packet from an Information Block
+
+        Args:
+            block (DarcL2InformationBlock): Information Block
+
+        Returns:
+            DarcL3DataPacket: Data Packet carrying the trace of the Block
+        """
+        data_packet = DarcL3DataPacket.from_buffer(block.data_packet)
+        data_packet.bit_offset = block.bit_offset
+        data_packet.ingest_time = block.ingest_time
+        return data_packet
+
+    def push_block(self, block: DarcL2InformationBlock) -> DarcL3DataPacket | None:
+        """Push an Information Block
+
+        Args:
+            block (DarcL2InformationBlock): Information Block
+
+        Returns:
+            DarcL3DataPacket | None: DarcL3DataPacket if not filtered out, else None
+        """
+        start_time = 0.0 if self.metrics is None else time.perf_counter()
+        if self.service_ids is not None:
+            service_id = DarcL3DataPacket.read_service_id(block.data_packet)
+            if service_id not in self.service_ids:
+                self.dropped_data_packets[service_id] = (
+                    self.dropped_data_packets.get(service_id, 0) + 1
+                )
+                if self.metrics is not None:
+                    self.metrics.data_packets_dropped[service_id] = (
+                        self.metrics.data_packets_dropped.get(service_id, 0) + 1
+                    )
+                    self.metrics.add_layer_seconds(
+                        "l3", time.perf_counter() - start_time
+                    )
+                return
+        data_packet = self.__data_packet_from_block(block)
+
+        if self.metrics is not None:
+            self.metrics.data_packets[data_packet.service_id] = (
+                self.metrics.data_packets.get(data_packet.service_id, 0) + 1
+            )
+            if data_packet.ingest_time is not None:
+                self.metrics.observe_latency(
+                    "l3", time.monotonic() - data_packet.ingest_time
+                )
+            self.metrics.add_layer_seconds("l3", time.perf_counter() - start_time)
+        return data_packet
+
     def push_frame(self, frame: DarcL2Frame) -> list[DarcL3DataPacket]:
         """Push a Frame
 
@@ -16,9 +152,9 @@ class DarcL3DataPacketDecoder:
         Returns:
             list[DarcL3DataPacket]: Data Packets
         """
-        return list(
-            map(
-                lambda x: DarcL3DataPacket.from_buffer(x.data_packet),
-                frame.blocks,
-            )
-        )
+        data_packets: list[DarcL3DataPacket] = []
+        for block in frame.blocks:
+            data_packet = self.push_block(block)
+            if data_packet is not None:
+                data_packets.append(data_packet)
+        return data_packets
@@ -20,6 +20,9 @@ class DarcL4DataGroup1:
         data_group_data: bitstring.Bits,
         end_of_data_group: int,
         crc: int,
+        crc_valid: bool | None = None,
+        bit_offset: int | None = None,
+        ingest_time: float | None = None,
     ) -> None:
         """Constructor
 
@@ -30,6 +33,9 @@ class DarcL4DataGroup1:
             data_group_data (bitstring.Bits): Data Group data
             end_of_data_group (int): End of Data Group
             crc (int): Recorded CRC value
+            crc_valid (bool | None, optional): CRC validity checked on the received buffer. Defaults to None.
+            bit_offset (int | None, optional): Offset of the first BIC bit of the Block carrying the last Data Packet in the source bitstream. Defaults to None.
+            ingest_time (float | None, optional): time.monotonic() when the Block carrying the last Data Packet started to be ingested. Defaults to None.
         """
         # Metadata
         self.service_id = service_id
@@ -39,6 +45,10 @@ class DarcL4DataGroup1:
         self.data_group_data = data_group_data
         self.end_of_data_group = end_of_data_group
         self.crc = crc
+        self.__crc_valid = crc_valid
+        # Trace
+        self.bit_offset = bit_offset
+        self.ingest_time = ingest_time
 
     def to_buffer(self) -> bitstring.Bits:
         """To buffer
@@ -73,8 +83,10 @@ class DarcL4DataGroup1:
         Returns:
             bool: True if CRC is valid, else False
         """
-        data_buffer = self.to_buffer()[:-16]
-        return crc_16_darc(data_buffer.bytes) == self.crc
+        if self.__crc_valid is None:
+            data_buffer = self.to_buffer()[:-16]
+            self.__crc_valid = crc_16_darc(data_buffer.bytes) == self.crc
+        return self.__crc_valid
 
     @classmethod
     def from_buffer(
@@ -112,6 +124,8 @@ class DarcL4DataGroup1:
         )
         end_of_data_group = buffer[-24:-16][::-1].uint
         crc = buffer[-16:].uint
+        # Check CRC on the received buffer, which includes its padding as sent
+        crc_valid = crc_16_darc(memoryview(buffer.bytes)[:-2]) == crc
 
         return cls(
             service_id,
@@ -120,6 +134,7 @@ class DarcL4DataGroup1:
             data_group_data,
             end_of_data_group,
             crc,
+            crc_valid,
         )
 
 
@@ -132,6 +147,9 @@ class DarcL4DataGroup2:
         data_group_number: int,
         segments_data: bitstring.Bits,
         crc: int | None,
+        crc_valid: bool | None = None,
+        bit_offset: int | None = None,
+        ingest_time: float | None = None,
     ) -> None:
         """Constructor
 
@@ -140,6 +158,9 @@ class DarcL4DataGroup2:
             data_group_number (int): Data Group number
             segments_data (bitstring.Bits): Segments data
             crc (int | None): Recorded CRC value
+            crc_valid (bool | None, optional): CRC validity checked on the received buffer. Defaults to None.
+            bit_offset (int | None, optional): Offset of the first BIC bit of the Block carrying the last Data Packet in the source bitstream. Defaults to None.
+            ingest_time (float | None, optional): time.monotonic() when the Block carrying the last Data Packet started to be ingested. Defaults to None.
         """
         # Metadata
         self.service_id = service_id
@@ -147,6 +168,10 @@ class DarcL4DataGroup2:
 
         self.segments_data = segments_data
         self.crc = crc
+        self.__crc_valid = crc_valid
+        # Trace
+        self.bit_offset = bit_offset
+        self.ingest_time = ingest_time
 
     def has_crc(self) -> bool:
         """Has CRC value
@@ -185,8 +210,10 @@ class DarcL4DataGroup2:
         if not self.has_crc():
             return True
 
-        data_buffer = self.to_buffer()[:-16]
-        return crc_16_darc(data_buffer.bytes) == self.crc
+        if self.__crc_valid is None:
+            data_buffer = self.to_buffer()[:-16]
+            self.__crc_valid = crc_16_darc(data_buffer.bytes) == self.crc
+        return self.__crc_valid
 
     @classmethod
     def from_buffer(
@@ -207,11 +234,14 @@ class DarcL4DataGroup2:
         """
         segments_data: bitstring.Bits
         crc: int | None = None
+        crc_valid = True
 
         if 160 < len(buffer):
-            segments_data = bitstring.Bits(reverse_bits(buffer[:-16].bytes))
+            buffer_bytes = memoryview(buffer.bytes)
+            segments_data = bitstring.Bits(reverse_bits(buffer_bytes[:-2]))
             crc = buffer[-16:].uint
+            crc_valid = crc_16_darc(buffer_bytes[:-2]) == crc
         else:
             segments_data = bitstring.Bits(reverse_bits(buffer.bytes))
 
-        return cls(service_id, data_group_number, segments_data, crc)
+        return cls(service_id, data_group_number, segments_data, crc, crc_valid)
@@ -0,0 +1,728 @@
+import mmap
+import os
+import struct
+import time
+from logging import getLogger
+from typing import BinaryIO, Generator, Self
+
+from pydarc.darc_l3_data import DarcL3DataPacketServiceIdentificationCode
+from pydarc.darc_l4_data import DarcL4DataGroup1, DarcL4DataGroup2
+from pydarc.darc_l4_data_group_writer import (
+    pack_data_group_record,
+    pack_data_group_record_header,
+    unpack_data_group_record,
+)
+
+# timestamp, stream_offset, record_offset, record_length, service_id, data_group_number
+ARCHIVE_INDEX_ENTRY = struct.Struct("<dqQIBH")
+# Secondary index of a closed segment: a count, then count key entries sorted by
+# (service_id << 16 | data_group_number, position), then count stream offset
+# entries sorted by (stream_offset, position)
+ARCHIVE_SECONDARY_INDEX_HEADER = struct.Struct("<I")
+ARCHIVE_SECONDARY_INDEX_KEY_ENTRY = struct.Struct("<II")
+ARCHIVE_SECONDARY_INDEX_STREAM_OFFSET_ENTRY = struct.Struct("<qI")
+
+ARCHIVE_SEGMENT_SUFFIX = ".seg"
+ARCHIVE_INDEX_SUFFIX = ".idx"
+ARCHIVE_SECONDARY_INDEX_SUFFIX = ".sdx"
+
+
+class DarcL4DataGroupArchiveIndexEntry:
+    """DARC L4 Data Group Archive Index Entry"""
+
+    def __init__(
+        self,
+        segment_number: int,
+        timestamp: float,
+        stream_offset: int,
+        record_offset: int,
+        record_length: int,
+        service_id: DarcL3DataPacketServiceIdentificationCode,
+        data_group_number: int,
+    ) -> None:
+        """Constructor
+
+        Args:
+            segment_number (int): Segment number
+            timestamp (float): Time of the Data Group in seconds since the epoch
+            stream_offset (int): Offset in the source stream. -1 if unknown
+            record_offset (int): Offset of the record in the segment
+            record_length (int): Length of the record
+            service_id (DarcL3DataPacketServiceIdentificationCode): Service ID
+            data_group_number (int): Data Group number
+        """
+        self.segment_number = segment_number
+        self.timestamp = timestamp
+        self.stream_offset = stream_offset
+        self.record_offset = record_offset
+        self.record_length = record_length
+        self.service_id = service_id
+        self.data_group_number = data_group_number
+
+
+def _segment_path(directory: str, segment_number: int, suffix: str) -> str:
+    """Get path of a segment file
+
+    Args:
+        directory (str): Archive directory
+        segment_number (int): Segment number
+        suffix (str): File suffix
+
+    Returns:
+        str: Path
+    """
+    return os.path.join(directory, f"{segment_number:08d}{suffix}")
+
+
+def _segment_numbers(directory: str) -> list[int]:
+    """List segment numbers in an archive directory
+
+    Args:
+        directory (str): Archive directory
+
+    Returns:
+        list[int]: Sorted segment numbers
+    """
+    segment_numbers: list[int] = []
+    for name in os.listdir(directory):
+        stem, suffix = os.path.splitext(name)
+        if suffix == ARCHIVE_INDEX_SUFFIX and stem.isdigit():
+            segment_numbers.append(int(stem))
+    return sorted(segment_numbers)
+
+
+def _read_index(directory: str, segment_number: int) -> list[tuple]:
+    """Read the complete entries of a segment index
+
+    Args:
+        directory (str): Archive directory
+        segment_number (int): Segment number
+
+    Returns:
+        list[tuple]: Unpacked ARCHIVE_INDEX_ENTRY entries whose records are fully written
+    """
+    with open(
+        _segment_path(directory, segment_number, ARCHIVE_INDEX_SUFFIX), "rb"
+    ) as file:
+        index = file.read()
+    segment_size = os.path.getsize(
+        _segment_path(directory, segment_number, ARCHIVE_SEGMENT_SUFFIX)
+    )
+    entries = list(
+        ARCHIVE_INDEX_ENTRY.iter_unpack(
+            index[: len(index) - len(index) % ARCHIVE_INDEX_ENTRY.size]
+        )
+    )
+    # Ignore entries whose record was not fully written, such as after a crash
+    while entries and segment_size < entries[-1][2] + entries[-1][3]:
+        entries.pop()
+    return entries
+
+
+def _write_secondary_index(directory: str, segment_number: int) -> None:
+    """Write the secondary index of a closed segment
+
+    Args:
+        directory (str): Archive directory
+        segment_number (int): Segment number
+    """
+    entries = _read_index(directory, segment_number)
+    keys = sorted(
+        (service_id << 16 | data_group_number, position)
+        for position, (_, _, _, _, service_id, data_group_number) in enumerate(entries)
+    )
+    stream_offsets = sorted(
+        (stream_offset, position)
+        for position, (_, stream_offset, _, _, _, _) in enumerate(entries)
+    )
+
+    path = _segment_path(directory, segment_number, ARCHIVE_SECONDARY_INDEX_SUFFIX)
+    # Replace atomically so that readers never map a partial file
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(ARCHIVE_SECONDARY_INDEX_HEADER.pack(len(entries)))
+        for key in keys:
+            file.write(ARCHIVE_SECONDARY_INDEX_KEY_ENTRY.pack(*key))
+        for stream_offset in stream_offsets:
+            file.write(ARCHIVE_SECONDARY_INDEX_STREAM_OFFSET_ENTRY.pack(*stream_offset))
+    os.replace(temporary_path, path)
+
+
+def _table_positions(
+    mapping: mmap.mmap,
+    offset: int,
+    entry: struct.Struct,
+    count: int,
+    start: int | None,
+    end: int | None,
+) -> list[int]:
+    """Find positions in a secondary index table sorted by its first field
+
+    Args:
+        mapping (mmap.mmap): Mapping of the secondary index
+        offset (int): Offset of the table
+        entry (struct.Struct): Entry format of the table, ending with a position
+        count (int): Number of entries
+        start (int | None): Inclusive start of the first field. None for no bound.
+        end (int | None): Exclusive end of the first field. None for no bound.
+
+    Returns:
+        list[int]: Positions of the entries in the index
+    """
+
+    def bisect(value: int) -> int:
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if entry.unpack_from(mapping, offset + middle * entry.size)[0] < value:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    low = 0 if start is None else bisect(start)
+    high = count if end is None else bisect(end)
+    return [
+        x[-1]
+        for x in entry.iter_unpack(
+            mapping[offset + low * entry.size : offset + high * entry.size]
+        )
+    ]
+
+
+class DarcL4DataGroupArchiveWriter:
+    """DARC L4 Data Group Archive Writer
+
+    Data Groups are appended to segment files as binary records and indexed in a
+    side file by time, stream offset, Service ID and Data Group number. A new
+    segment is started when the current one reaches max_segment_size. A closed
+    segment also gets a secondary index sorted by Service ID and Data Group number,
+    and by stream offset, so that queries on them skip the scan of the segment.
+    Timestamps never decrease, so that queries can binary search them.
+    """
+
+    __logger = getLogger(__name__)
+
+    def __init__(self, directory: str, max_segment_size: int = 64 << 20) -> None:
+        """Constructor
+
+        Args:
+            directory (str): Archive directory
+            max_segment_size (int, optional): Maximum segment size in bytes. Defaults to 64 MiB.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        segment_numbers = _segment_numbers(directory)
+        self.__segment_number = segment_numbers[-1] + 1 if segment_numbers else 0
+        self.__segment: BinaryIO | None = None
+        self.__index: BinaryIO | None = None
+        self.__segment_size = 0
+        self.__last_timestamp = float("-inf")
+        for segment_number in segment_numbers:
+            # Segments left open by a writer that did not close, such as after a crash
+            if not os.path.exists(
+                _segment_path(directory, segment_number, ARCHIVE_SECONDARY_INDEX_SUFFIX)
+            ):
+                _write_secondary_index(directory, segment_number)
+        for segment_number in reversed(segment_numbers):
+            entries = _read_index(directory, segment_number)
+            if entries:
+                self.__last_timestamp = entries[-1][0]
+                break
+
+        self.max_segment_size = max_segment_size
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context
+
+        Returns:
+            Self: self
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Exit the runtime context and close"""
+        self.close()
+
+    def __open_segment(self) -> None:
+        """Open a new segment"""
+        self.__logger.debug(
+            f"Open a new segment. segment_number={self.__segment_number}"
+        )
+        self.__segment = open(
+            _segment_path(
+                self.__directory, self.__segment_number, ARCHIVE_SEGMENT_SUFFIX
+            ),
+            "wb",
+        )
+        self.__index = open(
+            _segment_path(
+                self.__directory, self.__segment_number, ARCHIVE_INDEX_SUFFIX
+            ),
+            "wb",
+        )
+        self.__segment_size = 0
+
+    def __close_segment(self) -> None:
+        """Close the current segment"""
+        if self.__segment is None:
+            return
+        self.__segment.close()
+        self.__index.close()
+        self.__segment = None
+        self.__index = None
+        _write_secondary_index(self.__directory, self.__segment_number)
+        self.__segment_number += 1
+
+    def write(
+        self,
+        data_group: DarcL4DataGroup1 | DarcL4DataGroup2,
+        timestamp: float | None = None,
+        stream_offset: int = -1,
+        payload: bytes | memoryview | None = None,
+    ) -> None:
+        """Write a Data Group
+
+        Args:
+            data_group (DarcL4DataGroup1 | DarcL4DataGroup2): Data Group
+            timestamp (float | None, optional): Time of the Data Group in seconds since the epoch. None to use current time. Raised to the last timestamp if earlier, such as when the clock steps back. Defaults to None.
+            stream_offset (int, optional): Offset in the source stream. Defaults to -1.
+            payload (bytes | memoryview | None, optional): Payload already taken from the Data Group, written without a copy. Defaults to None.
+        """
+        if payload is None:
+            parts = [pack_data_group_record(data_group)]
+        else:
+            parts = [
+                pack_data_group_record_header(data_group, len(payload)),
+                payload,
+            ]
+        record_length = sum(len(x) for x in parts)
+        if (
+            self.__segment is not None
+            and self.max_segment_size < self.__segment_size + record_length
+        ):
+            self.__close_segment()
+        if self.__segment is None:
+            self.__open_segment()
+
+        self.__last_timestamp = max(
+            self.__last_timestamp, time.time() if timestamp is None else timestamp
+        )
+        for part in parts:
+            self.__segment.write(part)
+        self.__index.write(
+            ARCHIVE_INDEX_ENTRY.pack(
+                self.__last_timestamp,
+                stream_offset,
+                self.__segment_size,
+                record_length,
+                data_group.service_id,
+                data_group.data_group_number,
+            )
+        )
+        self.__segment_size += record_length
+
+    def flush(self) -> None:
+        """Flush the current segment"""
+        if self.__segment is None:
+            return
+        # Segment first so that index entries never point past written records
+        self.__segment.flush()
+        self.__index.flush()
+
+    def close(self) -> None:
+        """Close the archive"""
+        self.flush()
+        self.__close_segment()
+
+
+class DarcL4DataGroupArchiveReader:
+    """DARC L4 Data Group Archive Reader
+
+    Segments and indexes are memory-mapped. Queries binary search the time ordered
+    indexes, and the secondary indexes of closed segments for Service IDs, Data
+    Group numbers and stream offsets, and only read records that match. Segments
+    without a secondary index, such as the one being written, are scanned.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Constructor
+
+        Args:
+            directory (str): Archive directory
+        """
+        self.__directory = directory
+        self.__segments: dict[int, mmap.mmap | None] = {}
+        self.__indexes: dict[int, mmap.mmap | None] = {}
+        self.__secondary_indexes: dict[int, mmap.mmap] = {}
+        self.refresh()
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context
+
+        Returns:
+            Self: self
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Exit the runtime context and close"""
+        self.close()
+
+    @staticmethod
+    def __map(path: str) -> mmap.mmap | None:
+        """Memory-map a file read-only
+
+        Args:
+            path (str): Path
+
+        Returns:
+            mmap.mmap | None: mmap.mmap, or None if the file is empty
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def refresh(self) -> None:
+        """Map segments written or grown since the last refresh"""
+        for segment_number in _segment_numbers(self.__directory):
+            index_path = _segment_path(
+                self.__directory, segment_number, ARCHIVE_INDEX_SUFFIX
+            )
+            segment_path = _segment_path(
+                self.__directory, segment_number, ARCHIVE_SEGMENT_SUFFIX
+            )
+            secondary_index_path = _segment_path(
+                self.__directory, segment_number, ARCHIVE_SECONDARY_INDEX_SUFFIX
+            )
+            # Secondary indexes are final once written
+            if segment_number not in self.__secondary_indexes and os.path.exists(
+                secondary_index_path
+            ):
+                self.__secondary_indexes[segment_number] = (
+                    DarcL4DataGroupArchiveReader.__map(secondary_index_path)
+                )
+
+            index = self.__indexes.get(segment_number)
+            segment = self.__segments.get(segment_number)
+            # Any segment may have grown, not only the last one, since the writer
+            # may have rotated more than once after the last refresh
+            if (
+                segment_number in self.__indexes
+                and os.path.getsize(index_path) == (0 if index is None else len(index))
+                and os.path.getsize(segment_path)
+                == (0 if segment is None else len(segment))
+            ):
+                continue
+            if index is not None:
+                index.close()
+            if segment is not None:
+                segment.close()
+            self.__indexes[segment_number] = DarcL4DataGroupArchiveReader.__map(
+                index_path
+            )
+            self.__segments[segment_number] = DarcL4DataGroupArchiveReader.__map(
+                segment_path
+            )
+
+    def close(self) -> None:
+        """Unmap all segments"""
+        for mapping in [
+            *self.__indexes.values(),
+            *self.__segments.values(),
+            *self.__secondary_indexes.values(),
+        ]:
+            if mapping is not None:
+                mapping.close()
+        self.__indexes.clear()
+        self.__segments.clear()
+        self.__secondary_indexes.clear()
+
+    def __entry_count(self, segment_number: int) -> int:
+        """Get number of complete index entries in a segment
+
+        Args:
+            segment_number (int): Segment number
+
+        Returns:
+            int: Number of entries
+        """
+        index = self.__indexes[segment_number]
+        segment = self.__segments[segment_number]
+        if index is None or segment is None:
+            return 0
+        count = len(index) // ARCHIVE_INDEX_ENTRY.size
+        # Ignore entries whose record is not fully written yet
+        while 0 < count:
+            _, _, record_offset, record_length, _, _ = ARCHIVE_INDEX_ENTRY.unpack_from(
+                index, (count - 1) * ARCHIVE_INDEX_ENTRY.size
+            )
+            if record_offset + record_length <= len(segment):
+                break
+            count -= 1
+        return count
+
+    def __entry(
+        self, segment_number: int, position: int
+    ) -> DarcL4DataGroupArchiveIndexEntry:
+        """Get an index entry
+
+        Args:
+            segment_number (int): Segment number
+            position (int): Position of the entry in the index
+
+        Returns:
+            DarcL4DataGroupArchiveIndexEntry: Index entry
+        """
+        (
+            timestamp,
+            stream_offset,
+            record_offset,
+            record_length,
+            service_id,
+            data_group_number,
+        ) = ARCHIVE_INDEX_ENTRY.unpack_from(
+            self.__indexes[segment_number], position * ARCHIVE_INDEX_ENTRY.size
+        )
+        return DarcL4DataGroupArchiveIndexEntry(
+            segment_number,
+            timestamp,
+            stream_offset,
+            record_offset,
+            record_length,
+            DarcL3DataPacketServiceIdentificationCode(service_id),
+            data_group_number,
+        )
+
+    def __timestamp(self, segment_number: int, position: int) -> float:
+        """Get timestamp of an index entry
+
+        Args:
+            segment_number (int): Segment number
+            position (int): Position of the entry in the index
+
+        Returns:
+            float: Timestamp
+        """
+        return ARCHIVE_INDEX_ENTRY.unpack_from(
+            self.__indexes[segment_number], position * ARCHIVE_INDEX_ENTRY.size
+        )[0]
+
+    def __bisect_timestamp(
+        self, segment_number: int, count: int, timestamp: float
+    ) -> int:
+        """Find the first index entry at or after a timestamp
+
+        Args:
+            segment_number (int): Segment number
+            count (int): Number of entries
+            timestamp (float): Timestamp
+
+        Returns:
+            int: Position of the entry
+        """
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self.__timestamp(segment_number, middle) < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def __secondary_positions(
+        self,
+        segment_number: int,
+        service_ids: set[DarcL3DataPacketServiceIdentificationCode] | None,
+        data_group_number: int | None,
+        start_stream_offset: int | None,
+        end_stream_offset: int | None,
+    ) -> set[int] | None:
+        """Find positions of index entries matching filters in a secondary index
+
+        Args:
+            segment_number (int): Segment number
+            service_ids (set[DarcL3DataPacketServiceIdentificationCode] | None): Service IDs. None for all.
+            data_group_number (int | None): Data Group number. None for all.
+            start_stream_offset (int | None): Inclusive start stream offset
+            end_stream_offset (int | None): Exclusive end stream offset
+
+        Returns:
+            set[int] | None: Positions of the entries, or None if no filter applies
+        """
+        secondary_index = self.__secondary_indexes[segment_number]
+        (count,) = ARCHIVE_SECONDARY_INDEX_HEADER.unpack_from(secondary_index, 0)
+        positions: set[int] | None = None
+
+        if service_ids is not None or data_group_number is not None:
+            positions = set()
+            for service_id in (
+                DarcL3DataPacketServiceIdentificationCode
+                if service_ids is None
+                else service_ids
+            ):
+                key = service_id << 16
+                positions.update(
+                    _table_positions(
+                        secondary_index,
+                        ARCHIVE_SECONDARY_INDEX_HEADER.size,
+                        ARCHIVE_SECONDARY_INDEX_KEY_ENTRY,
+                        count,
+                        key if data_group_number is None else key | data_group_number,
+                        (
+                            key + (1 << 16)
+                            if data_group_number is None
+                            else (key | data_group_number) + 1
+                        ),
+                    )
+                )
+
+        if start_stream_offset is not None or end_stream_offset is not None:
+            matched = set(
+                _table_positions(
+                    secondary_index,
+                    ARCHIVE_SECONDARY_INDEX_HEADER.size
+                    + count * ARCHIVE_SECONDARY_INDEX_KEY_ENTRY.size,
+                    ARCHIVE_SECONDARY_INDEX_STREAM_OFFSET_ENTRY,
+                    count,
+                    start_stream_offset,
+                    end_stream_offset,
+                )
+            )
+            positions = matched if positions is None else positions & matched
+
+        return positions
+
+    def entries(
+        self,
+        service_ids: set[DarcL3DataPacketServiceIdentificationCode] | None = None,
+        data_group_number: int | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        start_stream_offset: int | None = None,
+        end_stream_offset: int | None = None,
+    ) -> Generator[DarcL4DataGroupArchiveIndexEntry, None, None]:
+        """Query index entries
+
+        Args:
+            service_ids (set[DarcL3DataPacketServiceIdentificationCode] | None, optional): Service IDs. None for all. Defaults to None.
+            data_group_number (int | None, optional): Data Group number. None for all. Defaults to None.
+            start_time (float | None, optional): Inclusive start time. Defaults to None.
+            end_time (float | None, optional): Exclusive end time. Defaults to None.
+            start_stream_offset (int | None, optional): Inclusive start stream offset. Defaults to None.
+            end_stream_offset (int | None, optional): Exclusive end stream offset. Defaults to None.
+
+        Yields:
+            Generator[DarcL4DataGroupArchiveIndexEntry, None, None]: Index entries in archive order
+        """
+        for segment_number in sorted(self.__indexes):
+            count = self.__entry_count(segment_number)
+            if count == 0:
+                continue
+            # Skip segments outside the time range
+            if (
+                start_time is not None
+                and self.__timestamp(segment_number, count - 1) < start_time
+            ):
+                continue
+            if end_time is not None and end_time <= self.__timestamp(segment_number, 0):
+                break
+
+            low = (
+                0
+                if start_time is None
+                else self.__bisect_timestamp(segment_number, count, start_time)
+            )
+            high = (
+                count
+                if end_time is None
+                else self.__bisect_timestamp(segment_number, count, end_time)
+            )
+            positions = (
+                None
+                if segment_number not in self.__secondary_indexes
+                else self.__secondary_positions(
+                    segment_number,
+                    service_ids,
+                    data_group_number,
+                    start_stream_offset,
+                    end_stream_offset,
+                )
+            )
+            for position in (
+                range(low, high)
+                if positions is None
+                else sorted(x for x in positions if low <= x < high)
+            ):
+                entry = self.__entry(segment_number, position)
+                if service_ids is not None and entry.service_id not in service_ids:
+                    continue
+                if (
+                    data_group_number is not None
+                    and entry.data_group_number != data_group_number
+                ):
+                    continue
+                if (
+                    start_stream_offset is not None
+                    and entry.stream_offset < start_stream_offset
+                ):
+                    continue
+                if (
+                    end_stream_offset is not None
+                    and end_stream_offset <= entry.stream_offset
+                ):
+                    continue
+                yield entry
+
+    def read(
+        self, entry: DarcL4DataGroupArchiveIndexEntry
+    ) -> DarcL4DataGroup1 | DarcL4DataGroup2:
+        """Read the Data Group of an index entry
+
+        Args:
+            entry (DarcL4DataGroupArchiveIndexEntry): Index entry
+
+        Returns:
+            DarcL4DataGroup1 | DarcL4DataGroup2: Data Group
+        """
+        data_group, _, _ = unpack_data_group_record(
+            self.__segments[entry.segment_number], entry.record_offset
+        )
+        return data_group
+
+    def query(
+        self,
+        service_ids: set[DarcL3DataPacketServiceIdentificationCode] | None = None,
+        data_group_number: int | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        start_stream_offset: int | None = None,
+        end_stream_offset: int | None = None,
+    ) -> Generator[
+        tuple[DarcL4DataGroupArchiveIndexEntry, DarcL4DataGroup1 | DarcL4DataGroup2],
+        None,
+        None,
+    ]:
+        """Query Data Groups
+
+        Args:
+            service_ids (set[DarcL3DataPacketServiceIdentificationCode] | None, optional): Service IDs. None for all. Defaults to None.
+            data_group_number (int | None, optional): Data Group number. None for all. Defaults to None.
+            start_time (float | None, optional): Inclusive start time. Defaults to None.
+            end_time (float | None, optional): Exclusive end time. Defaults to None.
+            start_stream_offset (int | None, optional): Inclusive start stream offset. Defaults to None.
+            end_stream_offset (int | None, optional): Exclusive end stream offset. Defaults to None.
+
+        Yields:
+            Generator[tuple[DarcL4DataGroupArchiveIndexEntry, DarcL4DataGroup1 | DarcL4DataGroup2], None, None]: Index entries and Data Groups
+        """
+        for entry in self.entries(
+            service_ids,
+            data_group_number,
+            start_time,
+            end_time,
+            start_stream_offset,
+            end_stream_offset,
+        ):
+            yield entry, self.read(entry)
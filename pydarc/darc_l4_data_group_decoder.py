@@ -1,11 +1,78 @@
 import bitstring
+import struct
+import time
 from logging import getLogger
+from typing import Self
 
+from pydarc.bit_operations import pack_bits, unpack_bits
 from pydarc.darc_l3_data import (
     DarcL3DataPacketServiceIdentificationCode,
     DarcL3DataPacket,
 )
 from pydarc.darc_l4_data import DarcL4DataGroup1, DarcL4DataGroup2
+from pydarc.darc_metrics import DarcMetrics
+
+
+class DarcL4DataGroupBuffer:
+    """DARC L4 Data Group Buffer"""
+
+    def __init__(self, update_flag: int) -> None:
+        """Constructor
+
+        Args:
+            update_flag (int): Update flag of the Data Group
+        """
+        self.update_flag = update_flag
+        self.data_blocks: dict[int, bitstring.Bits] = {}
+        self.last_data_packet_number: int | None = None
+
+    def push_data_packet(self, data_packet: DarcL3DataPacket) -> None:
+        """Push a Data Packet into its slot
+
+        Args:
+            data_packet (DarcL3DataPacket): Data Packet
+        """
+        if data_packet.end_of_information_flag == 1:
+            self.last_data_packet_number = data_packet.data_packet_number
+            # Drop slots beyond the last Data Packet
+            for data_packet_number in [
+                x for x in self.data_blocks if data_packet.data_packet_number < x
+            ]:
+                del self.data_blocks[data_packet_number]
+        elif (
+            self.last_data_packet_number is not None
+            and self.last_data_packet_number <= data_packet.data_packet_number
+        ):
+            return
+
+        self.data_blocks[data_packet.data_packet_number] = data_packet.data_block
+
+    def is_complete(self) -> bool:
+        """Is all Data Packets collected
+
+        Returns:
+            bool: True if all Data Packets collected, else False
+        """
+        return (
+            self.last_data_packet_number is not None
+            and len(self.data_blocks) == self.last_data_packet_number + 1
+        )
+
+    def to_buffer(self) -> bitstring.Bits:
+        """To buffer
+
+        Raises:
+            ValueError: Data Group is not complete
+
+        Returns:
+            bitstring.Bits: Buffer
+        """
+        if not self.is_complete():
+            raise ValueError("Data Group is not complete.")
+
+        return bitstring.Bits().join(
+            self.data_blocks[i] for i in range(self.last_data_packet_number + 1)
+        )
 
 
 class DarcL4DataGroupDecoder:
@@ -13,9 +80,212 @@ class DarcL4DataGroupDecoder:
 
     __logger = getLogger(__name__)
 
-    def __init__(self) -> None:
-        """Constructor"""
-        self.__data_group_buffers: dict[tuple[int, int], bitstring.Bits] = {}
+    # version, max_data_group_buffers, number of Data Group buffers
+    __state_header = struct.Struct("<BII")
+    # service_id, data_group_number, update_flag, last_data_packet_number + 1, number of Data Blocks
+    __state_data_group_buffer = struct.Struct("<BHBHH")
+    # data_packet_number
+    __state_data_block = struct.Struct("<H")
+    __state_version = 1
+
+    def __init__(self, metrics: DarcMetrics | None = None) -> None:
+        """Constructor
+
+        Args:
+            metrics (DarcMetrics | None, optional): Metrics to update. Defaults to None.
+        """
+        self.__data_group_buffers: dict[tuple[int, int], DarcL4DataGroupBuffer] = {}
+
+        self.max_data_group_buffers = 4096
+        self.metrics = metrics
+
+    def reset(self) -> None:
+        """Reset the decoder"""
+        self.__data_group_buffers.clear()
+
+    def get_state(self) -> bytes:
+        """Get the decoder state
+
+        Returns:
+            bytes: Decoder state
+        """
+        state = bytearray(
+            DarcL4DataGroupDecoder.__state_header.pack(
+                DarcL4DataGroupDecoder.__state_version,
+                self.max_data_group_buffers,
+                len(self.__data_group_buffers),
+            )
+        )
+        for (
+            service_id,
+            data_group_number,
+        ), data_group_buffer in self.__data_group_buffers.items():
+            state += DarcL4DataGroupDecoder.__state_data_group_buffer.pack(
+                service_id,
+                data_group_number,
+                data_group_buffer.update_flag,
+                (
+                    0
+                    if data_group_buffer.last_data_packet_number is None
+                    else data_group_buffer.last_data_packet_number + 1
+                ),
+                len(data_group_buffer.data_blocks),
+            )
+            for data_packet_number, data_block in data_group_buffer.data_blocks.items():
+                state += DarcL4DataGroupDecoder.__state_data_block.pack(
+                    data_packet_number
+                )
+                state += pack_bits(data_block)
+        return bytes(state)
+
+    @classmethod
+    def from_state(cls, state: bytes | memoryview) -> Self:
+        """Construct from a decoder state
+
+        Args:
+            state (bytes | memoryview): Decoder state
+
+        Raises:
+            ValueError: Unsupported state version
+
+        Returns:
+            Self: DarcL4DataGroupDecoder instance
+        """
+        version, max_data_group_buffers, count = (
+            DarcL4DataGroupDecoder.__state_header.unpack_from(state)
+        )
+        if version != DarcL4DataGroupDecoder.__state_version:
+            raise ValueError(f"Unsupported state version. version={version}")
+
+        decoder = cls()
+        decoder.max_data_group_buffers = max_data_group_buffers
+        offset = DarcL4DataGroupDecoder.__state_header.size
+        for _ in range(count):
+            (
+                service_id,
+                data_group_number,
+                update_flag,
+                last_data_packet_number,
+                data_block_count,
+            ) = DarcL4DataGroupDecoder.__state_data_group_buffer.unpack_from(
+                state, offset
+            )
+            offset += DarcL4DataGroupDecoder.__state_data_group_buffer.size
+
+            data_group_buffer = DarcL4DataGroupBuffer(update_flag)
+            if last_data_packet_number != 0:
+                data_group_buffer.last_data_packet_number = last_data_packet_number - 1
+            for _ in range(data_block_count):
+                (data_packet_number,) = (
+                    DarcL4DataGroupDecoder.__state_data_block.unpack_from(state, offset)
+                )
+                offset += DarcL4DataGroupDecoder.__state_data_block.size
+                data_block, offset = unpack_bits(state, offset)
+                data_group_buffer.data_blocks[data_packet_number] = data_block
+
+            decoder.__data_group_buffers[
+                (
+                    DarcL3DataPacketServiceIdentificationCode(service_id),
+                    data_group_number,
+                )
+            ] = data_group_buffer
+        return decoder
+
+    def push_data_packet(
+        self, data_packet: DarcL3DataPacket
+    ) -> DarcL4DataGroup1 | DarcL4DataGroup2 | None:
+        """Push a Data Packet
+
+        Data Packets are reassembled by data_packet_number, so missing or repeated
+        Data Packets are filled from later repetitions of the same Data Group.
+        A Data Group carries the trace of the Data Packet which completed it.
+
+        Args:
+            data_packet (DarcL3DataPacket): Data Packet
+
+        Returns:
+            DarcL4DataGroup1 | DarcL4DataGroup2 | None: Data Group if completed, else None
+        """
+        start_time = time.perf_counter()
+        data_group = self.__push_data_packet(data_packet)
+        if self.metrics is not None:
+            self.metrics.add_layer_seconds("l4", time.perf_counter() - start_time)
+        return data_group
+
+    def __push_data_packet(
+        self, data_packet: DarcL3DataPacket
+    ) -> DarcL4DataGroup1 | DarcL4DataGroup2 | None:
+        """Push a Data Packet without timing
+
+        Args:
+            data_packet (DarcL3DataPacket): Data Packet
+
+        Returns:
+            DarcL4DataGroup1 | DarcL4DataGroup2 | None: Data Group if completed, else None
+        """
+        data_group_key = (data_packet.service_id, data_packet.data_group_number)
+        data_group_buffer = self.__data_group_buffers.get(data_group_key)
+        if (
+            data_group_buffer is not None
+            and data_group_buffer.update_flag != data_packet.update_flag
+        ):
+            self.__logger.debug(
+                "Data Group updated. Discard collected Data Packets. service_id=%#x data_group_number=%#x",
+                data_packet.service_id,
+                data_packet.data_group_number,
+            )
+            del self.__data_group_buffers[data_group_key]
+            data_group_buffer = None
+
+        if data_group_buffer is None:
+            if self.max_data_group_buffers <= len(self.__data_group_buffers):
+                # Evict the oldest Data Group buffer
+                evicted_key = next(iter(self.__data_group_buffers))
+                del self.__data_group_buffers[evicted_key]
+                self.__logger.debug(
+                    "Data Group buffer evicted. service_id=%#x data_group_number=%#x",
+                    evicted_key[0],
+                    evicted_key[1],
+                )
+                if self.metrics is not None:
+                    self.metrics.data_groups_evicted += 1
+            data_group_buffer = DarcL4DataGroupBuffer(data_packet.update_flag)
+            self.__data_group_buffers[data_group_key] = data_group_buffer
+
+        data_group_buffer.push_data_packet(data_packet)
+        if not data_group_buffer.is_complete():
+            return
+
+        del self.__data_group_buffers[data_group_key]
+        data_group: DarcL4DataGroup1 | DarcL4DataGroup2
+        if (
+            data_packet.service_id
+            == DarcL3DataPacketServiceIdentificationCode.ADDITIONAL_INFORMATION
+        ):
+            data_group = DarcL4DataGroup2.from_buffer(
+                data_packet.service_id,
+                data_packet.data_group_number,
+                data_group_buffer.to_buffer(),
+            )
+        else:
+            data_group = DarcL4DataGroup1.from_buffer(
+                data_packet.service_id,
+                data_packet.data_group_number,
+                data_group_buffer.to_buffer(),
+            )
+
+        data_group.bit_offset = data_packet.bit_offset
+        data_group.ingest_time = data_packet.ingest_time
+
+        if self.metrics is not None:
+            self.metrics.data_groups_completed += 1
+            if not data_group.is_crc_valid():
+                self.metrics.data_groups_crc_failed += 1
+            if data_group.ingest_time is not None:
+                self.metrics.observe_latency(
+                    "l4", time.monotonic() - data_group.ingest_time
+                )
+        return data_group
 
     def push_data_packets(
         self, data_packets: list[DarcL3DataPacket]
@@ -28,41 +298,12 @@ class DarcL4DataGroupDecoder:
         Returns:
             list[DarcL4DataGroup1 | DarcL4DataGroup2]: Data Groups
         """
+        start_time = time.perf_counter()
         data_groups: list[DarcL4DataGroup1 | DarcL4DataGroup2] = []
-
         for data_packet in data_packets:
-            data_group_key = (data_packet.service_id, data_packet.data_group_number)
-            data_group_buffer = self.__data_group_buffers.get(data_group_key)
-            if data_group_buffer is None:
-                if data_packet.data_packet_number != 0:
-                    self.__logger.debug(
-                        f"First Data Packet not found. service_id={hex(data_packet.service_id)} data_group_number={hex(data_packet.data_group_number)} data_packet_number={hex(data_packet.data_packet_number)}"
-                    )
-                    continue
-
-                self.__data_group_buffers[data_group_key] = data_packet.data_block
-            else:
-                self.__data_group_buffers[data_group_key] += data_packet.data_block
-
-            if data_packet.end_of_information_flag == 1:
-                data_group_buffer = self.__data_group_buffers.pop(data_group_key)
-                data_group: DarcL4DataGroup1 | DarcL4DataGroup2
-                if (
-                    data_packet.service_id
-                    == DarcL3DataPacketServiceIdentificationCode.ADDITIONAL_INFORMATION
-                ):
-                    data_group = DarcL4DataGroup2.from_buffer(
-                        data_packet.service_id,
-                        data_packet.data_group_number,
-                        data_group_buffer,
-                    )
-                else:
-                    data_group = DarcL4DataGroup1.from_buffer(
-                        data_packet.service_id,
-                        data_packet.data_group_number,
-                        data_group_buffer,
-                    )
-
+            data_group = self.__push_data_packet(data_packet)
+            if data_group is not None:
                 data_groups.append(data_group)
-
+        if self.metrics is not None:
+            self.metrics.add_layer_seconds("l4", time.perf_counter() - start_time)
         return data_groups
@@ -0,0 +1,128 @@
+import hashlib
+import time
+from collections import OrderedDict
+from logging import getLogger
+from typing import Callable
+
+from pydarc.darc_l4_data import DarcL4DataGroup1, DarcL4DataGroup2
+
+
+class DarcL4DataGroupDeduplicator:
+    """DARC L4 Data Group Deduplicator
+
+    Remember recently seen Data Groups in a bounded LRU cache with TTL to detect
+    repetitions of the same Data Group. The TTL runs from when a Data Group was
+    first emitted, so a Data Group rebroadcast continuously is emitted again once
+    per TTL. A repetition only refreshes its LRU position.
+    """
+
+    __logger = getLogger(__name__)
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Constructor
+
+        Args:
+            max_entries (int, optional): Maximum number of cached Data Groups. Defaults to 4096.
+            ttl (float, optional): Time to live of cached Data Groups in seconds. Defaults to 600.0.
+            clock (Callable[[], float], optional): Clock. Defaults to time.monotonic.
+
+        Raises:
+            ValueError: Invalid max_entries
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0.")
+
+        self.__cache: OrderedDict[tuple[int, int, bytes], float] = OrderedDict()
+        self.__clock = clock
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def __key(
+        data_group: DarcL4DataGroup1 | DarcL4DataGroup2,
+    ) -> tuple[int, int, bytes]:
+        """Get cache key of a Data Group
+
+        Args:
+            data_group (DarcL4DataGroup1 | DarcL4DataGroup2): Data Group
+
+        Returns:
+            tuple[int, int, bytes]: Service ID, Data Group number and payload digest
+        """
+        payload = (
+            data_group.data_group_data
+            if isinstance(data_group, DarcL4DataGroup1)
+            else data_group.segments_data
+        )
+        digest = hashlib.blake2b(payload.bytes, digest_size=16)
+        # CRC is included so that a repetition with a corrupted CRC is not hidden
+        digest.update(str(data_group.crc).encode())
+        return (data_group.service_id, data_group.data_group_number, digest.digest())
+
+    def reset(self) -> None:
+        """Reset the deduplicator"""
+        self.__cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def is_duplicate(self, data_group: DarcL4DataGroup1 | DarcL4DataGroup2) -> bool:
+        """Check a Data Group and remember it
+
+        Args:
+            data_group (DarcL4DataGroup1 | DarcL4DataGroup2): Data Group
+
+        Returns:
+            bool: True if the same Data Group has been first seen within TTL, else False
+        """
+        now = self.__clock()
+        key = DarcL4DataGroupDeduplicator.__key(data_group)
+
+        # Expire old entries in LRU order. Entries refreshed by repetitions may
+        # expire behind the first live one, so each key is also checked below.
+        while self.__cache:
+            oldest_key, first_seen = next(iter(self.__cache.items()))
+            if now - first_seen <= self.ttl:
+                break
+            del self.__cache[oldest_key]
+
+        first_seen = self.__cache.get(key)
+        if first_seen is not None and now - first_seen <= self.ttl:
+            self.__cache.move_to_end(key)
+            self.hits += 1
+            return True
+
+        self.__cache[key] = now
+        self.__cache.move_to_end(key)
+        if self.max_entries < len(self.__cache):
+            self.__cache.popitem(last=False)
+        self.misses += 1
+        return False
+
+    def push_data_groups(
+        self, data_groups: list[DarcL4DataGroup1 | DarcL4DataGroup2]
+    ) -> list[DarcL4DataGroup1 | DarcL4DataGroup2]:
+        """Push Data Groups
+
+        Args:
+            data_groups (list[DarcL4DataGroup1 | DarcL4DataGroup2]): Data Groups
+
+        Returns:
+            list[DarcL4DataGroup1 | DarcL4DataGroup2]: Data Groups not seen before
+        """
+        new_data_groups: list[DarcL4DataGroup1 | DarcL4DataGroup2] = []
+        for data_group in data_groups:
+            if self.is_duplicate(data_group):
+                self.__logger.debug(
+                    f"Duplicate Data Group suppressed. service_id={hex(data_group.service_id)} data_group_number={hex(data_group.data_group_number)}"
+                )
+                continue
+            new_data_groups.append(data_group)
+        return new_data_groups
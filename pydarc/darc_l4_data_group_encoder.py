@@ -0,0 +1,86 @@
+import bitstring
+
+from pydarc.crc_16_darc import crc_16_darc
+from pydarc.darc_l3_data import (
+    DarcL3DataPacket,
+    DarcL3DataPacketServiceIdentificationCode,
+)
+from pydarc.darc_l4_data import DarcL4DataGroup1, DarcL4DataGroup2
+
+
+class DarcL4DataGroupEncoder:
+    """DARC L4 Data Group Encoder
+
+    Reverse of DarcL4DataGroupDecoder. Split Data Groups into Data Packets.
+    """
+
+    def __init__(self, update_flag: int = 0) -> None:
+        """Constructor
+
+        Args:
+            update_flag (int, optional): Update flag of encoded Data Packets. Defaults to 0.
+        """
+        self.update_flag = update_flag
+
+    def push_data_group(
+        self, data_group: DarcL4DataGroup1 | DarcL4DataGroup2
+    ) -> list[DarcL3DataPacket]:
+        """Push a Data Group
+
+        The CRC of the Data Group is calculated from its buffer, so the crc field
+        of data_group is ignored.
+
+        Args:
+            data_group (DarcL4DataGroup1 | DarcL4DataGroup2): Data Group
+
+        Raises:
+            ValueError: Data Group does not fit in the Data Packet numbers
+
+        Returns:
+            list[DarcL3DataPacket]: Data Packets
+        """
+        # Composition 2 carries 20 bytes and Composition 1 18 bytes per Data Packet
+        data_block_size = (
+            20
+            if data_group.service_id
+            == DarcL3DataPacketServiceIdentificationCode.ADDITIONAL_INFORMATION
+            else 18
+        )
+
+        # to_buffer pads a whole block when the size is a multiple of the block
+        # size, so the buffer is rebuilt with the minimum padding
+        to_buffer = data_group.to_buffer().tobytes()
+        if isinstance(data_group, DarcL4DataGroup1):
+            data_size = len(data_group.data_group_data) // 8
+            head, tail = to_buffer[: 3 + data_size], to_buffer[-3:]
+        else:
+            data_size = len(data_group.segments_data) // 8
+            head, tail = to_buffer[:data_size], to_buffer[-2:]
+            if not data_group.has_crc():
+                tail = b""
+        buffer = bytearray(head)
+        buffer += bytes(-(len(head) + len(tail)) % data_block_size)
+        buffer += tail
+        if len(tail) != 0:
+            buffer[-2:] = crc_16_darc(memoryview(buffer)[:-2]).to_bytes(2)
+        data_packet_count = len(buffer) // data_block_size
+        max_data_packet_count = 1 << (4 if data_block_size == 20 else 10)
+        if max_data_packet_count < data_packet_count:
+            raise ValueError(
+                f"Data Group is too long. data_packet_count={data_packet_count}"
+            )
+
+        return [
+            DarcL3DataPacket(
+                data_group.service_id,
+                0,
+                1 if i == data_packet_count - 1 else 0,
+                self.update_flag,
+                data_group.data_group_number,
+                i,
+                bitstring.Bits(
+                    bytes=buffer[i * data_block_size : (i + 1) * data_block_size]
+                ),
+            )
+            for i in range(data_packet_count)
+        ]
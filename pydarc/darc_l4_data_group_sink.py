@@ -0,0 +1,557 @@
+import queue
+import sys
+from abc import ABC, abstractmethod
+import threading
+import time
+from importlib.metadata import entry_points
+from logging import getLogger
+from typing import BinaryIO, Callable, Iterator
+
+from pydarc.darc_l4_data import DarcL4DataGroup1, DarcL4DataGroup2
+from pydarc.darc_l4_data_group_archive import DarcL4DataGroupArchiveWriter
+from pydarc.darc_l4_data_group_writer import (
+    DarcL4DataGroupBinaryWriter,
+    DarcL4DataGroupJsonLinesWriter,
+    DarcL4DataGroupTextWriter,
+)
+from pydarc.darc_metrics import DarcMetrics
+
+# Entry point group of third party sinks. Each entry point is a factory called
+# with the argument of the sink specification, such as a path or a URL.
+SINK_ENTRY_POINT_GROUP = "pydarc.sinks"
+
+
+class DarcL4DataGroupBatch:
+    """DARC L4 Data Group Batch
+
+    The payload of each Data Group is taken from its Bits once by the batcher and
+    exposed as a read-only memoryview, so that every sink of a fan-out shares it
+    without copies. The binary and archive sinks write payloads as they are.
+    """
+
+    def __init__(
+        self,
+        data_groups: list[DarcL4DataGroup1 | DarcL4DataGroup2],
+        is_duplicates: list[bool | None],
+        payloads: list[bytes],
+    ) -> None:
+        """Constructor
+
+        Args:
+            data_groups (list[DarcL4DataGroup1 | DarcL4DataGroup2]): Data Groups
+            is_duplicates (list[bool | None]): Whether each Data Group is a repetition. None if not checked.
+            payloads (list[bytes]): Data Group data or segments data of each Data Group
+        """
+        self.data_groups = data_groups
+        self.is_duplicates = is_duplicates
+
+        self.__payloads = [memoryview(x) for x in payloads]
+
+    def __len__(self) -> int:
+        """Number of Data Groups
+
+        Returns:
+            int: Number of Data Groups
+        """
+        return len(self.data_groups)
+
+    def __iter__(
+        self,
+    ) -> Iterator[tuple[DarcL4DataGroup1 | DarcL4DataGroup2, memoryview, bool | None]]:
+        """Iterate Data Groups
+
+        Returns:
+            Iterator[tuple[DarcL4DataGroup1 | DarcL4DataGroup2, memoryview, bool | None]]: Data Group, payload and whether it is a repetition
+        """
+        return zip(self.data_groups, self.__payloads, self.is_duplicates)
+
+    def payload(self, index: int) -> memoryview:
+        """Get the payload of a Data Group
+
+        Args:
+            index (int): Index of the Data Group
+
+        Returns:
+            memoryview: Data Group data or segments data
+        """
+        return self.__payloads[index]
+
+
+class DarcL4DataGroupSink(ABC):
+    """DARC L4 Data Group Sink
+
+    Base class of sinks. A sink receives batches from DarcL4DataGroupBatcher and
+    owns its output until close.
+    """
+
+    @abstractmethod
+    def write_batch(self, batch: DarcL4DataGroupBatch) -> None:
+        """Write a batch
+
+        Args:
+            batch (DarcL4DataGroupBatch): Batch
+        """
+
+    def flush(self) -> None:
+        """Wait until written batches reach the output"""
+        pass
+
+    def close(self) -> None:
+        """Close the sink"""
+        pass
+
+
+class DarcL4DataGroupWriterSink(DarcL4DataGroupSink):
+    """DARC L4 Data Group Writer Sink
+
+    Write batches with a text or JSON Lines writer. They format Data Groups from
+    their Bits, so payloads of batches are not used.
+    """
+
+    def __init__(
+        self,
+        writer: DarcL4DataGroupTextWriter | DarcL4DataGroupJsonLinesWriter,
+        stream: BinaryIO | None = None,
+    ) -> None:
+        """Constructor
+
+        Args:
+            writer (DarcL4DataGroupTextWriter | DarcL4DataGroupJsonLinesWriter): Writer
+            stream (BinaryIO | None, optional): Stream of the writer to close with the sink. Defaults to None.
+        """
+        self.__writer = writer
+        self.__stream = stream
+
+    def write_batch(self, batch: DarcL4DataGroupBatch) -> None:
+        """Write a batch
+
+        Args:
+            batch (DarcL4DataGroupBatch): Batch
+        """
+        for data_group, _, is_duplicate in batch:
+            self.__writer.write(data_group, is_duplicate)
+        self.__writer.flush()
+
+    def flush(self) -> None:
+        """Flush the writer"""
+        self.__writer.flush()
+
+    def close(self) -> None:
+        """Close the sink"""
+        self.__writer.flush()
+        if self.__stream is not None:
+            self.__stream.close()
+
+
+class DarcL4DataGroupBinarySink(DarcL4DataGroupSink):
+    """DARC L4 Data Group Binary Sink
+
+    Write batches as binary records with payloads of batches.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """Constructor
+
+        Args:
+            stream (BinaryIO): Output stream to close with the sink
+        """
+        self.__stream = stream
+        self.__writer = DarcL4DataGroupBinaryWriter(stream)
+
+    def write_batch(self, batch: DarcL4DataGroupBatch) -> None:
+        """Write a batch
+
+        Args:
+            batch (DarcL4DataGroupBatch): Batch
+        """
+        for data_group, payload, is_duplicate in batch:
+            self.__writer.write(data_group, is_duplicate, payload)
+        self.__writer.flush()
+
+    def flush(self) -> None:
+        """Flush the writer"""
+        self.__writer.flush()
+
+    def close(self) -> None:
+        """Close the sink"""
+        self.__writer.flush()
+        self.__stream.close()
+
+
+class DarcL4DataGroupArchiveSink(DarcL4DataGroupSink):
+    """DARC L4 Data Group Archive Sink"""
+
+    def __init__(self, directory: str) -> None:
+        """Constructor
+
+        Args:
+            directory (str): Archive directory
+        """
+        self.__archive_writer = DarcL4DataGroupArchiveWriter(directory)
+
+    def write_batch(self, batch: DarcL4DataGroupBatch) -> None:
+        """Write a batch
+
+        Args:
+            batch (DarcL4DataGroupBatch): Batch
+        """
+        for data_group, payload, _ in batch:
+            self.__archive_writer.write(
+                data_group,
+                stream_offset=(
+                    -1 if data_group.bit_offset is None else data_group.bit_offset
+                ),
+                payload=payload,
+            )
+        self.__archive_writer.flush()
+
+    def flush(self) -> None:
+        """Flush the archive"""
+        self.__archive_writer.flush()
+
+    def close(self) -> None:
+        """Close the sink"""
+        self.__archive_writer.close()
+
+
+class DarcL4DataGroupFanOutSink(DarcL4DataGroupSink):
+    """DARC L4 Data Group Fan-out Sink
+
+    Pass batches to sinks running on their own threads through bounded queues.
+    By default writing waits for a sink whose queue is full, so that no batch is
+    lost. With dropping, a batch is dropped for that sink instead, so that a slow
+    sink never stalls decoding, and drops are counted.
+    """
+
+    __logger = getLogger(__name__)
+
+    def __init__(
+        self,
+        sinks: list[DarcL4DataGroupSink],
+        max_pending_batches: int = 64,
+        drop: bool = False,
+        names: list[str] | None = None,
+        metrics: DarcMetrics | None = None,
+    ) -> None:
+        """Constructor
+
+        Args:
+            sinks (list[DarcL4DataGroupSink]): Sinks
+            max_pending_batches (int, optional): Maximum number of queued batches per sink. Defaults to 64.
+            drop (bool, optional): Drop batches for a sink whose queue is full instead of waiting. Defaults to False.
+            names (list[str] | None, optional): Names of sinks in logs and metrics. Defaults to class names.
+            metrics (DarcMetrics | None, optional): Metrics counting dropped batches. Updated by the writing thread. Defaults to None.
+        """
+        self.__queues: list[queue.Queue[DarcL4DataGroupBatch | None]] = []
+        self.__threads: list[threading.Thread] = []
+        for sink in sinks:
+            batch_queue: queue.Queue[DarcL4DataGroupBatch | None] = queue.Queue(
+                max_pending_batches
+            )
+            thread = threading.Thread(
+                target=self.__run,
+                args=(sink, batch_queue),
+                name=f"sink-{type(sink).__name__}",
+                daemon=True,
+            )
+            thread.start()
+            self.__queues.append(batch_queue)
+            self.__threads.append(thread)
+
+        self.sinks = sinks
+        self.drop = drop
+        self.names = names or [type(x).__name__ for x in sinks]
+        self.metrics = metrics
+        # Number of batches dropped per sink
+        self.dropped_batches = [0] * len(sinks)
+
+    def __run(
+        self,
+        sink: DarcL4DataGroupSink,
+        batch_queue: queue.Queue[DarcL4DataGroupBatch | None],
+    ) -> None:
+        """Write batches from a queue until None
+
+        Args:
+            sink (DarcL4DataGroupSink): Sink
+            batch_queue (queue.Queue[DarcL4DataGroupBatch | None]): Queue
+        """
+        while True:
+            batch = batch_queue.get()
+            if batch is None:
+                batch_queue.task_done()
+                break
+            try:
+                sink.write_batch(batch)
+            except Exception:
+                self.__logger.exception(
+                    "Sink failed to write a batch. sink=%s", type(sink).__name__
+                )
+            finally:
+                batch_queue.task_done()
+        try:
+            sink.close()
+        except Exception:
+            self.__logger.exception(
+                "Sink failed to close. sink=%s", type(sink).__name__
+            )
+
+    def write_batch(self, batch: DarcL4DataGroupBatch) -> None:
+        """Write a batch to every sink
+
+        Args:
+            batch (DarcL4DataGroupBatch): Batch
+        """
+        for i, batch_queue in enumerate(self.__queues):
+            if not self.drop:
+                batch_queue.put(batch)
+                continue
+            try:
+                batch_queue.put_nowait(batch)
+            except queue.Full:
+                self.dropped_batches[i] += 1
+                if self.metrics is not None:
+                    self.metrics.sink_batches_dropped[self.names[i]] = (
+                        self.metrics.sink_batches_dropped.get(self.names[i], 0) + 1
+                    )
+                self.__logger.warning(
+                    "Sink is too slow. Batch dropped. sink=%s", self.names[i]
+                )
+
+    def flush(self) -> None:
+        """Wait until every sink has written its queued batches and flush them
+
+        A sink thread is idle after its queue is joined, so its sink is flushed
+        from the calling thread.
+        """
+        for batch_queue in self.__queues:
+            batch_queue.join()
+        for sink in self.sinks:
+            try:
+                sink.flush()
+            except Exception:
+                self.__logger.exception(
+                    "Sink failed to flush. sink=%s", type(sink).__name__
+                )
+
+    def close(self) -> None:
+        """Write pending batches and close every sink"""
+        for batch_queue in self.__queues:
+            batch_queue.put(None)
+        for thread in self.__threads:
+            thread.join()
+
+
+class DarcL4DataGroupBatcher:
+    """DARC L4 Data Group Batcher
+
+    Collect Data Groups into batches for a sink. A batch is flushed when it
+    reaches max_data_groups or max_bytes of payload, or when its oldest Data Group
+    is older than max_delay at a write or poll.
+    """
+
+    def __init__(
+        self,
+        sink: DarcL4DataGroupSink,
+        max_data_groups: int = 256,
+        max_bytes: int = 1 << 20,
+        max_delay: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Constructor
+
+        Args:
+            sink (DarcL4DataGroupSink): Sink
+            max_data_groups (int, optional): Maximum number of Data Groups in a batch. Defaults to 256.
+            max_bytes (int, optional): Maximum payload size of a batch in bytes. Defaults to 1 MiB.
+            max_delay (float, optional): Maximum delay of a Data Group in seconds. Defaults to 1.0.
+            clock (Callable[[], float], optional): Clock. Defaults to time.monotonic.
+        """
+        self.__data_groups: list[DarcL4DataGroup1 | DarcL4DataGroup2] = []
+        self.__is_duplicates: list[bool | None] = []
+        self.__payloads: list[bytes] = []
+        self.__size = 0
+        self.__first_time = 0.0
+        self.__clock = clock
+        self.__closed = False
+
+        self.sink = sink
+        self.max_data_groups = max_data_groups
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+
+    def write(
+        self,
+        data_group: DarcL4DataGroup1 | DarcL4DataGroup2,
+        is_duplicate: bool | None = None,
+    ) -> None:
+        """Write a Data Group
+
+        Args:
+            data_group (DarcL4DataGroup1 | DarcL4DataGroup2): Data Group
+            is_duplicate (bool | None, optional): Data Group is a repetition. None if not checked. Defaults to None.
+        """
+        payload = (
+            data_group.data_group_data
+            if isinstance(data_group, DarcL4DataGroup1)
+            else data_group.segments_data
+        ).tobytes()
+        if len(self.__data_groups) == 0:
+            self.__first_time = self.__clock()
+        self.__data_groups.append(data_group)
+        self.__is_duplicates.append(is_duplicate)
+        self.__payloads.append(payload)
+        self.__size += len(payload)
+
+        if (
+            self.max_data_groups <= len(self.__data_groups)
+            or self.max_bytes <= self.__size
+        ):
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self) -> None:
+        """Flush the batch if its oldest Data Group is older than max_delay"""
+        if (
+            len(self.__data_groups) != 0
+            and self.max_delay <= self.__clock() - self.__first_time
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Pass the batch to the sink"""
+        if len(self.__data_groups) == 0:
+            return
+        batch = DarcL4DataGroupBatch(
+            self.__data_groups, self.__is_duplicates, self.__payloads
+        )
+        self.__data_groups = []
+        self.__is_duplicates = []
+        self.__payloads = []
+        self.__size = 0
+        self.sink.write_batch(batch)
+
+    def drain(self) -> None:
+        """Pass the batch to the sink and wait until the sink has written it
+
+        Nothing is done once closed, since close has already written everything.
+        """
+        if self.__closed:
+            return
+        self.flush()
+        self.sink.flush()
+
+    def close(self) -> None:
+        """Flush the batch and close the sink"""
+        if self.__closed:
+            return
+        self.__closed = True
+        self.flush()
+        self.sink.close()
+
+
+def __open_output(argument: str) -> BinaryIO:
+    """Open an output of a sink
+
+    Args:
+        argument (str): Path, or empty or - for stdout
+
+    Returns:
+        BinaryIO: Output stream
+    """
+    if argument in ["", "-"]:
+        return open(sys.stdout.fileno(), "wb", closefd=False)
+    return open(argument, "ab")
+
+
+def __writer_sink_factory(
+    writer_class: (
+        type[DarcL4DataGroupTextWriter] | type[DarcL4DataGroupJsonLinesWriter]
+    ),
+) -> Callable[[str], DarcL4DataGroupSink]:
+    """Get a factory of writer sinks
+
+    Args:
+        writer_class (type[DarcL4DataGroupTextWriter] | type[DarcL4DataGroupJsonLinesWriter]): Writer class
+
+    Returns:
+        Callable[[str], DarcL4DataGroupSink]: Factory taking an output path
+    """
+
+    def factory(argument: str) -> DarcL4DataGroupSink:
+        stream = __open_output(argument)
+        return DarcL4DataGroupWriterSink(writer_class(stream), stream)
+
+    return factory
+
+
+def __binary_sink_factory(argument: str) -> DarcL4DataGroupSink:
+    """Construct a binary sink
+
+    Args:
+        argument (str): Output path, or empty or - for stdout
+
+    Returns:
+        DarcL4DataGroupSink: Sink
+    """
+    return DarcL4DataGroupBinarySink(__open_output(argument))
+
+
+__builtin_sinks: dict[str, Callable[[str], DarcL4DataGroupSink]] = {
+    "text": __writer_sink_factory(DarcL4DataGroupTextWriter),
+    "jsonl": __writer_sink_factory(DarcL4DataGroupJsonLinesWriter),
+    "binary": __binary_sink_factory,
+    "archive": DarcL4DataGroupArchiveSink,
+}
+
+
+def available_sinks() -> list[str]:
+    """Get names of built-in sinks and sinks registered as entry points
+
+    Returns:
+        list[str]: Sink names
+    """
+    return sorted(
+        set(__builtin_sinks)
+        | {x.name for x in entry_points(group=SINK_ENTRY_POINT_GROUP)}
+    )
+
+
+def is_stdout_sink(specification: str) -> bool:
+    """Check whether a sink specification writes to stdout
+
+    Args:
+        specification (str): NAME or NAME:ARGUMENT
+
+    Returns:
+        bool: True if a built-in writer sink without an output path, else False
+    """
+    name, _, argument = specification.partition(":")
+    return name in ["text", "jsonl", "binary"] and argument in ["", "-"]
+
+
+def load_sink(specification: str) -> DarcL4DataGroupSink:
+    """Construct a sink from its specification
+
+    Built-in sinks are text, jsonl and binary with an optional output path, and
+    archive with a directory. Other names are looked up in the pydarc.sinks
+    entry point group.
+
+    Args:
+        specification (str): NAME or NAME:ARGUMENT
+
+    Raises:
+        ValueError: Unknown sink
+
+    Returns:
+        DarcL4DataGroupSink: Sink
+    """
+    name, _, argument = specification.partition(":")
+    factory = __builtin_sinks.get(name)
+    if factory is None:
+        matches = entry_points(group=SINK_ENTRY_POINT_GROUP, name=name)
+        if len(matches) == 0:
+            raise ValueError(f"Unknown sink. name={name}")
+        factory = next(iter(matches)).load()
+    return factory(argument)
@@ -0,0 +1,312 @@
+import bitstring
+import json
+import struct
+from typing import BinaryIO, Generator
+
+from pydarc.darc_l3_data import DarcL3DataPacketServiceIdentificationCode
+from pydarc.darc_l4_data import DarcL4DataGroup1, DarcL4DataGroup2
+
+# payload_length, composition, service_id, data_group_number, flags, end_of_data_group, crc
+DATA_GROUP_RECORD_HEADER = struct.Struct("<IBBHBBH")
+
+DATA_GROUP_RECORD_FLAG_CRC_VALID = 0x01
+DATA_GROUP_RECORD_FLAG_HAS_CRC = 0x02
+DATA_GROUP_RECORD_FLAG_DATA_GROUP_LINK = 0x04
+DATA_GROUP_RECORD_FLAG_DUPLICATE = 0x08
+
+
+def pack_data_group_record_header(
+    data_group: DarcL4DataGroup1 | DarcL4DataGroup2,
+    payload_length: int,
+    is_duplicate: bool = False,
+) -> bytes:
+    """Pack the header of a binary record, for a payload held elsewhere
+
+    Args:
+        data_group (DarcL4DataGroup1 | DarcL4DataGroup2): Data Group
+        payload_length (int): Payload length in bytes
+        is_duplicate (bool, optional): Data Group is a repetition. Defaults to False.
+
+    Returns:
+        bytes: Record header
+    """
+    flags = DATA_GROUP_RECORD_FLAG_CRC_VALID if data_group.is_crc_valid() else 0
+    if is_duplicate:
+        flags |= DATA_GROUP_RECORD_FLAG_DUPLICATE
+
+    if isinstance(data_group, DarcL4DataGroup1):
+        composition = 1
+        flags |= DATA_GROUP_RECORD_FLAG_HAS_CRC
+        if data_group.data_group_link != 0:
+            flags |= DATA_GROUP_RECORD_FLAG_DATA_GROUP_LINK
+        end_of_data_group = data_group.end_of_data_group
+        crc = data_group.crc
+    else:
+        composition = 2
+        if data_group.crc is not None:
+            flags |= DATA_GROUP_RECORD_FLAG_HAS_CRC
+        end_of_data_group = 0
+        crc = 0 if data_group.crc is None else data_group.crc
+
+    return DATA_GROUP_RECORD_HEADER.pack(
+        payload_length,
+        composition,
+        data_group.service_id,
+        data_group.data_group_number,
+        flags,
+        end_of_data_group,
+        crc,
+    )
+
+
+def pack_data_group_record(
+    data_group: DarcL4DataGroup1 | DarcL4DataGroup2, is_duplicate: bool = False
+) -> bytes:
+    """Pack a Data Group into a binary record
+
+    Args:
+        data_group (DarcL4DataGroup1 | DarcL4DataGroup2): Data Group
+        is_duplicate (bool, optional): Data Group is a repetition. Defaults to False.
+
+    Returns:
+        bytes: Record
+    """
+    payload = (
+        data_group.data_group_data.bytes
+        if isinstance(data_group, DarcL4DataGroup1)
+        else data_group.segments_data.bytes
+    )
+    return (
+        pack_data_group_record_header(data_group, len(payload), is_duplicate) + payload
+    )
+
+
+def unpack_data_group_record(
+    buffer: bytes | memoryview, offset: int = 0
+) -> tuple[DarcL4DataGroup1 | DarcL4DataGroup2, int, int]:
+    """Unpack a Data Group from a binary record
+
+    Args:
+        buffer (bytes | memoryview): Buffer
+        offset (int, optional): Offset of the record. Defaults to 0.
+
+    Raises:
+        ValueError: Truncated record or unknown composition
+
+    Returns:
+        tuple[DarcL4DataGroup1 | DarcL4DataGroup2, int, int]: Data Group, flags and offset of the next record
+    """
+    if len(buffer) < offset + DATA_GROUP_RECORD_HEADER.size:
+        raise ValueError("record header is truncated.")
+
+    (
+        payload_length,
+        composition,
+        service_id,
+        data_group_number,
+        flags,
+        end_of_data_group,
+        crc,
+    ) = DATA_GROUP_RECORD_HEADER.unpack_from(buffer, offset)
+    payload_offset = offset + DATA_GROUP_RECORD_HEADER.size
+    next_offset = payload_offset + payload_length
+    if len(buffer) < next_offset:
+        raise ValueError("record payload is truncated.")
+
+    payload = bitstring.Bits(bytes(buffer[payload_offset:next_offset]))
+    crc_valid = flags & DATA_GROUP_RECORD_FLAG_CRC_VALID != 0
+    data_group: DarcL4DataGroup1 | DarcL4DataGroup2
+    if composition == 1:
+        data_group = DarcL4DataGroup1(
+            DarcL3DataPacketServiceIdentificationCode(service_id),
+            data_group_number,
+            1 if flags & DATA_GROUP_RECORD_FLAG_DATA_GROUP_LINK != 0 else 0,
+            payload,
+            end_of_data_group,
+            crc,
+            crc_valid,
+        )
+    elif composition == 2:
+        data_group = DarcL4DataGroup2(
+            DarcL3DataPacketServiceIdentificationCode(service_id),
+            data_group_number,
+            payload,
+            crc if flags & DATA_GROUP_RECORD_FLAG_HAS_CRC != 0 else None,
+            crc_valid,
+        )
+    else:
+        raise ValueError(f"Unknown composition. composition={composition}")
+
+    return data_group, flags, next_offset
+
+
+def read_data_group_records(
+    stream: BinaryIO,
+) -> Generator[tuple[DarcL4DataGroup1 | DarcL4DataGroup2, int], None, None]:
+    """Read binary records from a stream
+
+    Args:
+        stream (BinaryIO): Stream
+
+    Yields:
+        Generator[tuple[DarcL4DataGroup1 | DarcL4DataGroup2, int], None, None]: Data Group and flags
+    """
+    while True:
+        header = stream.read(DATA_GROUP_RECORD_HEADER.size)
+        if len(header) == 0:
+            return
+        payload_length = DATA_GROUP_RECORD_HEADER.unpack(header)[0]
+        data_group, flags, _ = unpack_data_group_record(
+            header + stream.read(payload_length)
+        )
+        yield data_group, flags
+
+
+class DarcL4DataGroupTextWriter:
+    """DARC L4 Data Group Text Writer"""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """Constructor
+
+        Args:
+            stream (BinaryIO): Output stream
+        """
+        self.__stream = stream
+
+    def write(
+        self,
+        data_group: DarcL4DataGroup1 | DarcL4DataGroup2,
+        is_duplicate: bool | None = None,
+    ) -> None:
+        """Write a Data Group
+
+        Args:
+            data_group (DarcL4DataGroup1 | DarcL4DataGroup2): Data Group
+            is_duplicate (bool | None, optional): Data Group is a repetition. None to omit. Defaults to None.
+        """
+        duplicate_string = (
+            "" if is_duplicate is None else f" is_duplicate={is_duplicate}"
+        )
+        line: str
+        if isinstance(data_group, DarcL4DataGroup1):
+            line = f"is_crc_valid={data_group.is_crc_valid()} service_id={data_group.service_id.name} data_group_number={hex(data_group.data_group_number)} data_group_link={hex(data_group.data_group_link)} data_group_data={data_group.data_group_data.bytes.hex()} end_of_data_group={hex(data_group.end_of_data_group)} crc={hex(data_group.crc)}{duplicate_string}\n"
+        else:
+            crc_string = "None" if data_group.crc is None else hex(data_group.crc)
+            line = f"is_crc_valid={data_group.is_crc_valid()} service_id={data_group.service_id.name} data_group_number={hex(data_group.data_group_number)} segments_data={data_group.segments_data.bytes.hex()} crc={crc_string}{duplicate_string}\n"
+        self.__stream.write(line.encode())
+
+    def flush(self) -> None:
+        """Flush the output stream"""
+        self.__stream.flush()
+
+
+class DarcL4DataGroupJsonLinesWriter:
+    """DARC L4 Data Group JSON Lines Writer"""
+
+    def __init__(self, stream: BinaryIO, batch_size: int = 256) -> None:
+        """Constructor
+
+        Args:
+            stream (BinaryIO): Output stream
+            batch_size (int, optional): Number of lines written at once. Defaults to 256.
+        """
+        self.__stream = stream
+        self.__lines: list[str] = []
+
+        self.batch_size = batch_size
+
+    def write(
+        self,
+        data_group: DarcL4DataGroup1 | DarcL4DataGroup2,
+        is_duplicate: bool | None = None,
+    ) -> None:
+        """Write a Data Group
+
+        Args:
+            data_group (DarcL4DataGroup1 | DarcL4DataGroup2): Data Group
+            is_duplicate (bool | None, optional): Data Group is a repetition. None to omit. Defaults to None.
+        """
+        record: dict[str, object]
+        if isinstance(data_group, DarcL4DataGroup1):
+            record = {
+                "composition": 1,
+                "is_crc_valid": data_group.is_crc_valid(),
+                "service_id": data_group.service_id.name,
+                "data_group_number": data_group.data_group_number,
+                "data_group_link": data_group.data_group_link,
+                "data_group_data": data_group.data_group_data.bytes.hex(),
+                "end_of_data_group": data_group.end_of_data_group,
+                "crc": data_group.crc,
+            }
+        else:
+            record = {
+                "composition": 2,
+                "is_crc_valid": data_group.is_crc_valid(),
+                "service_id": data_group.service_id.name,
+                "data_group_number": data_group.data_group_number,
+                "segments_data": data_group.segments_data.bytes.hex(),
+                "crc": data_group.crc,
+            }
+        if is_duplicate is not None:
+            record["is_duplicate"] = is_duplicate
+
+        self.__lines.append(json.dumps(record, separators=(",", ":")))
+        if self.batch_size <= len(self.__lines):
+            self.__write_lines()
+
+    def __write_lines(self) -> None:
+        """Write buffered lines"""
+        if len(self.__lines) == 0:
+            return
+        self.__lines.append("")
+        self.__stream.write("\n".join(self.__lines).encode())
+        self.__lines.clear()
+
+    def flush(self) -> None:
+        """Flush buffered lines and the output stream"""
+        self.__write_lines()
+        self.__stream.flush()
+
+
+class DarcL4DataGroupBinaryWriter:
+    """DARC L4 Data Group Binary Writer
+
+    Each record is DATA_GROUP_RECORD_HEADER followed by the payload.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """Constructor
+
+        Args:
+            stream (BinaryIO): Output stream
+        """
+        self.__stream = stream
+
+    def write(
+        self,
+        data_group: DarcL4DataGroup1 | DarcL4DataGroup2,
+        is_duplicate: bool | None = None,
+        payload: bytes | memoryview | None = None,
+    ) -> None:
+        """Write a Data Group
+
+        Args:
+            data_group (DarcL4DataGroup1 | DarcL4DataGroup2): Data Group
+            is_duplicate (bool | None, optional): Data Group is a repetition. Defaults to None.
+            payload (bytes | memoryview | None, optional): Payload already taken from the Data Group, written without a copy. Defaults to None.
+        """
+        if payload is None:
+            self.__stream.write(
+                pack_data_group_record(data_group, is_duplicate is True)
+            )
+            return
+        self.__stream.write(
+            pack_data_group_record_header(
+                data_group, len(payload), is_duplicate is True
+            )
+        )
+        self.__stream.write(payload)
+
+    def flush(self) -> None:
+        """Flush the output stream"""
+        self.__stream.flush()
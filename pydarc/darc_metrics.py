@@ -0,0 +1,329 @@
+import bisect
+import os
+import threading
+from logging import getLogger
+from typing import Callable
+
+from pydarc.darc_l2_data import DarcL2BlockIdentificationCode
+from pydarc.darc_l3_data import DarcL3DataPacketServiceIdentificationCode
+
+
+class DarcLatencyHistogram:
+    """DARC Latency Histogram
+
+    Fixed bucket histogram of latencies in seconds. Observing is a bisect and two
+    additions, so it is cheap enough to leave on.
+    """
+
+    # Upper bounds in seconds. A Frame lasts about 5 seconds on air and a Data
+    # Group may span many Frames.
+    BUCKETS = (
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+        30.0,
+        60.0,
+        120.0,
+        300.0,
+    )
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS) -> None:
+        """Constructor
+
+        Args:
+            buckets (tuple[float, ...], optional): Sorted bucket upper bounds in seconds. Defaults to BUCKETS.
+        """
+        self.buckets = buckets
+        # The last count is for latencies above all buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Observe a latency
+
+        Args:
+            seconds (float): Latency in seconds
+        """
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile
+
+        Args:
+            q (float): Quantile between 0 and 1
+
+        Returns:
+            float: Upper bound of the bucket holding the quantile. inf if above all buckets, nan if empty.
+        """
+        if self.count == 0:
+            return float("nan")
+        rank = q * self.count
+        cumulative = 0
+        for bucket, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if rank <= cumulative:
+                return bucket
+        return float("inf")
+
+
+class DarcMetrics:
+    """DARC Metrics
+
+    Counters shared by the decoder chain. Pass the same instance to each decoder.
+    Counters are not synchronized, so decoder chains on different threads must not
+    share an instance.
+    """
+
+    def __init__(self) -> None:
+        """Constructor"""
+        # L2 Block
+        self.bits = 0
+        self.sync_acquisitions = 0
+        self.sync_losses = 0
+        self.blocks: dict[DarcL2BlockIdentificationCode, int] = {}
+        self.rows_corrected = 0
+        self.rows_uncorrectable = 0
+        # L2 Frame
+        self.sequence_violations = 0
+        self.frames = 0
+        self.columns_corrected = 0
+        self.columns_uncorrectable = 0
+        # L3
+        self.data_packets: dict[DarcL3DataPacketServiceIdentificationCode, int] = {}
+        self.data_packets_dropped: dict[
+            DarcL3DataPacketServiceIdentificationCode, int
+        ] = {}
+        # L4
+        self.data_groups_completed = 0
+        self.data_groups_evicted = 0
+        self.data_groups_crc_failed = 0
+        # Batches dropped per sink
+        self.sink_batches_dropped: dict[str, int] = {}
+        # Seconds spent per layer
+        self.layer_seconds: dict[str, float] = {}
+        # Latency from ingest to emit per layer
+        self.latency: dict[str, DarcLatencyHistogram] = {}
+
+    def add_layer_seconds(self, layer: str, seconds: float) -> None:
+        """Add time spent in a layer
+
+        Args:
+            layer (str): Layer name
+            seconds (float): Seconds
+        """
+        self.layer_seconds[layer] = self.layer_seconds.get(layer, 0.0) + seconds
+
+    def observe_latency(self, layer: str, seconds: float) -> None:
+        """Observe a latency from ingest to emit in a layer
+
+        Args:
+            layer (str): Layer name
+            seconds (float): Seconds
+        """
+        histogram = self.latency.get(layer)
+        if histogram is None:
+            histogram = self.latency[layer] = DarcLatencyHistogram()
+        histogram.observe(seconds)
+
+    def to_prometheus(self) -> str:
+        """To Prometheus text format
+
+        Dictionaries are copied before iteration, so that the exporter thread can
+        take a snapshot while the decoder thread adds keys.
+
+        Returns:
+            str: Metrics in Prometheus text exposition format
+        """
+        lines: list[str] = []
+
+        def add(
+            name: str,
+            description: str,
+            values: dict[str, int | float] | int | float,
+            label: str | None = None,
+        ) -> None:
+            lines.append(f"# HELP darc_{name} {description}")
+            lines.append(f"# TYPE darc_{name} counter")
+            if isinstance(values, dict):
+                for key, value in sorted(values.items()):
+                    lines.append(f'darc_{name}{{{label}="{key}"}} {value}')
+            else:
+                lines.append(f"darc_{name} {values}")
+
+        add("bits_total", "Bits consumed.", self.bits)
+        add(
+            "sync_acquisitions_total",
+            "Block sync acquisitions.",
+            self.sync_acquisitions,
+        )
+        add("sync_losses_total", "Block sync losses.", self.sync_losses)
+        add(
+            "blocks_total",
+            "Blocks decoded by BIC.",
+            {key.name: value for key, value in self.blocks.copy().items()},
+            "bic",
+        )
+        add("rows_corrected_total", "Blocks corrected by DSCC.", self.rows_corrected)
+        add(
+            "rows_uncorrectable_total",
+            "Blocks not correctable by DSCC.",
+            self.rows_uncorrectable,
+        )
+        add(
+            "sequence_violations_total",
+            "Blocks out of Frame sequence.",
+            self.sequence_violations,
+        )
+        add("frames_total", "Frames decoded.", self.frames)
+        add(
+            "columns_corrected_total",
+            "Frame columns corrected by vertical parity.",
+            self.columns_corrected,
+        )
+        add(
+            "columns_uncorrectable_total",
+            "Frame columns not correctable by vertical parity.",
+            self.columns_uncorrectable,
+        )
+        add(
+            "data_packets_total",
+            "L3 Data Packets decoded by Service ID.",
+            {key.name: value for key, value in self.data_packets.copy().items()},
+            "service_id",
+        )
+        add(
+            "data_packets_dropped_total",
+            "L3 Data Packets dropped by the Service ID filter.",
+            {
+                key.name: value
+                for key, value in self.data_packets_dropped.copy().items()
+            },
+            "service_id",
+        )
+        add(
+            "data_groups_completed_total",
+            "L4 Data Groups completed.",
+            self.data_groups_completed,
+        )
+        add(
+            "data_groups_evicted_total",
+            "Partial L4 Data Groups evicted.",
+            self.data_groups_evicted,
+        )
+        add(
+            "data_groups_crc_failed_total",
+            "L4 Data Groups with invalid CRC.",
+            self.data_groups_crc_failed,
+        )
+        add(
+            "sink_batches_dropped_total",
+            "Batches dropped for sinks falling behind.",
+            self.sink_batches_dropped.copy(),
+            "sink",
+        )
+        add(
+            "layer_seconds_total",
+            "Seconds spent per layer.",
+            self.layer_seconds.copy(),
+            "layer",
+        )
+        lines.append(
+            "# HELP darc_latency_seconds Latency from ingest to emit per layer."
+        )
+        lines.append("# TYPE darc_latency_seconds histogram")
+        for layer, histogram in sorted(self.latency.copy().items()):
+            cumulative = 0
+            for bucket, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(
+                    f'darc_latency_seconds_bucket{{layer="{layer}",le="{bucket}"}} {cumulative}'
+                )
+            lines.append(
+                f'darc_latency_seconds_bucket{{layer="{layer}",le="+Inf"}} {histogram.count}'
+            )
+            lines.append(f'darc_latency_seconds_sum{{layer="{layer}"}} {histogram.sum}')
+            lines.append(
+                f'darc_latency_seconds_count{{layer="{layer}"}} {histogram.count}'
+            )
+        lines.append("")
+        return "\n".join(lines)
+
+
+class DarcMetricsExporter:
+    """DARC Metrics Exporter
+
+    Export DarcMetrics snapshots to a file and/or a callback at an interval from a
+    background thread.
+    """
+
+    __logger = getLogger(__name__)
+
+    def __init__(
+        self,
+        metrics: DarcMetrics,
+        interval: float = 15.0,
+        path: str | None = None,
+        callback: Callable[[str], None] | None = None,
+    ) -> None:
+        """Constructor
+
+        Args:
+            metrics (DarcMetrics): Metrics
+            interval (float, optional): Export interval in seconds. Defaults to 15.0.
+            path (str | None, optional): File to write snapshots to. Defaults to None.
+            callback (Callable[[str], None] | None, optional): Callback receiving snapshots. Defaults to None.
+        """
+        self.__metrics = metrics
+        self.__path = path
+        self.__callback = callback
+        self.__stopped = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+        self.interval = interval
+
+    def export(self) -> None:
+        """Export a snapshot now"""
+        snapshot = self.__metrics.to_prometheus()
+        if self.__path is not None:
+            # Replace atomically so that scrapers never read a partial file
+            temporary_path = f"{self.__path}.tmp"
+            with open(temporary_path, "w") as file:
+                file.write(snapshot)
+            os.replace(temporary_path, self.__path)
+        if self.__callback is not None:
+            self.__callback(snapshot)
+
+    def __run(self) -> None:
+        """Export snapshots until stopped"""
+        while not self.__stopped.wait(self.interval):
+            try:
+                self.export()
+            except Exception:
+                self.__logger.exception("Failed to export metrics.")
+
+    def start(self) -> None:
+        """Start exporting in a background thread"""
+        self.__stopped.clear()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """Stop exporting and export a final snapshot"""
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.export()
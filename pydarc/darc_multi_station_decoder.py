@@ -0,0 +1,107 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import Callable, Mapping
+
+from pydarc.crc_82_darc import get_parity_bitflip_syndrome_map_dscc_272_190
+from pydarc.darc_decoder import DarcDecoder
+from pydarc.darc_l4_data import DarcL4DataGroup1, DarcL4DataGroup2
+from pydarc.darc_metrics import DarcMetrics
+from pydarc.darc_shared_tables import install_shared_tables
+
+
+class DarcMultiStationDecoder:
+    """DARC Multi-station Decoder
+
+    Decode bitstream files of many stations concurrently with one DarcDecoder per
+    station on its own thread. Decoder chains share nothing but the CRC tables and
+    the syndrome map, which are immutable and prepared before the threads start.
+    Threads decode in parallel on a free-threaded build of CPython, and interleave
+    under the GIL otherwise.
+    """
+
+    __logger = getLogger(__name__)
+
+    def __init__(
+        self,
+        stations: Mapping[str, str],
+        threads: int | None = None,
+        metrics: bool = False,
+        tables_path: str | None = None,
+        on_data_group: (
+            Callable[[str, DarcL4DataGroup1 | DarcL4DataGroup2, bool | None], None]
+            | None
+        ) = None,
+        **decoder_options,
+    ) -> None:
+        """Constructor
+
+        Args:
+            stations (Mapping[str, str]): Bitstream path with one bit per byte of each station
+            threads (int | None, optional): Number of threads. None for one per station. Defaults to None.
+            metrics (bool, optional): Count metrics per station. Defaults to False.
+            tables_path (str | None, optional): Shared tables path to install instead of generating tables. Defaults to None.
+            on_data_group (Callable[[str, DarcL4DataGroup1 | DarcL4DataGroup2, bool | None], None] | None, optional): Called with the station, each Data Group and whether it is a repetition. Called from decoder threads, so it must be thread-safe. Defaults to None.
+            **decoder_options: Arguments of the DarcDecoder constructor except callbacks of Data Groups
+        """
+        self.stations = stations
+        self.threads = threads
+        self.tables_path = tables_path
+        self.on_data_group = on_data_group
+        self.decoder_options = decoder_options
+        # Metrics per station. Each is updated by the thread of its station only.
+        self.metrics: dict[str, DarcMetrics] | None = (
+            {x: DarcMetrics() for x in stations} if metrics else None
+        )
+
+    def __decode_station(self, station: str) -> int:
+        """Decode a station
+
+        Args:
+            station (str): Station
+
+        Returns:
+            int: Number of Data Groups
+        """
+        on_data_group = self.on_data_group
+        decoder = DarcDecoder(
+            metrics=None if self.metrics is None else self.metrics[station],
+            on_data_group=(
+                None
+                if on_data_group is None
+                else lambda data_group, is_duplicate: on_data_group(
+                    station, data_group, is_duplicate
+                )
+            ),
+            **self.decoder_options,
+        )
+        start_time = time.perf_counter()
+        count = sum(1 for _ in decoder.decode_file(self.stations[station]))
+        self.__logger.info(
+            "Station decoded. station=%s, data_groups=%d, seconds=%.3f",
+            station,
+            count,
+            time.perf_counter() - start_time,
+        )
+        return count
+
+    def decode(self) -> dict[str, int]:
+        """Decode every station
+
+        Raises:
+            Exception: Raised by the decoder of a station
+
+        Returns:
+            dict[str, int]: Number of Data Groups per station
+        """
+        # Prepare tables once instead of in the first thread correcting an error
+        if self.tables_path is not None:
+            install_shared_tables(self.tables_path)
+        else:
+            get_parity_bitflip_syndrome_map_dscc_272_190()
+
+        stations = list(self.stations)
+        with ThreadPoolExecutor(
+            self.threads or len(stations) or 1, thread_name_prefix="station"
+        ) as executor:
+            return dict(zip(stations, executor.map(self.__decode_station, stations)))
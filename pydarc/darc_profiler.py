@@ -0,0 +1,134 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from types import FrameType
+
+# Layer name, source file, function names. Times are inclusive, so l2_block
+# includes row correction and l2_frame includes column correction.
+PROFILE_LAYERS = (
+    ("l2_block", "darc_l2_block_decoder.py", ("push_bit",)),
+    ("dscc", "crc_82_darc.py", ("correct_error_dscc_272_190",)),
+    ("l2_frame", "darc_l2_frame_decoder.py", ("push_block",)),
+    ("l3", "darc_l3_data_packet_decoder.py", ("push_block",)),
+    ("l4", "darc_l4_data_group_decoder.py", ("__push_data_packet",)),
+    ("output", "darc_l4_data_group_writer.py", ("write", "flush")),
+)
+
+
+class DarcProfiler:
+    """DARC Profiler
+
+    Profile the calling thread with cProfile for pstats and per-layer summaries,
+    and sample its stacks from a background thread for flame graphs.
+    """
+
+    def __init__(self, sampling_interval: float = 0.001) -> None:
+        """Constructor
+
+        Args:
+            sampling_interval (float, optional): Stack sampling interval in seconds. Defaults to 0.001.
+        """
+        self.__profile = cProfile.Profile()
+        self.__stacks: dict[str, int] = {}
+        self.__stopped = threading.Event()
+        self.__sampler: threading.Thread | None = None
+        self.__thread_id = 0
+
+        self.sampling_interval = sampling_interval
+
+    @staticmethod
+    def __collapse(frame: FrameType | None) -> str:
+        """Collapse a stack into a line of the collapsed stack format
+
+        Args:
+            frame (FrameType | None): Innermost frame
+
+        Returns:
+            str: Frames from outermost to innermost joined with semicolons
+        """
+        names: list[str] = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(
+                f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            )
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def __sample(self) -> None:
+        """Sample stacks of the profiled thread until stopped"""
+        while not self.__stopped.wait(self.sampling_interval):
+            frame = sys._current_frames().get(self.__thread_id)
+            if frame is None:
+                continue
+            stack = DarcProfiler.__collapse(frame)
+            self.__stacks[stack] = self.__stacks.get(stack, 0) + 1
+
+    def start(self) -> None:
+        """Start profiling the calling thread"""
+        self.__thread_id = threading.get_ident()
+        self.__stopped.clear()
+        self.__sampler = threading.Thread(target=self.__sample, daemon=True)
+        self.__sampler.start()
+        self.__profile.enable()
+
+    def stop(self) -> None:
+        """Stop profiling"""
+        self.__profile.disable()
+        self.__stopped.set()
+        if self.__sampler is not None:
+            self.__sampler.join()
+            self.__sampler = None
+
+    def save(self, path: str) -> None:
+        """Save pstats to a path and collapsed stacks to the path with .collapsed
+
+        Args:
+            path (str): pstats path
+        """
+        self.__profile.dump_stats(path)
+        with open(f"{path}.collapsed", "w") as file:
+            for stack, count in sorted(self.__stacks.items()):
+                file.write(f"{stack} {count}\n")
+
+    def summary(self) -> str:
+        """Summarize time spent per layer
+
+        Frames are counted by calls of DarcL2Frame.from_block_buffer.
+
+        Returns:
+            str: Table of calls, total time and time per Frame per layer
+        """
+        stats = pstats.Stats(self.__profile).stats
+        rows: list[tuple[str, int, float]] = []
+        frames = 0
+        for layer, file_name, function_names in PROFILE_LAYERS:
+            calls = 0
+            seconds = 0.0
+            for (path, _, function_name), (_, nc, _, ct, _) in stats.items():
+                if (
+                    layer == "l2_frame"
+                    and os.path.basename(path) == "darc_l2_data.py"
+                    and function_name == "from_block_buffer"
+                ):
+                    frames += nc
+                if (
+                    os.path.basename(path) == file_name
+                    and function_name in function_names
+                ):
+                    calls += nc
+                    seconds += ct
+            rows.append((layer, calls, seconds))
+
+        lines = [
+            f"{'layer':<10} {'calls':>12} {'total [s]':>12} {'per frame [ms]':>16}"
+        ]
+        for layer, calls, seconds in rows:
+            per_frame = (
+                f"{seconds / frames * 1000:16.3f}" if 0 < frames else f"{'-':>16}"
+            )
+            lines.append(f"{layer:<10} {calls:>12} {seconds:>12.3f} {per_frame}")
+        lines.append(f"frames: {frames}")
+        return "\n".join(lines)
@@ -0,0 +1,263 @@
+import bisect
+import mmap
+import os
+import struct
+from collections.abc import Iterator, Mapping
+from logging import getLogger
+from typing import Self
+
+from pydarc.crc_14_darc import get_crc_14_darc_table, set_crc_14_darc_table
+from pydarc.crc_16_darc import get_crc_16_darc_table, set_crc_16_darc_table
+from pydarc.crc_82_darc import (
+    get_crc_82_darc_table,
+    get_parity_bitflip_syndrome_map_dscc_272_190,
+    set_crc_82_darc_table,
+    set_parity_bitflip_syndrome_map_dscc_272_190,
+)
+
+TABLES_MAGIC = b"DARCTBL\x00"
+TABLES_VERSION = 1
+
+# version, number of syndromes
+TABLES_HEADER = struct.Struct("<II")
+
+
+class DarcFlatSyndromeMap(Mapping[int, int]):
+    """DARC Flat Syndrome Map
+
+    Read-only bitflip syndrome map over flat arrays, so that it can be used in
+    place in a shared buffer. Syndromes are sorted by their low 64 bits and looked
+    up with binary search. An error vector is stored as its pattern and shift.
+
+    A lookup is about 20 times slower than in the dict it replaces, which is
+    negligible next to decoding the bits of a block but not free.
+    """
+
+    def __init__(
+        self,
+        syndromes_low: memoryview,
+        syndromes_high: memoryview,
+        shifts: memoryview,
+        patterns: memoryview,
+    ) -> None:
+        """Constructor
+
+        Args:
+            syndromes_low (memoryview): Low 64 bits of syndromes in ascending order
+            syndromes_high (memoryview): High bits of syndromes
+            shifts (memoryview): Shift of error vectors
+            patterns (memoryview): Pattern of error vectors
+        """
+        self.__syndromes_low = syndromes_low
+        self.__syndromes_high = syndromes_high
+        self.__shifts = shifts
+        self.__patterns = patterns
+
+    def __getitem__(self, syndrome: int) -> int:
+        """Get the error vector of a syndrome
+
+        Args:
+            syndrome (int): Syndrome
+
+        Raises:
+            KeyError: Syndrome not found
+
+        Returns:
+            int: Error vector
+        """
+        low = syndrome & 0xFFFFFFFFFFFFFFFF
+        high = syndrome >> 64
+        i = bisect.bisect_left(self.__syndromes_low, low)
+        while i < len(self.__syndromes_low) and self.__syndromes_low[i] == low:
+            if self.__syndromes_high[i] == high:
+                return self.__patterns[i] << self.__shifts[i]
+            i += 1
+        raise KeyError(syndrome)
+
+    def __len__(self) -> int:
+        """Number of syndromes
+
+        Returns:
+            int: Number of syndromes
+        """
+        return len(self.__syndromes_low)
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate syndromes
+
+        Returns:
+            Iterator[int]: Syndromes
+        """
+        return (
+            high << 64 | low
+            for low, high in zip(self.__syndromes_low, self.__syndromes_high)
+        )
+
+    def release(self) -> None:
+        """Release the underlying buffer"""
+        for view in [
+            self.__syndromes_low,
+            self.__syndromes_high,
+            self.__shifts,
+            self.__patterns,
+        ]:
+            view.release()
+
+
+def pack_tables() -> bytes:
+    """Pack the CRC tables and the DSCC(272,190) syndrome map in a flat layout
+
+    The layout is the magic, the header, the CRC-14 and CRC-16 tables as uint16,
+    the low 64 bits and high 18 bits of the CRC-82 table as uint64 and uint32,
+    and then the syndrome map as arrays of the low 64 bits of syndromes (uint64),
+    their high bits (uint32), error vector shifts (uint16) and patterns (uint8).
+    Every value is little endian.
+
+    Returns:
+        bytes: Tables
+    """
+    syndrome_map = get_parity_bitflip_syndrome_map_dscc_272_190()
+    entries = sorted(
+        (syndrome & 0xFFFFFFFFFFFFFFFF, syndrome >> 64, error_vector)
+        for syndrome, error_vector in syndrome_map.items()
+    )
+    shifts = [(x & -x).bit_length() - 1 for _, _, x in entries]
+
+    crc_82_darc_table = get_crc_82_darc_table()
+    count = len(entries)
+    return b"".join(
+        [
+            TABLES_MAGIC,
+            TABLES_HEADER.pack(TABLES_VERSION, count),
+            struct.pack("<256H", *get_crc_14_darc_table()),
+            struct.pack("<256H", *get_crc_16_darc_table()),
+            struct.pack("<256Q", *(x & 0xFFFFFFFFFFFFFFFF for x in crc_82_darc_table)),
+            struct.pack("<256I", *(x >> 64 for x in crc_82_darc_table)),
+            struct.pack(f"<{count}Q", *(x for x, _, _ in entries)),
+            struct.pack(f"<{count}I", *(x for _, x, _ in entries)),
+            struct.pack(f"<{count}H", *shifts),
+            struct.pack(
+                f"<{count}B",
+                *(x >> shift for (_, _, x), shift in zip(entries, shifts)),
+            ),
+        ]
+    )
+
+
+class DarcSharedTables:
+    """DARC Shared Tables
+
+    The CRC tables and the DSCC(272,190) syndrome map are saved once to a file,
+    such as one in /dev/shm, and memory-mapped read-only by every decoder process.
+    The syndrome map is used in place, so its pages are shared between processes
+    and nothing is generated at startup. The small CRC tables are copied.
+    """
+
+    __logger = getLogger(__name__)
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        """Constructor
+
+        Args:
+            buffer (mmap.mmap): Read-only memory map of tables
+
+        Raises:
+            ValueError: Not tables or unsupported version
+        """
+        if buffer[: len(TABLES_MAGIC)] != TABLES_MAGIC:
+            raise ValueError("buffer is not DARC shared tables.")
+        version, count = TABLES_HEADER.unpack_from(buffer, len(TABLES_MAGIC))
+        if version != TABLES_VERSION:
+            raise ValueError(f"Unsupported tables version. version={version}")
+
+        self.__buffer = buffer
+        view = memoryview(buffer)
+        offset = len(TABLES_MAGIC) + TABLES_HEADER.size
+        arrays: list[memoryview] = []
+        for format, length in [
+            ("H", 256),
+            ("H", 256),
+            ("Q", 256),
+            ("I", 256),
+            ("Q", count),
+            ("I", count),
+            ("H", count),
+            ("B", count),
+        ]:
+            size = struct.calcsize(format) * length
+            arrays.append(view[offset : offset + size].cast(format))
+            offset += size
+        view.release()
+
+        (
+            self.__crc_14_darc_table,
+            self.__crc_16_darc_table,
+            self.__crc_82_darc_table_low,
+            self.__crc_82_darc_table_high,
+        ) = arrays[:4]
+        self.syndrome_map = DarcFlatSyndromeMap(*arrays[4:])
+
+    @staticmethod
+    def save(path: str) -> None:
+        """Save tables to a file atomically
+
+        Args:
+            path (str): Tables path
+        """
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(pack_tables())
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def open(cls, path: str, create: bool = False) -> Self:
+        """Open tables read-only
+
+        Args:
+            path (str): Tables path
+            create (bool, optional): Save tables first if missing. Defaults to False.
+
+        Returns:
+            Self: DarcSharedTables instance
+        """
+        if create and not os.path.exists(path):
+            cls.__logger.info("Save shared tables. path=%s", path)
+            DarcSharedTables.save(path)
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def install(self) -> None:
+        """Use the tables in this process"""
+        set_crc_14_darc_table(self.__crc_14_darc_table)
+        set_crc_16_darc_table(self.__crc_16_darc_table)
+        set_crc_82_darc_table(
+            [
+                high << 64 | low
+                for low, high in zip(
+                    self.__crc_82_darc_table_low, self.__crc_82_darc_table_high
+                )
+            ]
+        )
+        set_parity_bitflip_syndrome_map_dscc_272_190(self.syndrome_map)
+
+    def close(self) -> None:
+        """Close the memory map. The tables must not be installed."""
+        for view in [
+            self.__crc_14_darc_table,
+            self.__crc_16_darc_table,
+            self.__crc_82_darc_table_low,
+            self.__crc_82_darc_table_high,
+        ]:
+            view.release()
+        self.syndrome_map.release()
+        self.__buffer.close()
+
+
+def install_shared_tables(path: str | None) -> None:
+    """Open and install shared tables, such as in a worker process initializer
+
+    Args:
+        path (str | None): Tables path. None to do nothing.
+    """
+    if path is not None:
+        DarcSharedTables.open(path).install()
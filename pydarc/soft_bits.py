@@ -0,0 +1,42 @@
+from array import array
+from typing import BinaryIO, Generator
+
+# array typecodes of soft decision formats
+SOFT_BIT_TYPECODES = {"int8": "b", "float32": "f"}
+
+
+def read_soft_bits(
+    stream: BinaryIO, soft_bit_format: str = "int8", block_size: int = 1 << 16
+) -> Generator[float, None, None]:
+    """Read soft decisions such as log-likelihood ratios
+
+    A positive value is 1 and a negative value is 0. The absolute value is the
+    reliability of the bit, and 0 is an erasure.
+
+    Args:
+        stream (BinaryIO): Stream of soft decisions in native byte order
+        soft_bit_format (str, optional): int8 or float32. Defaults to "int8".
+        block_size (int, optional): Number of soft decisions per read. Defaults to 65536.
+
+    Raises:
+        ValueError: Unsupported soft decision format
+
+    Yields:
+        Generator[float, None, None]: Soft decisions
+    """
+    if soft_bit_format not in SOFT_BIT_TYPECODES:
+        raise ValueError(
+            f"Unsupported soft decision format. soft_bit_format={soft_bit_format}"
+        )
+    typecode = SOFT_BIT_TYPECODES[soft_bit_format]
+    item_size = array(typecode).itemsize
+
+    remainder = b""
+    while True:
+        buffer = stream.read(item_size * block_size)
+        if len(buffer) == 0:
+            return
+        buffer = remainder + buffer
+        length = len(buffer) - len(buffer) % item_size
+        remainder = buffer[length:]
+        yield from array(typecode, buffer[:length])